@@ -5,16 +5,20 @@ This module configures Alembic for database migrations with:
 - Async SQLAlchemy support
 - Environment variable configuration
 - Auto-migration generation from models
+- Single-pass baseline for fresh installs (ALEMBIC_FRESH=1)
 """
 
 import asyncio
+import os
+import sys
 from logging.config import fileConfig
 
-from sqlalchemy import pool
+from sqlalchemy import inspect, pool
 from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
+from alembic.script import ScriptDirectory
 
 # Import app configuration and models
 from app.core.config import settings
@@ -28,6 +32,9 @@ from app.models.participant import Participant, ParticipantGroup
 from app.models.test import Test, Question, Answer
 from app.models.student_email import StudentEmail
 
+# Make shared migration helpers (alembic/helpers) importable from revisions
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
 # this is the Alembic Config object
 config = context.config
 
@@ -41,6 +48,10 @@ target_metadata = Base.metadata
 # Override sqlalchemy.url with application settings
 config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 
+# Fresh installs can skip replaying every revision: the models describe
+# the schema at head, so it is created in one pass and stamped.
+FRESH_INSTALL = os.getenv("ALEMBIC_FRESH") == "1"
+
 
 def run_migrations_offline() -> None:
     """
@@ -67,15 +78,36 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+def run_baseline(connection: Connection) -> None:
+    """Create the head schema from the models and stamp it as migrated."""
+    target_metadata.create_all(connection)
+    context.get_context().stamp(ScriptDirectory.from_config(config), "heads")
+
+
 def do_run_migrations(connection: Connection) -> None:
-    """Run migrations using the provided connection."""
+    """
+    Run migrations using the provided connection.
+
+    Each revision runs in its own transaction, committed together with
+    its alembic_version stamp. Revisions that use autocommit_block()
+    commit their earlier DDL before the stamp, so a failure later in the
+    revision leaves it applied but unstamped; the DDL in front of such a
+    block is written to be safe to run again.
+    """
     context.configure(
         connection=connection,
         target_metadata=target_metadata,
         compare_type=True,
         compare_server_default=True,
+        transaction_per_migration=True,
     )
 
+    # Only databases Alembic has never touched take the baseline path
+    if FRESH_INSTALL and not inspect(connection).has_table("alembic_version"):
+        run_baseline(connection)
+        connection.commit()
+        return
+
     with context.begin_transaction():
         context.run_migrations()
 
@@ -0,0 +1,6 @@
+"""
+Migration Helpers
+
+Shared building blocks for Alembic revisions that have to stay cheap on
+large, live tables (lock-friendly DDL, batched data backfills).
+"""
@@ -0,0 +1,67 @@
+"""
+Batching Helpers
+
+Data-rewriting steps in migrations must not run as one huge UPDATE: on a
+large table that holds row locks for the whole run, bloats WAL in a
+single transaction and can blow past statement_timeout. Rows are instead
+updated in small batches, each committed on its own.
+"""
+
+import time
+
+import sqlalchemy as sa
+from alembic import context, op
+
+BATCH_SIZE = 5000
+
+# Pause before re-checking when the only rows left are locked by others
+LOCKED_ROWS_RETRY_DELAY = 0.5
+
+
+def batched_backfill(
+    table: str,
+    set_clause: str,
+    predicate: str,
+    batch_size: int = BATCH_SIZE,
+) -> int:
+    """
+    Run UPDATE {table} SET {set_clause} WHERE {predicate} in batches.
+
+    The predicate must stop matching a row once it has been updated
+    (e.g. "col IS NULL" for "col = <value>"), otherwise the loop never
+    ends. Rows locked by concurrent transactions are skipped and picked
+    up by a later batch.
+
+    Args:
+        table: Table name
+        set_clause: SQL for the SET part, e.g. "status = 'pending'"
+        predicate: SQL selecting the rows that still need updating
+        batch_size: Rows per committed batch
+
+    Returns:
+        Number of rows updated
+    """
+    if context.is_offline_mode():
+        # Generated SQL scripts cannot loop; emit a single statement.
+        op.execute(f"UPDATE {table} SET {set_clause} WHERE {predicate}")
+        return 0
+
+    update_batch = sa.text(
+        f"UPDATE {table} SET {set_clause} WHERE ctid IN ("
+        f"SELECT ctid FROM {table} WHERE {predicate} "
+        f"LIMIT :batch_size FOR UPDATE SKIP LOCKED)"
+    )
+    rows_left = sa.text(f"SELECT EXISTS (SELECT 1 FROM {table} WHERE {predicate})")
+
+    total = 0
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while True:
+            updated = bind.execute(update_batch, {"batch_size": batch_size}).rowcount
+            if updated:
+                total += updated
+                continue
+            if not bind.execute(rows_left).scalar():
+                break
+            time.sleep(LOCKED_ROWS_RETRY_DELAY)
+    return total
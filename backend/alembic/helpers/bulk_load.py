@@ -0,0 +1,60 @@
+"""
+Bulk Load Helpers
+
+Moving many values into existing rows (re-keying, copying identifiers
+between columns) should not be done with per-row UPDATEs. Values are
+streamed into a temporary staging table with binary COPY and applied
+with a single UPDATE ... FROM join.
+"""
+
+from typing import Iterable, Sequence
+
+from alembic import context, op
+from sqlalchemy.util import await_only
+
+STAGING_TABLE = "tmp_backfill"
+
+
+def copy_backfill(
+    target: str,
+    column: str,
+    rows: Iterable[Sequence],
+    key_column: str = "id",
+    key_type: str = "UUID",
+    value_type: str = "TEXT",
+) -> None:
+    """
+    Set target.column from (key, value) pairs using binary COPY.
+
+    Args:
+        target: Table to update
+        column: Column receiving the values
+        rows: Iterable of (key, value) tuples; consumed as a stream
+        key_column: Column matching the staged keys
+        key_type: SQL type of the key column
+        value_type: SQL type of the value column
+    """
+    if context.is_offline_mode():
+        raise RuntimeError("copy_backfill needs a live connection, not --sql mode")
+
+    op.execute(
+        f"CREATE TEMP TABLE {STAGING_TABLE} "
+        f"(key {key_type} PRIMARY KEY, value {value_type}) ON COMMIT DROP"
+    )
+
+    # The migration connection runs on asyncpg; copy_records_to_table
+    # streams the rows with COPY ... FROM STDIN (FORMAT binary).
+    driver_connection = op.get_bind().connection.driver_connection
+    await_only(
+        driver_connection.copy_records_to_table(
+            STAGING_TABLE,
+            records=rows,
+            columns=["key", "value"],
+        )
+    )
+
+    op.execute(
+        f"UPDATE {target} SET {column} = staged.value "
+        f"FROM {STAGING_TABLE} staged WHERE {target}.{key_column} = staged.key"
+    )
+    op.execute(f"DROP TABLE {STAGING_TABLE}")
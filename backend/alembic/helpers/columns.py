@@ -0,0 +1,83 @@
+"""
+Column Helpers
+
+Adding a NOT NULL column with a constant default is a metadata-only
+change on PostgreSQL 11+ ("fast default"). Older servers rewrite the
+whole table under an ACCESS EXCLUSIVE lock, so there the column is added
+as nullable, backfilled in small committed batches and only then marked
+NOT NULL.
+"""
+
+from typing import Iterable, Sequence, Tuple
+
+import sqlalchemy as sa
+from alembic import context, op
+
+from helpers.batching import BATCH_SIZE, batched_backfill
+
+# (column name, SQL type, SQL default literal)
+ColumnSpec = Tuple[str, str, str]
+
+FAST_DEFAULT_MIN_VERSION = 110000
+
+
+def _has_fast_default() -> bool:
+    """Check whether the server adds constant defaults without a rewrite."""
+    if context.is_offline_mode():
+        # No connection to ask; emit SQL for the supported server version.
+        return True
+    version = op.get_bind().execute(
+        sa.text("SELECT current_setting('server_version_num')::int")
+    ).scalar()
+    return version >= FAST_DEFAULT_MIN_VERSION
+
+
+def add_not_null_columns(
+    table: str,
+    columns: Sequence[ColumnSpec],
+    extra: Iterable[str] = (),
+    batch_size: int = BATCH_SIZE,
+    if_not_exists: bool = False,
+) -> None:
+    """
+    Add NOT NULL columns with constant defaults to an existing table.
+
+    Args:
+        table: Table name
+        columns: (name, SQL type, SQL default) for every NOT NULL column
+        extra: Additional ADD COLUMN clauses (nullable columns) to apply
+               in the same ALTER TABLE
+        batch_size: Rows per backfill batch on servers without fast default
+        if_not_exists: Skip columns that already exist (for revisions whose
+                       columns may have been added by an earlier one)
+    """
+    extra = list(extra)
+    add_column = "ADD COLUMN IF NOT EXISTS" if if_not_exists else "ADD COLUMN"
+
+    if _has_fast_default():
+        clauses = [
+            f"{add_column} {name} {type_} DEFAULT {default} NOT NULL"
+            for name, type_, default in columns
+        ]
+        op.execute(f"ALTER TABLE {table} " + ", ".join(clauses + extra))
+        return
+
+    clauses = [f"{add_column} {name} {type_}" for name, type_, _ in columns]
+    op.execute(f"ALTER TABLE {table} " + ", ".join(clauses + extra))
+
+    # New rows pick up the default from here on; existing rows are NULL
+    op.execute(
+        f"ALTER TABLE {table} "
+        + ", ".join(
+            f"ALTER COLUMN {name} SET DEFAULT {default}"
+            for name, _, default in columns
+        )
+    )
+
+    for name, _, default in columns:
+        batched_backfill(table, f"{name} = {default}", f"{name} IS NULL", batch_size)
+
+    op.execute(
+        f"ALTER TABLE {table} "
+        + ", ".join(f"ALTER COLUMN {name} SET NOT NULL" for name, _, _ in columns)
+    )
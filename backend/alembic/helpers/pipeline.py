@@ -0,0 +1,31 @@
+"""
+Pipeline Helpers
+
+Alembic sends every operation as its own prepared statement, one network
+round trip each. Parameterless DDL can instead be sent as a single
+multi-statement script over the simple query protocol, which PostgreSQL
+executes in order within the current transaction.
+"""
+
+from typing import Sequence
+
+from alembic import context, op
+from sqlalchemy.util import await_only
+
+
+def execute_script(statements: Sequence[str]) -> None:
+    """
+    Execute parameterless SQL statements in one round trip.
+
+    Args:
+        statements: SQL statements, executed in order
+    """
+    if context.is_offline_mode():
+        for statement in statements:
+            op.execute(statement)
+        return
+
+    # asyncpg runs argument-less execute() through the simple query
+    # protocol, which accepts several ';'-separated statements.
+    driver_connection = op.get_bind().connection.driver_connection
+    await_only(driver_connection.execute(";\n".join(statements)))
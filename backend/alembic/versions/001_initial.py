@@ -11,12 +11,65 @@ from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
 
+from helpers.pipeline import execute_script
+
 # revision identifiers, used by Alembic.
 revision: str = '001_initial'
 down_revision: Union[str, None] = None
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+# Indexes, created once all tables exist: (name, table, columns, unique)
+INDEXES = [
+    ('ix_users_email', 'users', ['email'], True),
+    ('ix_material_folders_teacher_id', 'material_folders', ['teacher_id'], False),
+    ('ix_participant_groups_teacher_id', 'participant_groups', ['teacher_id'], False),
+    ('ix_participants_teacher_id', 'participants', ['teacher_id'], False),
+    ('ix_participants_group_id', 'participants', ['group_id'], False),
+    ('ix_participants_email', 'participants', ['email'], False),
+    ('ix_projects_teacher_id', 'projects', ['teacher_id'], False),
+    ('ix_projects_status', 'projects', ['status'], False),
+    ('ix_question_type_configs_project_id', 'question_type_configs', ['project_id'], False),
+    ('ix_materials_teacher_id', 'materials', ['teacher_id'], False),
+    ('ix_materials_folder_id', 'materials', ['folder_id'], False),
+    ('ix_questions_project_id', 'questions', ['project_id'], False),
+    ('ix_tests_project_id', 'tests', ['project_id'], False),
+    ('ix_tests_student_id', 'tests', ['student_id'], False),
+    ('ix_tests_status', 'tests', ['status'], False),
+    ('ix_answers_test_id', 'answers', ['test_id'], False),
+    ('ix_answers_question_id', 'answers', ['question_id'], False),
+    ('ix_student_emails_user_id', 'student_emails', ['user_id'], False),
+    ('ix_student_emails_email', 'student_emails', ['email'], False),
+]
+
+# Foreign keys are added after all tables and indexes exist:
+# (table, column, referenced table, ON DELETE action)
+FOREIGN_KEYS = [
+    ('material_folders', 'teacher_id', 'users', 'CASCADE'),
+    ('participant_groups', 'teacher_id', 'users', 'CASCADE'),
+    ('participants', 'teacher_id', 'users', 'CASCADE'),
+    ('participants', 'group_id', 'participant_groups', 'SET NULL'),
+    ('projects', 'teacher_id', 'users', 'CASCADE'),
+    ('question_type_configs', 'project_id', 'projects', 'CASCADE'),
+    ('materials', 'teacher_id', 'users', 'CASCADE'),
+    ('materials', 'folder_id', 'material_folders', 'SET NULL'),
+    ('questions', 'project_id', 'projects', 'CASCADE'),
+    ('tests', 'project_id', 'projects', 'CASCADE'),
+    ('tests', 'student_id', 'users', 'SET NULL'),
+    ('answers', 'test_id', 'tests', 'CASCADE'),
+    ('answers', 'question_id', 'questions', 'CASCADE'),
+    ('student_emails', 'user_id', 'users', 'CASCADE'),
+    ('project_materials', 'project_id', 'projects', 'CASCADE'),
+    ('project_materials', 'material_id', 'materials', 'CASCADE'),
+    ('project_participants', 'project_id', 'projects', 'CASCADE'),
+    ('project_participants', 'participant_id', 'participants', 'CASCADE'),
+]
+
+# Tables whose rows are updated several times after insert; free space
+# on each page lets those updates stay HOT (same page, no index writes)
+FILLFACTOR = 70
+HOT_UPDATE_TABLES = ['tests', 'answers', 'participants']
+
 
 def upgrade() -> None:
     """Create all database tables."""
@@ -35,7 +88,6 @@ def upgrade() -> None:
         sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
         sa.PrimaryKeyConstraint('id'),
     )
-    op.create_index('ix_users_email', 'users', ['email'], unique=True)
     
     # Material Folders table
     op.create_table(
@@ -46,10 +98,8 @@ def upgrade() -> None:
         sa.Column('description', sa.Text(), nullable=True),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
         sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
-        sa.ForeignKeyConstraint(['teacher_id'], ['users.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id'),
     )
-    op.create_index('ix_material_folders_teacher_id', 'material_folders', ['teacher_id'])
     
     # Participant Groups table
     op.create_table(
@@ -60,10 +110,8 @@ def upgrade() -> None:
         sa.Column('description', sa.Text(), nullable=True),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
         sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
-        sa.ForeignKeyConstraint(['teacher_id'], ['users.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id'),
     )
-    op.create_index('ix_participant_groups_teacher_id', 'participant_groups', ['teacher_id'])
     
     # Participants table
     op.create_table(
@@ -77,13 +125,8 @@ def upgrade() -> None:
         sa.Column('participant_type', sa.String(20), nullable=False, server_default='individual'),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
         sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
-        sa.ForeignKeyConstraint(['teacher_id'], ['users.id'], ondelete='CASCADE'),
-        sa.ForeignKeyConstraint(['group_id'], ['participant_groups.id'], ondelete='SET NULL'),
         sa.PrimaryKeyConstraint('id'),
     )
-    op.create_index('ix_participants_teacher_id', 'participants', ['teacher_id'])
-    op.create_index('ix_participants_group_id', 'participants', ['group_id'])
-    op.create_index('ix_participants_email', 'participants', ['email'])
     
     # Projects table
     op.create_table(
@@ -101,11 +144,8 @@ def upgrade() -> None:
         sa.Column('end_time', sa.DateTime(), nullable=True),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
         sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
-        sa.ForeignKeyConstraint(['teacher_id'], ['users.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id'),
     )
-    op.create_index('ix_projects_teacher_id', 'projects', ['teacher_id'])
-    op.create_index('ix_projects_status', 'projects', ['status'])
     
     # Question Type Configs table
     op.create_table(
@@ -115,10 +155,8 @@ def upgrade() -> None:
         sa.Column('question_type', sa.String(50), nullable=False),
         sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
-        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id'),
     )
-    op.create_index('ix_question_type_configs_project_id', 'question_type_configs', ['project_id'])
     
     # Materials table
     op.create_table(
@@ -133,12 +171,8 @@ def upgrade() -> None:
         sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
         sa.Column('uploaded_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
         sa.Column('processed_at', sa.DateTime(), nullable=True),
-        sa.ForeignKeyConstraint(['teacher_id'], ['users.id'], ondelete='CASCADE'),
-        sa.ForeignKeyConstraint(['folder_id'], ['material_folders.id'], ondelete='SET NULL'),
         sa.PrimaryKeyConstraint('id'),
     )
-    op.create_index('ix_materials_teacher_id', 'materials', ['teacher_id'])
-    op.create_index('ix_materials_folder_id', 'materials', ['folder_id'])
     
     # Questions table
     op.create_table(
@@ -156,10 +190,8 @@ def upgrade() -> None:
         sa.Column('order', sa.Integer(), nullable=False, server_default='0'),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
         sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
-        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id'),
     )
-    op.create_index('ix_questions_project_id', 'questions', ['project_id'])
     
     # Tests table
     op.create_table(
@@ -174,13 +206,8 @@ def upgrade() -> None:
         sa.Column('completed_at', sa.DateTime(), nullable=True),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
         sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
-        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
-        sa.ForeignKeyConstraint(['student_id'], ['users.id'], ondelete='SET NULL'),
         sa.PrimaryKeyConstraint('id'),
     )
-    op.create_index('ix_tests_project_id', 'tests', ['project_id'])
-    op.create_index('ix_tests_student_id', 'tests', ['student_id'])
-    op.create_index('ix_tests_status', 'tests', ['status'])
     
     # Answers table
     op.create_table(
@@ -194,12 +221,8 @@ def upgrade() -> None:
         sa.Column('feedback', sa.Text(), nullable=True),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
         sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
-        sa.ForeignKeyConstraint(['test_id'], ['tests.id'], ondelete='CASCADE'),
-        sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id'),
     )
-    op.create_index('ix_answers_test_id', 'answers', ['test_id'])
-    op.create_index('ix_answers_question_id', 'answers', ['question_id'])
     
     # Student Emails table
     op.create_table(
@@ -210,11 +233,8 @@ def upgrade() -> None:
         sa.Column('institution', sa.String(255), nullable=True),
         sa.Column('is_primary', sa.Boolean(), nullable=False, server_default='false'),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
-        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id'),
     )
-    op.create_index('ix_student_emails_user_id', 'student_emails', ['user_id'])
-    op.create_index('ix_student_emails_email', 'student_emails', ['email'])
     
     # Project Materials association table
     op.create_table(
@@ -222,8 +242,6 @@ def upgrade() -> None:
         sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('material_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
-        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
-        sa.ForeignKeyConstraint(['material_id'], ['materials.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('project_id', 'material_id'),
     )
     
@@ -233,10 +251,32 @@ def upgrade() -> None:
         sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('participant_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
-        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
-        sa.ForeignKeyConstraint(['participant_id'], ['participants.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('project_id', 'participant_id'),
     )
+    
+    # Indexes and foreign keys go out as one script (a single round trip).
+    # Foreign keys are added NOT VALID (no scan of existing rows), then
+    # validated in a second pass, which only takes SHARE UPDATE EXCLUSIVE
+    # and so does not block writes when run against loaded data.
+    statements = [
+        f"ALTER TABLE {table} SET (fillfactor = {FILLFACTOR})"
+        for table in HOT_UPDATE_TABLES
+    ]
+    statements += [
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX {name} ON {table} ({', '.join(columns)})"
+        for name, table, columns, unique in INDEXES
+    ]
+    statements += [
+        f"ALTER TABLE {table} ADD CONSTRAINT {table}_{column}_fkey "
+        f"FOREIGN KEY ({column}) REFERENCES {ref_table} (id) "
+        f"ON DELETE {ondelete} NOT VALID"
+        for table, column, ref_table, ondelete in FOREIGN_KEYS
+    ]
+    statements += [
+        f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_{column}_fkey"
+        for table, column, _, _ in FOREIGN_KEYS
+    ]
+    execute_script(statements)
 
 
 def downgrade() -> None:
@@ -22,12 +22,15 @@ depends_on = None
 
 
 def upgrade() -> None:
-    # Remove old ChromaDB column
-    op.drop_column('projects', 'chroma_collection_id')
-    
-    # Add OpenAI Vector Store columns to projects
-    op.add_column('projects', sa.Column('openai_vector_store_id', sa.String(255), nullable=True))
-    op.add_column('projects', sa.Column('openai_assistant_id', sa.String(255), nullable=True))
+    # Swap the ChromaDB column for the OpenAI Vector Store columns in a
+    # single ALTER TABLE (one lock acquisition, one catalog update).
+    # IF EXISTS: fresh installs never had chroma_collection_id.
+    op.execute(
+        "ALTER TABLE projects "
+        "DROP COLUMN IF EXISTS chroma_collection_id, "
+        "ADD COLUMN openai_vector_store_id VARCHAR(255), "
+        "ADD COLUMN openai_assistant_id VARCHAR(255)"
+    )
     
     # Add OpenAI file ID to materials
     op.add_column('materials', sa.Column('openai_file_id', sa.String(255), nullable=True))
@@ -36,8 +39,11 @@ def upgrade() -> None:
 def downgrade() -> None:
     # Remove OpenAI columns
     op.drop_column('materials', 'openai_file_id')
-    op.drop_column('projects', 'openai_assistant_id')
-    op.drop_column('projects', 'openai_vector_store_id')
     
     # Restore ChromaDB column
-    op.add_column('projects', sa.Column('chroma_collection_id', sa.String(255), nullable=True))
+    op.execute(
+        "ALTER TABLE projects "
+        "DROP COLUMN openai_assistant_id, "
+        "DROP COLUMN openai_vector_store_id, "
+        "ADD COLUMN chroma_collection_id VARCHAR(255)"
+    )
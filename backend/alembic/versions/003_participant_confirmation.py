@@ -6,7 +6,8 @@ Create Date: 2024-12-05
 
 """
 from alembic import op
-import sqlalchemy as sa
+
+from helpers.columns import add_not_null_columns
 
 
 # revision identifiers, used by Alembic.
@@ -17,44 +18,43 @@ depends_on = None
 
 
 def upgrade() -> None:
-    # Add confirmation_status column with default 'pending'
-    op.add_column(
+    # Add confirmation_status (default 'pending') and the student_user_id
+    # foreign key in a single ALTER TABLE
+    add_not_null_columns(
         'participants',
-        sa.Column(
-            'confirmation_status',
-            sa.String(20),
-            nullable=False,
-            server_default='pending'
-        )
+        [('confirmation_status', 'VARCHAR(20)', "'pending'")],
+        extra=[
+            "ADD COLUMN IF NOT EXISTS student_user_id UUID "
+            "REFERENCES users (id) ON DELETE SET NULL"
+        ],
+        if_not_exists=True,
     )
     
-    # Add student_user_id foreign key column
-    op.add_column(
-        'participants',
-        sa.Column(
-            'student_user_id',
-            sa.UUID(),
-            sa.ForeignKey('users.id', ondelete='SET NULL'),
-            nullable=True
+    # Build indexes without blocking writes on an already populated table.
+    # CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_participants_confirmation_status',
+            'participants',
+            ['confirmation_status'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+        op.create_index(
+            'ix_participants_student_user_id',
+            'participants',
+            ['student_user_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
         )
-    )
-    
-    # Create index for faster lookups
-    op.create_index(
-        'ix_participants_confirmation_status',
-        'participants',
-        ['confirmation_status']
-    )
-    
-    op.create_index(
-        'ix_participants_student_user_id',
-        'participants',
-        ['student_user_id']
-    )
 
 
 def downgrade() -> None:
     op.drop_index('ix_participants_student_user_id', 'participants')
     op.drop_index('ix_participants_confirmation_status', 'participants')
-    op.drop_column('participants', 'student_user_id')
-    op.drop_column('participants', 'confirmation_status')
+    op.execute(
+        "ALTER TABLE participants "
+        "DROP COLUMN student_user_id, "
+        "DROP COLUMN confirmation_status"
+    )
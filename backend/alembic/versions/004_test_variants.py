@@ -6,7 +6,8 @@ Create Date: 2025-12-05
 
 """
 from alembic import op
-import sqlalchemy as sa
+
+from helpers.columns import add_not_null_columns
 
 
 # revision identifiers, used by Alembic.
@@ -18,35 +19,25 @@ depends_on = None
 
 def upgrade() -> None:
     # Add variant_number to questions table
-    op.add_column(
-        'questions',
-        sa.Column('variant_number', sa.Integer(), nullable=False, server_default='1')
-    )
-    
-    # Add index for faster variant filtering
-    op.create_index(
-        'ix_questions_variant_number',
-        'questions',
-        ['variant_number']
-    )
+    add_not_null_columns('questions', [('variant_number', 'INTEGER', '1')], if_not_exists=True)
     
-    # Add composite index for project + variant queries
-    op.create_index(
-        'ix_questions_project_variant',
-        'questions',
-        ['project_id', 'variant_number']
-    )
+    # Build indexes without blocking writes on an already populated table.
+    # CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        # Composite index for project + variant queries
+        op.create_index(
+            'ix_questions_project_variant',
+            'questions',
+            ['project_id', 'variant_number'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
     
     # Add variant_number to tests table
-    op.add_column(
-        'tests',
-        sa.Column('variant_number', sa.Integer(), nullable=False, server_default='1')
-    )
+    add_not_null_columns('tests', [('variant_number', 'INTEGER', '1')], if_not_exists=True)
 
 
 def downgrade() -> None:
     op.drop_column('tests', 'variant_number')
     op.drop_index('ix_questions_project_variant', 'questions')
-    op.drop_index('ix_questions_variant_number', 'questions')
-    op.drop_column('questions', 'variant_number')
     op.drop_column('questions', 'variant_number')
@@ -1,4 +1,8 @@
-"""Add num_variants field to projects table
+"""Add num_variants, test_language and timer_mode to projects
+
+test_language (006) and timer_mode (008) are added here as well so the
+projects table is altered once; 006 and 008 skip columns that already
+exist and remain for databases that applied them separately.
 
 Revision ID: 005_project_num_variants
 Revises: 004_test_variants
@@ -6,7 +10,8 @@ Create Date: 2025-12-06
 
 """
 from alembic import op
-import sqlalchemy as sa
+
+from helpers.columns import add_not_null_columns
 
 
 # revision identifiers, used by Alembic.
@@ -17,13 +22,24 @@ depends_on = None
 
 
 def upgrade() -> None:
-    # Add num_variants to projects table
-    # Default 1 for existing projects, can be configured 1-30
-    op.add_column(
+    # num_variants: default 1 for existing projects, can be configured 1-30
+    # test_language: default to English
+    # timer_mode: 'total' or 'per_question'
+    add_not_null_columns(
         'projects',
-        sa.Column('num_variants', sa.Integer(), nullable=False, server_default='1')
+        [
+            ('num_variants', 'INTEGER', '1'),
+            ('test_language', 'VARCHAR(10)', "'en'"),
+            ('timer_mode', 'VARCHAR(20)', "'total'"),
+        ],
+        if_not_exists=True,
     )
 
 
 def downgrade() -> None:
-    op.drop_column('projects', 'num_variants')
+    op.execute(
+        "ALTER TABLE projects "
+        "DROP COLUMN IF EXISTS timer_mode, "
+        "DROP COLUMN IF EXISTS test_language, "
+        "DROP COLUMN IF EXISTS num_variants"
+    )
@@ -7,10 +7,14 @@ Create Date: 2025-12-06
 Adds test_language column to store the language for generated test questions.
 This allows teachers to generate questions in any language regardless of 
 the source material language.
+
+The column is now added together with the other projects columns in 005;
+this revision only adds it where 005 was applied before that change.
 """
 
 from alembic import op
-import sqlalchemy as sa
+
+from helpers.columns import add_not_null_columns
 
 
 # revision identifiers
@@ -22,17 +26,12 @@ depends_on = None
 
 def upgrade():
     """Add test_language column to projects table"""
-    op.add_column(
-        'projects',
-        sa.Column(
-            'test_language',
-            sa.String(10),
-            nullable=False,
-            server_default='en'  # Default to English
-        )
+    # Default to English
+    add_not_null_columns(
+        'projects', [('test_language', 'VARCHAR(10)', "'en'")], if_not_exists=True
     )
 
 
 def downgrade():
     """Remove test_language column from projects table"""
-    op.drop_column('projects', 'test_language')
+    op.execute("ALTER TABLE projects DROP COLUMN IF EXISTS test_language")
@@ -5,14 +5,12 @@ Revises: 006_test_language
 Create Date: 2025-12-08
 
 Adds fields for storing detailed AI grading results:
-- ai_grading_details: JSON field with criteria scores and feedback
+- ai_grading_details: JSONB field with criteria scores and feedback
 - graded_by: Who/what graded the answer (ai, manual, system)
 - grading_status: Status of grading (pending, completed, failed)
 """
 
 from alembic import op
-import sqlalchemy as sa
-from sqlalchemy.dialects.postgresql import JSON
 
 
 # revision identifiers, used by Alembic.
@@ -23,41 +21,33 @@ depends_on = None
 
 
 def upgrade() -> None:
-    # Add AI grading fields to answers table
-    op.add_column(
-        'answers',
-        sa.Column(
-            'ai_grading_details',
-            JSON,
-            nullable=True,
-            comment='Detailed AI grading results with criteria scores'
-        )
+    # Add AI grading fields to answers table in a single ALTER TABLE
+    op.execute(
+        "ALTER TABLE answers "
+        "ADD COLUMN ai_grading_details JSONB, "
+        "ADD COLUMN graded_by VARCHAR(50), "
+        "ADD COLUMN grading_status VARCHAR(20)"
     )
     
-    op.add_column(
-        'answers',
-        sa.Column(
-            'graded_by',
-            sa.String(50),
-            nullable=True,
-            default='pending',
-            comment='Who graded: ai, manual, system, pending_manual_review'
-        )
+    # Column comments only touch pg_description
+    op.execute(
+        "COMMENT ON COLUMN answers.ai_grading_details IS "
+        "'Detailed AI grading results with criteria scores'"
     )
-    
-    op.add_column(
-        'answers',
-        sa.Column(
-            'grading_status',
-            sa.String(20),
-            nullable=True,
-            default='pending',
-            comment='Grading status: pending, in_progress, completed, failed'
-        )
+    op.execute(
+        "COMMENT ON COLUMN answers.graded_by IS "
+        "'Who graded: ai, manual, system, pending_manual_review'"
+    )
+    op.execute(
+        "COMMENT ON COLUMN answers.grading_status IS "
+        "'Grading status: pending, in_progress, completed, failed'"
     )
 
 
 def downgrade() -> None:
-    op.drop_column('answers', 'grading_status')
-    op.drop_column('answers', 'graded_by')
-    op.drop_column('answers', 'ai_grading_details')
+    op.execute(
+        "ALTER TABLE answers "
+        "DROP COLUMN grading_status, "
+        "DROP COLUMN graded_by, "
+        "DROP COLUMN ai_grading_details"
+    )
@@ -7,10 +7,14 @@ Create Date: 2025-12-11
 Timer mode allows choosing between:
 - 'total': Use total_time (minutes) for entire test
 - 'per_question': Use time_per_question (seconds) per each question
+
+The column is now added together with the other projects columns in 005;
+this revision only adds it where 005 was applied before that change.
 """
 
 from alembic import op
-import sqlalchemy as sa
+
+from helpers.columns import add_not_null_columns
 
 
 # revision identifiers, used by Alembic.
@@ -22,11 +26,10 @@ depends_on = None
 
 def upgrade() -> None:
     # Add timer_mode column with default 'total'
-    op.add_column(
-        'projects',
-        sa.Column('timer_mode', sa.String(20), nullable=False, server_default='total')
+    add_not_null_columns(
+        'projects', [('timer_mode', 'VARCHAR(20)', "'total'")], if_not_exists=True
     )
 
 
 def downgrade() -> None:
-    op.drop_column('projects', 'timer_mode')
+    op.execute("ALTER TABLE projects DROP COLUMN IF EXISTS timer_mode")
@@ -0,0 +1,39 @@
+"""Drop redundant ix_questions_variant_number
+
+Revision ID: 012_drop_question_variant_index
+Revises: 011_email_verification
+Create Date: 2026-10-16
+
+Questions are always looked up per project; the composite
+ix_questions_project_variant (project_id, variant_number) serves those
+queries, so the single-column variant index only costs index maintenance
+on every insert.
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = '012_drop_question_variant_index'
+down_revision: Union[str, None] = '011_email_verification'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_questions_variant_number',
+            'questions',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_questions_variant_number',
+            'questions',
+            ['variant_number'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
@@ -0,0 +1,81 @@
+"""Replace full status indexes with partial indexes
+
+Revision ID: 013_partial_status_indexes
+Revises: 012_drop_question_variant_index
+Create Date: 2026-10-16
+
+Status columns hold a handful of distinct values, and most rows sit in a
+terminal state (completed tests, confirmed participants, finished
+projects). Full B-tree indexes over them are large and updated on every
+status change while only the "open" rows are ever looked up by status.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '013_partial_status_indexes'
+down_revision: Union[str, None] = '012_drop_question_variant_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (old index, new index, table, column, predicate)
+PARTIAL_INDEXES = [
+    (
+        'ix_projects_status',
+        'ix_projects_status_open',
+        'projects',
+        'status',
+        "status IN ('ready', 'active')",
+    ),
+    (
+        'ix_tests_status',
+        'ix_tests_status_active',
+        'tests',
+        'status',
+        "status IN ('pending', 'in-progress')",
+    ),
+    (
+        'ix_participants_confirmation_status',
+        'ix_participants_confirmation_pending',
+        'participants',
+        'confirmation_status',
+        "confirmation_status = 'pending'",
+    ),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for old_name, new_name, table, column, predicate in PARTIAL_INDEXES:
+            op.create_index(
+                new_name,
+                table,
+                [column],
+                postgresql_where=sa.text(predicate),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+            op.drop_index(
+                old_name,
+                table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for old_name, new_name, table, column, _ in PARTIAL_INDEXES:
+            op.create_index(
+                old_name,
+                table,
+                [column],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+            op.drop_index(
+                new_name,
+                table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
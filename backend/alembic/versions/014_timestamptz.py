@@ -0,0 +1,71 @@
+"""Store all timestamps as TIMESTAMPTZ
+
+Revision ID: 014_timestamptz
+Revises: 013_partial_status_indexes
+Create Date: 2026-10-16
+
+Every timestamp column holds UTC wall-clock values. With the session
+time zone pinned to UTC the timestamp -> timestamptz conversion is
+value-preserving and PostgreSQL 12+ performs it without rewriting the
+table or its indexes. Columns are discovered from the catalog so that
+databases bootstrapped from the models and from migrations are both
+covered; each table gets a single ALTER TABLE.
+"""
+from collections import defaultdict
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '014_timestamptz'
+down_revision: Union[str, None] = '013_partial_status_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = [
+    'users',
+    'material_folders',
+    'participant_groups',
+    'participants',
+    'projects',
+    'question_type_configs',
+    'materials',
+    'questions',
+    'tests',
+    'answers',
+    'student_emails',
+    'project_materials',
+    'project_participants',
+]
+
+
+def _retype_columns(data_type: str, new_type: str) -> None:
+    """Change every column of data_type in TABLES to new_type, one ALTER per table."""
+    op.execute("SET LOCAL TIME ZONE 'UTC'")
+
+    rows = op.get_bind().execute(
+        sa.text(
+            "SELECT table_name, column_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() "
+            "AND table_name IN :tables AND data_type = :data_type "
+            "ORDER BY table_name, ordinal_position"
+        ).bindparams(sa.bindparam('tables', expanding=True)),
+        {'tables': TABLES, 'data_type': data_type},
+    ).all()
+
+    columns_by_table = defaultdict(list)
+    for table, column in rows:
+        columns_by_table[table].append(column)
+
+    for table, columns in columns_by_table.items():
+        op.execute(
+            f"ALTER TABLE {table} "
+            + ", ".join(f"ALTER COLUMN {column} TYPE {new_type}" for column in columns)
+        )
+
+
+def upgrade() -> None:
+    _retype_columns('timestamp without time zone', 'TIMESTAMPTZ')
+
+
+def downgrade() -> None:
+    _retype_columns('timestamp with time zone', 'TIMESTAMP')
@@ -0,0 +1,30 @@
+"""Store answers.ai_grading_details as JSONB
+
+Revision ID: 015_ai_grading_details_jsonb
+Revises: 014_timestamptz
+Create Date: 2026-10-16
+
+JSON keeps the raw text and re-parses it on every read; JSONB stores the
+decoded form like the other JSON payload columns in the schema.
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = '015_ai_grading_details_jsonb'
+down_revision: Union[str, None] = '014_timestamptz'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE answers ALTER COLUMN ai_grading_details "
+        "TYPE JSONB USING ai_grading_details::jsonb"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE answers ALTER COLUMN ai_grading_details "
+        "TYPE JSON USING ai_grading_details::json"
+    )
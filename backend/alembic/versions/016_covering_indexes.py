@@ -0,0 +1,53 @@
+"""Turn the dashboard foreign-key indexes into covering indexes
+
+Revision ID: 016_covering_indexes
+Revises: 015_ai_grading_details_jsonb
+Create Date: 2026-10-16
+
+Teacher dashboards list projects by teacher, tests by project and
+answers by test, reading only a few narrow columns. INCLUDE-ing those
+columns lets PostgreSQL answer with index-only scans instead of an index
+probe plus a heap fetch per row. Each index is rebuilt concurrently
+under a temporary name and swapped in place of the old one.
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = '016_covering_indexes'
+down_revision: Union[str, None] = '015_ai_grading_details_jsonb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, key column, included columns)
+COVERING_INDEXES = [
+    ('ix_projects_teacher_id', 'projects', 'teacher_id', ['status', 'title', 'created_at']),
+    ('ix_tests_project_id', 'tests', 'project_id', ['student_id', 'status', 'score']),
+    ('ix_answers_test_id', 'answers', 'test_id', ['question_id', 'is_correct', 'score']),
+]
+
+
+def _swap_index(name: str, table: str, column: str, include: list) -> None:
+    """Build the replacement index concurrently, then swap it in by name."""
+    tmp_name = f'{name}_new'
+    op.create_index(
+        tmp_name,
+        table,
+        [column],
+        postgresql_include=include,
+        postgresql_concurrently=True,
+        if_not_exists=True,
+    )
+    op.drop_index(name, table, postgresql_concurrently=True, if_exists=True)
+    op.execute(f'ALTER INDEX {tmp_name} RENAME TO {name}')
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, column, include in COVERING_INDEXES:
+            _swap_index(name, table, column, include)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, column, _ in COVERING_INDEXES:
+            _swap_index(name, table, column, [])
@@ -0,0 +1,104 @@
+"""Store discrete status columns as native ENUM types
+
+Revision ID: 017_status_enums
+Revises: 016_covering_indexes
+Create Date: 2026-10-16
+
+Role, status and grading columns hold values from small fixed sets.
+Native enums store them in 4 bytes instead of a varlena string and
+compare as integers. Each table is retyped with a single ALTER TABLE
+(one rewrite per table). The partial status indexes are rebuilt so
+their predicates compare enum values rather than casted text.
+"""
+from collections import defaultdict
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = '017_status_enums'
+down_revision: Union[str, None] = '016_covering_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ENUM_TYPES = {
+    'user_role': ('teacher', 'student'),
+    'project_status': (
+        'draft', 'vectorizing', 'ready', 'generating', 'active', 'completed', 'error',
+    ),
+    'timer_mode': ('total', 'per_question'),
+    'test_status': ('pending', 'in-progress', 'completed', 'graded'),
+    'participant_type': ('individual', 'group-member'),
+    'confirmation_status': ('pending', 'confirmed', 'rejected', 'contact_requested'),
+    'graded_by': ('pending', 'ai', 'manual', 'system', 'pending_manual_review'),
+    'grading_status': ('pending', 'in_progress', 'completed', 'failed'),
+}
+
+# (table, column, enum type, default, previous type)
+ENUM_COLUMNS = [
+    ('users', 'role', 'user_role', 'student', 'VARCHAR(20)'),
+    ('projects', 'status', 'project_status', 'draft', 'VARCHAR(20)'),
+    ('projects', 'timer_mode', 'timer_mode', 'total', 'VARCHAR(20)'),
+    ('tests', 'status', 'test_status', 'pending', 'VARCHAR(20)'),
+    ('participants', 'participant_type', 'participant_type', 'individual', 'VARCHAR(20)'),
+    ('participants', 'confirmation_status', 'confirmation_status', 'pending', 'VARCHAR(20)'),
+    ('answers', 'graded_by', 'graded_by', None, 'VARCHAR(50)'),
+    ('answers', 'grading_status', 'grading_status', None, 'VARCHAR(20)'),
+]
+
+# Partial indexes from 013 whose predicates reference retyped columns:
+# (name, table, column, predicate)
+PARTIAL_INDEXES = [
+    ('ix_projects_status_open', 'projects', 'status', "status IN ('ready', 'active')"),
+    ('ix_tests_status_active', 'tests', 'status', "status IN ('pending', 'in-progress')"),
+    (
+        'ix_participants_confirmation_pending',
+        'participants',
+        'confirmation_status',
+        "confirmation_status = 'pending'",
+    ),
+]
+
+
+def _retype(to_enum: bool) -> None:
+    """Retype ENUM_COLUMNS with one ALTER TABLE per table."""
+    clauses_by_table = defaultdict(list)
+    for table, column, enum_type, default, old_type in ENUM_COLUMNS:
+        new_type = enum_type if to_enum else old_type
+        cast = enum_type if to_enum else 'text'
+        clauses = clauses_by_table[table]
+        clauses.append(f"ALTER COLUMN {column} DROP DEFAULT")
+        clauses.append(f"ALTER COLUMN {column} TYPE {new_type} USING {column}::{cast}")
+        if default is not None:
+            clauses.append(f"ALTER COLUMN {column} SET DEFAULT '{default}'")
+
+    for table, clauses in clauses_by_table.items():
+        op.execute(f"ALTER TABLE {table} " + ", ".join(clauses))
+
+
+def _drop_partial_indexes() -> None:
+    for name, _, _, _ in PARTIAL_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def _create_partial_indexes() -> None:
+    # Tables were just rewritten under ACCESS EXCLUSIVE; build in place.
+    for name, table, column, predicate in PARTIAL_INDEXES:
+        op.execute(f"CREATE INDEX {name} ON {table} ({column}) WHERE {predicate}")
+
+
+def upgrade() -> None:
+    for name, values in ENUM_TYPES.items():
+        labels = ", ".join(f"'{value}'" for value in values)
+        op.execute(f"CREATE TYPE {name} AS ENUM ({labels})")
+
+    _drop_partial_indexes()
+    _retype(to_enum=True)
+    _create_partial_indexes()
+
+
+def downgrade() -> None:
+    _drop_partial_indexes()
+    _retype(to_enum=False)
+    _create_partial_indexes()
+
+    for name in ENUM_TYPES:
+        op.execute(f"DROP TYPE {name}")
@@ -0,0 +1,49 @@
+"""Maintain updated_at with a database trigger
+
+Revision ID: 018_updated_at_trigger
+Revises: 017_status_enums
+Create Date: 2026-10-16
+
+One trigger function bumps updated_at inside the row being updated, so
+the column is correct for every writer (ORM flushes, bulk UPDATE
+statements, Celery workers) without the application setting it. The
+trigger is attached to every table that has an updated_at column.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '018_updated_at_trigger'
+down_revision: Union[str, None] = '017_status_enums'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _tables_with_updated_at() -> list:
+    return op.get_bind().execute(
+        sa.text(
+            "SELECT table_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND column_name = 'updated_at' "
+            "ORDER BY table_name"
+        )
+    ).scalars().all()
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$ "
+        "BEGIN NEW.updated_at = now(); RETURN NEW; END; "
+        "$$ LANGUAGE plpgsql"
+    )
+    for table in _tables_with_updated_at():
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_updated_at ON {table}")
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_updated_at BEFORE UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+        )
+
+
+def downgrade() -> None:
+    for table in _tables_with_updated_at():
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_updated_at ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS set_updated_at()")
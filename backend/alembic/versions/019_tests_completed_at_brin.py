@@ -0,0 +1,41 @@
+"""BRIN index on tests.completed_at for time-window scans
+
+Revision ID: 019_tests_completed_at_brin
+Revises: 018_updated_at_trigger
+Create Date: 2026-10-16
+
+Tests are appended in roughly chronological order and completed shortly
+after they start, so completed_at correlates with physical row order.
+A BRIN index (a few pages for millions of rows) lets time-window scans
+over the whole history (period analytics, rollups, retention jobs)
+read only the block ranges of the requested period.
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = '019_tests_completed_at_brin'
+down_revision: Union[str, None] = '018_updated_at_trigger'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tests_completed_at_brin',
+            'tests',
+            ['completed_at'],
+            postgresql_using='brin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tests_completed_at_brin',
+            'tests',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,52 @@
+"""Make ix_student_emails_email unique
+
+Revision ID: 020_unique_student_emails
+Revises: 019_tests_completed_at_brin
+Create Date: 2026-10-16
+
+An additional student email can belong to one account only; the API
+already checks this before inserting. Enforcing it with a unique index
+removes the race between check and insert and lets lookups stop at the
+first match. Duplicates left by that race are removed first, keeping
+the oldest claim.
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = '020_unique_student_emails'
+down_revision: Union[str, None] = '019_tests_completed_at_brin'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _swap_index(unique: bool) -> None:
+    """Build the replacement index concurrently, then swap it in by name."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_student_emails_email_new',
+            'student_emails',
+            ['email'],
+            unique=unique,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_student_emails_email',
+            'student_emails',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.execute('ALTER INDEX ix_student_emails_email_new RENAME TO ix_student_emails_email')
+
+
+def upgrade() -> None:
+    op.execute(
+        "DELETE FROM student_emails newer USING student_emails older "
+        "WHERE newer.email = older.email "
+        "AND (newer.created_at, newer.id) > (older.created_at, older.id)"
+    )
+    _swap_index(unique=True)
+
+
+def downgrade() -> None:
+    _swap_index(unique=False)
@@ -0,0 +1,35 @@
+"""fillfactor 70 on tests, answers and participants
+
+Revision ID: 021_hot_update_fillfactor
+Revises: 020_unique_student_emails
+Create Date: 2026-10-16
+
+Rows of these tables are updated several times after insert (test
+status and score, answer grading, participant confirmation). Keeping
+30% of every page free lets such updates stay on the same page as HOT
+updates, which skip index maintenance when no indexed column changes.
+
+The new fillfactor applies to pages written from now on; existing pages
+are not rewritten here, since VACUUM FULL would hold an ACCESS EXCLUSIVE
+lock on the table for the whole rewrite. Run pg_repack during a quiet
+period to apply it to old pages without downtime.
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = '021_hot_update_fillfactor'
+down_revision: Union[str, None] = '020_unique_student_emails'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['tests', 'answers', 'participants']
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} SET (fillfactor = 70)")
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} RESET (fillfactor)")
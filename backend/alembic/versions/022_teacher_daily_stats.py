@@ -0,0 +1,40 @@
+"""teacher_daily_stats roll-up table
+
+Revision ID: 022_teacher_daily_stats
+Revises: 021_hot_update_fillfactor
+Create Date: 2026-10-16
+
+Per-teacher, per-day aggregates of completed tests, filled nightly by
+the rollup_teacher_daily_stats task. Teacher analytics sums these rows
+instead of scanning the full test history.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = '022_teacher_daily_stats'
+down_revision: Union[str, None] = '021_hot_update_fillfactor'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'teacher_daily_stats',
+        sa.Column('teacher_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('tests_completed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('score_sum', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('scored_count', sa.Integer(), nullable=False, server_default='0'),
+        *[
+            sa.Column(f'bucket_{i}', sa.Integer(), nullable=False, server_default='0')
+            for i in range(5)
+        ],
+        sa.ForeignKeyConstraint(['teacher_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('teacher_id', 'day'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('teacher_daily_stats')
@@ -0,0 +1,56 @@
+"""Replace ix_tests_project_id with an analytics covering index
+
+Revision ID: 023_tests_analytics_index
+Revises: 022_teacher_daily_stats
+Create Date: 2026-10-16
+
+Teacher analytics filters tests by project, status and completion time
+and aggregates student_id, score, max_score and created_at. Keying the
+index on (project_id, status, completed_at) and INCLUDE-ing the rest
+turns those aggregates into index-only scans. The index still leads
+with project_id, so it also serves every lookup ix_tests_project_id
+did, and the old index is dropped.
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = '023_tests_analytics_index'
+down_revision: Union[str, None] = '022_teacher_daily_stats'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tests_project_status_completed',
+            'tests',
+            ['project_id', 'status', 'completed_at'],
+            postgresql_include=['student_id', 'score', 'max_score', 'created_at'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_tests_project_id',
+            'tests',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tests_project_id',
+            'tests',
+            ['project_id'],
+            postgresql_include=['student_id', 'status', 'score'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_tests_project_status_completed',
+            'tests',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,56 @@
+"""Generated tests.score_pct column
+
+Revision ID: 024_tests_score_pct
+Revises: 023_tests_analytics_index
+Create Date: 2026-10-16
+
+Analytics aggregates the score percentage of every test. Storing it as a
+generated column computes the division once per write instead of once
+per row per query, yields NULL (not a division-by-zero error) for tests
+without a max score, and lets the analytics covering index carry the
+value so the aggregates stay index-only.
+
+Adding a stored generated column rewrites the tests table under an
+ACCESS EXCLUSIVE lock; run it in a maintenance window on large installs.
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = '024_tests_score_pct'
+down_revision: Union[str, None] = '023_tests_analytics_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCORE_PCT = 'CASE WHEN max_score > 0 THEN score * 100.0 / max_score END'
+INDEX = 'ix_tests_project_status_completed'
+INDEX_COLUMNS = ['project_id', 'status', 'completed_at']
+
+
+def _swap_index(include: list) -> None:
+    """Rebuild the analytics index concurrently with a new INCLUDE list."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            f'{INDEX}_new',
+            'tests',
+            INDEX_COLUMNS,
+            postgresql_include=include,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(INDEX, 'tests', postgresql_concurrently=True, if_exists=True)
+        op.execute(f'ALTER INDEX {INDEX}_new RENAME TO {INDEX}')
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS: the index swap below commits on its own, so a failed
+    # run can leave this column in place without the revision being stamped
+    op.execute(
+        'ALTER TABLE tests ADD COLUMN IF NOT EXISTS score_pct double precision '
+        f'GENERATED ALWAYS AS ({SCORE_PCT}) STORED'
+    )
+    _swap_index(['student_id', 'score_pct', 'created_at'])
+
+
+def downgrade() -> None:
+    _swap_index(['student_id', 'score', 'max_score', 'created_at'])
+    op.execute('ALTER TABLE tests DROP COLUMN IF EXISTS score_pct')
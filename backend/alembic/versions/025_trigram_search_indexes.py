@@ -0,0 +1,51 @@
+"""Trigram GIN indexes for material and participant search
+
+Revision ID: 025_trigram_search_indexes
+Revises: 024_tests_score_pct
+Create Date: 2026-10-16
+
+The list endpoints search with ILIKE '%term%', which a B-tree cannot
+serve, so every search scanned the teacher's rows. pg_trgm GIN indexes
+answer infix ILIKE patterns directly. The extension is left installed
+on downgrade.
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = '025_trigram_search_indexes'
+down_revision: Union[str, None] = '024_tests_score_pct'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = [
+    ('ix_materials_original_name_trgm', 'materials', 'original_name'),
+    ('ix_participants_email_trgm', 'participants', 'email'),
+    ('ix_participants_first_name_trgm', 'participants', 'first_name'),
+    ('ix_participants_last_name_trgm', 'participants', 'last_name'),
+]
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in TRIGRAM_INDEXES:
+            op.drop_index(
+                name,
+                table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
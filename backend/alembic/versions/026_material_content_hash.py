@@ -0,0 +1,46 @@
+"""Add materials.content_hash for duplicate upload detection
+
+Revision ID: 026_material_content_hash
+Revises: 025_trigram_search_indexes
+Create Date: 2026-10-16
+
+SHA-256 of the uploaded file, computed while the upload is copied to
+disk. A unique index per teacher lets a re-upload of the same file
+return the existing material instead of storing a second copy. Rows
+uploaded before this revision have no hash and are never matched.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '026_material_content_hash'
+down_revision: Union[str, None] = '025_trigram_search_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS: the index below commits on its own, so a failed run
+    # can leave this column in place without the revision being stamped
+    op.execute('ALTER TABLE materials ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)')
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_materials_teacher_content_hash',
+            'materials',
+            ['teacher_id', 'content_hash'],
+            unique=True,
+            postgresql_where=sa.text('content_hash IS NOT NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_materials_teacher_content_hash',
+            'materials',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column('materials', 'content_hash')
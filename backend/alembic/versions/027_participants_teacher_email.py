@@ -0,0 +1,63 @@
+"""Lowercase stored emails and index participants by (teacher_id, email)
+
+Revision ID: 027_participants_teacher_email
+Revises: 026_material_content_hash
+Create Date: 2026-10-16
+
+Request schemas now lowercase emails when parsing, so queries compare the
+column directly and a plain B-tree serves them; no lower() expression
+index or CITEXT is needed. Rows written before by paths that kept the
+original case are lowercased here (student emails only where that does
+not collide with an existing address).
+
+Participants are looked up by teacher and email; the composite index
+also serves every teacher_id-only lookup, so it replaces
+ix_participants_teacher_id.
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = '027_participants_teacher_email'
+down_revision: Union[str, None] = '026_material_content_hash'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE participants SET email = lower(email) WHERE email <> lower(email)")
+    op.execute(
+        "UPDATE student_emails s SET email = lower(s.email) "
+        "WHERE s.email <> lower(s.email) AND NOT EXISTS "
+        "(SELECT 1 FROM student_emails o WHERE o.email = lower(s.email))"
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_participants_teacher_email',
+            'participants',
+            ['teacher_id', 'email'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_participants_teacher_id',
+            'participants',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_participants_teacher_id',
+            'participants',
+            ['teacher_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_participants_teacher_email',
+            'participants',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
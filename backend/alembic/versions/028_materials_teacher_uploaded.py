@@ -0,0 +1,53 @@
+"""Index materials by (teacher_id, uploaded_at, id) for keyset pagination
+
+Revision ID: 028_materials_teacher_uploaded
+Revises: 027_participants_teacher_email
+Create Date: 2026-10-16
+
+The material list is ordered by uploaded_at DESC, id DESC and pages by
+seeking past the previous page's last (uploaded_at, id). With this index
+each page is a short backward range scan of the teacher's entries,
+however deep the page. It leads with teacher_id, so it replaces
+ix_materials_teacher_id.
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = '028_materials_teacher_uploaded'
+down_revision: Union[str, None] = '027_participants_teacher_email'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_materials_teacher_uploaded',
+            'materials',
+            ['teacher_id', 'uploaded_at', 'id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_materials_teacher_id',
+            'materials',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_materials_teacher_id',
+            'materials',
+            ['teacher_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_materials_teacher_uploaded',
+            'materials',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
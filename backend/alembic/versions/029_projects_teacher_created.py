@@ -0,0 +1,56 @@
+"""Index projects by (teacher_id, created_at, id) for keyset pagination
+
+Revision ID: 029_projects_teacher_created
+Revises: 028_materials_teacher_uploaded
+Create Date: 2026-10-16
+
+The project list is ordered by created_at DESC, id DESC and pages by
+seeking past the previous page's last (created_at, id). With this index
+each page is a short backward range scan of the teacher's entries,
+however deep the page. It still INCLUDEs status and title, so it also
+serves the dashboard's index-only scans and replaces
+ix_projects_teacher_id.
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = '029_projects_teacher_created'
+down_revision: Union[str, None] = '028_materials_teacher_uploaded'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_projects_teacher_created',
+            'projects',
+            ['teacher_id', 'created_at', 'id'],
+            postgresql_include=['status', 'title'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_projects_teacher_id',
+            'projects',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_projects_teacher_id',
+            'projects',
+            ['teacher_id'],
+            postgresql_include=['status', 'title', 'created_at'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_projects_teacher_created',
+            'projects',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
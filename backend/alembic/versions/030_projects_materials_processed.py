@@ -0,0 +1,50 @@
+"""Add projects.materials_processed maintained by the vectorization worker
+
+Revision ID: 030_projects_materials_processed
+Revises: 029_projects_teacher_created
+Create Date: 2026-10-16
+
+The vectorization status endpoint is polled while materials are indexed
+and used to COUNT the project's done rows in project_materials on every
+poll. The worker now increments this counter in the same transaction
+that marks a material done, so a poll reads one column instead. Existing
+projects are backfilled from project_materials (whose is_vectorized
+column, missing from earlier revisions, is added here if absent).
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '030_projects_materials_processed'
+down_revision: Union[str, None] = '029_projects_teacher_created'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The status column exists in the model but was never added by a
+    # revision; databases built from the migrations alone lack it
+    op.execute(
+        'ALTER TABLE project_materials ADD COLUMN IF NOT EXISTS is_vectorized INTEGER DEFAULT 0'
+    )
+    op.add_column(
+        'projects',
+        sa.Column('materials_processed', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.execute(
+        """
+        UPDATE projects p
+        SET materials_processed = done.n
+        FROM (
+            SELECT project_id, count(*) AS n
+            FROM project_materials
+            WHERE is_vectorized = 2
+            GROUP BY project_id
+        ) done
+        WHERE done.project_id = p.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('projects', 'materials_processed')
@@ -0,0 +1,46 @@
+"""Store projects.allowed_students as jsonb
+
+Revision ID: 031_projects_allowed_students_jsonb
+Revises: 030_projects_materials_processed
+Create Date: 2026-10-16
+
+Adding a student to a project used to read the email list, append in
+Python and write the whole list back (a lost update when two requests
+raced). With jsonb the append is a single UPDATE using the @> and ||
+operators, which plain json does not have. The column itself was
+missing from earlier revisions and is added here if absent.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = '031_projects_allowed_students_jsonb'
+down_revision: Union[str, None] = '030_projects_materials_processed'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The column exists in the model but was never added by a revision;
+    # databases built from the migrations alone lack it
+    op.execute('ALTER TABLE projects ADD COLUMN IF NOT EXISTS allowed_students json')
+    op.alter_column(
+        'projects',
+        'allowed_students',
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        existing_nullable=True,
+        postgresql_using='allowed_students::jsonb',
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'projects',
+        'allowed_students',
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using='allowed_students::json',
+    )
@@ -0,0 +1,42 @@
+"""Index projects.allowed_students with GIN for containment lookups
+
+Revision ID: 032_projects_allowed_students_gin
+Revises: 031_projects_allowed_students_jsonb
+Create Date: 2026-10-16
+
+With allowed_students stored as jsonb, "projects this email is allowed
+into" is allowed_students @> '["email"]'. A jsonb_path_ops GIN index
+answers that from the index instead of reading every project's list;
+the per-project membership check of the add-student UPDATE is a
+primary-key lookup and does not need it.
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = '032_projects_allowed_students_gin'
+down_revision: Union[str, None] = '031_projects_allowed_students_jsonb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_projects_allowed_students_gin',
+            'projects',
+            ['allowed_students'],
+            postgresql_using='gin',
+            postgresql_ops={'allowed_students': 'jsonb_path_ops'},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_projects_allowed_students_gin',
+            'projects',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,40 @@
+"""Index projects by (teacher_id, id) for ownership checks
+
+Revision ID: 033_projects_teacher_id_id
+Revises: 032_projects_allowed_students_gin
+Create Date: 2026-10-16
+
+Ownership checks select a project's id by id and teacher_id. The primary
+key finds the row but needs a heap fetch to check teacher_id; this index
+answers them with an index-only scan. It is never updated by the
+frequent progress/status writes (neither column changes), so it does not
+cost those HOT updates.
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = '033_projects_teacher_id_id'
+down_revision: Union[str, None] = '032_projects_allowed_students_gin'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_projects_teacher_id_id',
+            'projects',
+            ['teacher_id', 'id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_projects_teacher_id_id',
+            'projects',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
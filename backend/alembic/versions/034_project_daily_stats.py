@@ -0,0 +1,57 @@
+"""Replace teacher_daily_stats with a per-project roll-up
+
+Revision ID: 034_project_daily_stats
+Revises: 033_projects_teacher_id_id
+Create Date: 2026-10-16
+
+Per-teacher rows kept counting the tests of deleted projects, and the
+incremental upsert never corrected older days whose tests changed
+status. Rows are now per project (deleted with it, and summed through
+the teacher's current projects) and the rollup task rebuilds every
+closed day. The table only holds derived data: it starts empty and is
+filled by the next rollup run.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = '034_project_daily_stats'
+down_revision: Union[str, None] = '033_projects_teacher_id_id'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _stats_columns() -> list:
+    return [
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('tests_completed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('score_sum', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('scored_count', sa.Integer(), nullable=False, server_default='0'),
+        *[
+            sa.Column(f'bucket_{i}', sa.Integer(), nullable=False, server_default='0')
+            for i in range(5)
+        ],
+    ]
+
+
+def upgrade() -> None:
+    op.drop_table('teacher_daily_stats')
+    op.create_table(
+        'project_daily_stats',
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+        *_stats_columns(),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id', 'day'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('project_daily_stats')
+    op.create_table(
+        'teacher_daily_stats',
+        sa.Column('teacher_id', postgresql.UUID(as_uuid=True), nullable=False),
+        *_stats_columns(),
+        sa.ForeignKeyConstraint(['teacher_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('teacher_id', 'day'),
+    )
@@ -0,0 +1,44 @@
+"""Drop the project_daily_stats roll-up
+
+Revision ID: 035_drop_project_daily_stats
+Revises: 034_project_daily_stats
+Create Date: 2026-10-16
+
+The roll-up only covered the additive overview measures. Distinct
+student counts, the started count and the recent/top/per-project lists
+still read the teacher's tests, so analytics did not get cheaper, while
+the nightly rebuild re-aggregated the whole tests table and lagged
+behind deleted results. Analytics is computed from tests again (and
+cached per teacher and period); the table, its task and the beat
+service are gone.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = '035_drop_project_daily_stats'
+down_revision: Union[str, None] = '034_project_daily_stats'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_table('project_daily_stats')
+
+
+def downgrade() -> None:
+    op.create_table(
+        'project_daily_stats',
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('tests_completed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('score_sum', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('scored_count', sa.Integer(), nullable=False, server_default='0'),
+        *[
+            sa.Column(f'bucket_{i}', sa.Integer(), nullable=False, server_default='0')
+            for i in range(5)
+        ],
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id', 'day'),
+    )
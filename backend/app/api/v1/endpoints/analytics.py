@@ -5,33 +5,36 @@ Teacher analytics and reporting.
 """
 
 from typing import Optional
-from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, Query
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+import orjson
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, case
 
 from app.core.deps import get_db, get_current_teacher
+from app.db.session import run_concurrently
 from app.models.user import User
 from app.models.project import Project
 from app.models.test import Test
 from app.models.participant import Participant
+from app.services import cache_service
 
 router = APIRouter()
 
 
-def get_period_start(period: str) -> datetime:
+# Length of each analytics period; anything else means all time
+PERIOD_DAYS = {"week": 7, "month": 30, "quarter": 90, "year": 365}
+ALL_TIME_START = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+# Score percentage ranges of the distribution
+SCORE_BUCKETS = [(0, 20), (21, 40), (41, 60), (61, 80), (81, 100)]
+
+
+def get_period_start(period: str, now: datetime) -> datetime:
     """Calculate start date based on period."""
-    now = datetime.utcnow()
-    if period == "week":
-        return now - timedelta(days=7)
-    elif period == "month":
-        return now - timedelta(days=30)
-    elif period == "quarter":
-        return now - timedelta(days=90)
-    elif period == "year":
-        return now - timedelta(days=365)
-    else:  # all
-        return datetime(2000, 1, 1)
+    days = PERIOD_DAYS.get(period)
+    return now - timedelta(days=days) if days is not None else ALL_TIME_START
 
 
 @router.get("")
@@ -42,16 +45,111 @@ async def get_analytics(
 ):
     """
     Get comprehensive analytics for teacher.
+    
+    Results are cached per (teacher, period) for a few minutes and dropped
+    whenever one of the teacher's tests is submitted.
     """
-    period_start = get_period_start(period)
-    prev_period_start = get_period_start(period) - (datetime.utcnow() - get_period_start(period))
+    # The body is encoded once and sent as stored; hits skip both JSON
+    # decoding and response serialization
+    cache_key = cache_service.analytics_key(current_user.id, period)
+    cached = await cache_service.get_raw(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json", headers={"X-Cache": "HIT"})
+    
+    body = orjson.dumps(await _compute_analytics(current_user.id, period, db))
+    await cache_service.set_raw(cache_key, body, cache_service.ANALYTICS_TTL)
+    return Response(content=body, media_type="application/json", headers={"X-Cache": "MISS"})
+
+
+async def _compute_analytics(teacher_id: UUID, period: str, db: AsyncSession) -> dict:
+    """Aggregate a teacher's test results for the given period."""
+    now = datetime.now(timezone.utc)
+    period_start = get_period_start(period, now)
+    prev_period_start = period_start - (now - period_start)
+    
+    # Teacher's projects, embedded as a subquery so the ids never leave
+    # the database
+    teacher_projects = select(Project.id).where(Project.teacher_id == teacher_id)
+    
+    # Overview aggregates, computed in one pass over the teacher's tests
+    score_pct = Test.score_pct
+    completed = Test.status == "completed"
+    scored = completed & score_pct.isnot(None)
+    overview_query = select(
+        func.count().filter(completed).label("total_tests"),
+        func.count().filter(completed, Test.completed_at >= period_start).label("tests_this_period"),
+        func.count(func.distinct(Test.student_id)).label("total_students"),
+        func.count(func.distinct(Test.student_id)).filter(
+            Test.created_at >= period_start
+        ).label("new_students"),
+        func.avg(score_pct).filter(scored).label("avg_score"),
+        func.avg(score_pct).filter(
+            scored,
+            Test.completed_at >= prev_period_start,
+            Test.completed_at < period_start,
+        ).label("prev_avg_score"),
+        func.count().filter(Test.status.in_(["in-progress", "completed"])).label("started"),
+        *[
+            func.count().filter(
+                scored, score_pct >= min_score, score_pct <= max_score
+            ).label(f"bucket_{i}")
+            for i, (min_score, max_score) in enumerate(SCORE_BUCKETS)
+        ],
+        teacher_projects.exists().label("has_projects"),
+    ).where(Test.project_id.in_(teacher_projects))
     
-    # Get teacher's projects
-    projects_query = select(Project.id).where(Project.teacher_id == current_user.id)
-    projects_result = await db.execute(projects_query)
-    project_ids = [p[0] for p in projects_result.all()]
+    # Recent tests
+    recent_tests_query = select(
+        Test.project_id,
+        Project.title,
+        func.max(Test.completed_at).label("date"),
+        func.count(Test.id).label("participants"),
+        func.avg(score_pct).label("avgScore"),
+        func.count().filter(score_pct >= 60).label("passed"),
+    ).join(Project, Test.project_id == Project.id).where(
+        Test.project_id.in_(teacher_projects),
+        Test.status == "completed",
+    ).group_by(Test.project_id, Project.title).order_by(
+        func.max(Test.completed_at).desc()
+    ).limit(5)
     
-    if not project_ids:
+    # Top students
+    top_students_query = select(
+        Test.student_id,
+        User.first_name,
+        User.last_name,
+        func.avg(score_pct).label("avgScore"),
+        func.count(Test.id).label("testsCompleted"),
+    ).join(User, Test.student_id == User.id).where(
+        Test.project_id.in_(teacher_projects),
+        Test.status == "completed",
+        Test.student_id.isnot(None),
+        score_pct.isnot(None),
+    ).group_by(Test.student_id, User.first_name, User.last_name).order_by(
+        func.avg(score_pct).desc()
+    ).limit(5)
+    
+    # Project performance
+    proj_perf_query = select(
+        Project.id,
+        Project.title,
+        func.avg(score_pct).label("avgScore"),
+        func.count(Test.id).label("tests"),
+        func.count(func.distinct(Test.student_id)).label("students"),
+    ).join(Test, Project.id == Test.project_id).where(
+        Project.teacher_id == teacher_id,
+        Test.status == "completed",
+        score_pct.isnot(None),
+    ).group_by(Project.id, Project.title)
+    
+    # The four statements are independent: run them concurrently, on this
+    # session and spare pooled connections, so their round trips overlap
+    overview_rows, recent_rows, top_rows, proj_rows = await run_concurrently(
+        db, overview_query, recent_tests_query, top_students_query, proj_perf_query
+    )
+    overview = overview_rows[0]
+    
+    if not overview.has_projects:
         return {
             "overview": {
                 "totalTests": 0,
@@ -69,87 +167,24 @@ async def get_analytics(
             "projectPerformance": [],
         }
     
-    # Total tests count
-    total_tests_query = select(func.count()).where(
-        Test.project_id.in_(project_ids),
-        Test.status == "completed",
-    )
-    total_result = await db.execute(total_tests_query)
-    total_tests = total_result.scalar() or 0
-    
-    # Tests this period
-    period_tests_query = select(func.count()).where(
-        Test.project_id.in_(project_ids),
-        Test.status == "completed",
-        Test.completed_at >= period_start,
-    )
-    period_result = await db.execute(period_tests_query)
-    tests_this_period = period_result.scalar() or 0
-    
-    # Total unique students
-    students_query = select(func.count(func.distinct(Test.student_id))).where(
-        Test.project_id.in_(project_ids),
-        Test.student_id.isnot(None),
-    )
-    students_result = await db.execute(students_query)
-    total_students = students_result.scalar() or 0
-    
-    # New students this period
-    new_students_query = select(func.count(func.distinct(Test.student_id))).where(
-        Test.project_id.in_(project_ids),
-        Test.student_id.isnot(None),
-        Test.created_at >= period_start,
-    )
-    new_students_result = await db.execute(new_students_query)
-    new_students = new_students_result.scalar() or 0
-    
-    # Average score
-    avg_score_query = select(
-        func.avg(Test.score * 100.0 / Test.max_score)
-    ).where(
-        Test.project_id.in_(project_ids),
-        Test.status == "completed",
-        Test.max_score > 0,
-    )
-    avg_result = await db.execute(avg_score_query)
-    avg_score = avg_result.scalar() or 0
+    total_tests = overview.total_tests or 0
+    tests_this_period = overview.tests_this_period or 0
+    total_students = overview.total_students or 0
+    new_students = overview.new_students or 0
+    avg_score = overview.avg_score or 0
     
     # Previous period avg score for comparison
-    prev_avg_query = select(
-        func.avg(Test.score * 100.0 / Test.max_score)
-    ).where(
-        Test.project_id.in_(project_ids),
-        Test.status == "completed",
-        Test.max_score > 0,
-        Test.completed_at >= prev_period_start,
-        Test.completed_at < period_start,
-    )
-    prev_avg_result = await db.execute(prev_avg_query)
-    prev_avg_score = prev_avg_result.scalar() or avg_score
+    prev_avg_score = overview.prev_avg_score or avg_score
     score_change = round(avg_score - prev_avg_score, 1) if prev_avg_score else 0
     
     # Completion rate (completed / total started)
-    started_query = select(func.count()).where(
-        Test.project_id.in_(project_ids),
-        Test.status.in_(["in-progress", "completed"]),
-    )
-    started_result = await db.execute(started_query)
-    started_count = started_result.scalar() or 1
+    started_count = overview.started or 1
     completion_rate = round((total_tests / started_count) * 100, 1) if started_count > 0 else 0
     
     # Score distribution
     score_dist = []
-    ranges = [(0, 20), (21, 40), (41, 60), (61, 80), (81, 100)]
-    for min_score, max_score in ranges:
-        count_query = select(func.count()).where(
-            Test.project_id.in_(project_ids),
-            Test.status == "completed",
-            Test.max_score > 0,
-            (Test.score * 100.0 / Test.max_score) >= min_score,
-            (Test.score * 100.0 / Test.max_score) <= max_score,
-        )
-        count_result = await db.execute(count_query)
-        count = count_result.scalar() or 0
+    for i, (min_score, max_score) in enumerate(SCORE_BUCKETS):
+        count = getattr(overview, f"bucket_{i}") or 0
         percentage = round((count / total_tests) * 100, 1) if total_tests > 0 else 0
         score_dist.append({
             "range": f"{min_score}-{max_score}",
@@ -158,31 +193,9 @@ async def get_analytics(
         })
     
     # Recent tests
-    recent_tests_query = select(
-        Test.project_id,
-        Project.title,
-        func.max(Test.completed_at).label("date"),
-        func.count(Test.id).label("participants"),
-        func.avg(Test.score * 100.0 / Test.max_score).label("avgScore"),
-    ).join(Project, Test.project_id == Project.id).where(
-        Test.project_id.in_(project_ids),
-        Test.status == "completed",
-    ).group_by(Test.project_id, Project.title).order_by(
-        func.max(Test.completed_at).desc()
-    ).limit(5)
-    
-    recent_result = await db.execute(recent_tests_query)
     recent_tests = []
-    for row in recent_result.all():
-        # Calculate pass rate
-        pass_query = select(func.count()).where(
-            Test.project_id == row.project_id,
-            Test.status == "completed",
-            Test.max_score > 0,
-            (Test.score * 100.0 / Test.max_score) >= 60,
-        )
-        pass_result = await db.execute(pass_query)
-        passed = pass_result.scalar() or 0
+    for row in recent_rows:
+        passed = row.passed or 0
         pass_rate = round((passed / row.participants) * 100, 1) if row.participants > 0 else 0
         
         recent_tests.append({
@@ -195,22 +208,6 @@ async def get_analytics(
         })
     
     # Top students
-    top_students_query = select(
-        Test.student_id,
-        User.first_name,
-        User.last_name,
-        func.avg(Test.score * 100.0 / Test.max_score).label("avgScore"),
-        func.count(Test.id).label("testsCompleted"),
-    ).join(User, Test.student_id == User.id).where(
-        Test.project_id.in_(project_ids),
-        Test.status == "completed",
-        Test.student_id.isnot(None),
-        Test.max_score > 0,
-    ).group_by(Test.student_id, User.first_name, User.last_name).order_by(
-        func.avg(Test.score * 100.0 / Test.max_score).desc()
-    ).limit(5)
-    
-    top_result = await db.execute(top_students_query)
     top_students = [
         {
             "id": str(row.student_id),
@@ -218,23 +215,10 @@ async def get_analytics(
             "avgScore": round(row.avgScore or 0, 1),
             "testsCompleted": row.testsCompleted,
         }
-        for row in top_result.all()
+        for row in top_rows
     ]
     
     # Project performance
-    proj_perf_query = select(
-        Project.id,
-        Project.title,
-        func.avg(Test.score * 100.0 / Test.max_score).label("avgScore"),
-        func.count(Test.id).label("tests"),
-        func.count(func.distinct(Test.student_id)).label("students"),
-    ).join(Test, Project.id == Test.project_id).where(
-        Project.teacher_id == current_user.id,
-        Test.status == "completed",
-        Test.max_score > 0,
-    ).group_by(Project.id, Project.title)
-    
-    proj_result = await db.execute(proj_perf_query)
     project_performance = [
         {
             "name": row.title,
@@ -243,7 +227,7 @@ async def get_analytics(
             "students": row.students,
             "trend": "stable",  # Could be calculated from historical data
         }
-        for row in proj_result.all()
+        for row in proj_rows
     ]
     
     return {
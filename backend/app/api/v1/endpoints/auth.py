@@ -12,7 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
 from app.core.deps import get_db, get_current_user
 from app.core.exceptions import AuthenticationException, ValidationException
-from app.core.security import verify_password, get_password_hash
+from app.core.security import verify_password_async, get_password_hash_async
 from app.models.user import User
 from app.schemas.user import (
     UserCreate,
@@ -26,7 +26,7 @@ from app.schemas.user import (
     EmailVerifyRequest,
 )
 from app.schemas.common import MessageResponse
-from app.services import auth_service
+from app.services import auth_service, cache_service
 
 router = APIRouter()
 
@@ -160,7 +160,7 @@ async def update_profile(
     if user_data.last_name is not None:
         current_user.last_name = user_data.last_name
     await db.commit()
-    await db.refresh(current_user)
+    await cache_service.invalidate_user_active(str(current_user.id))
     return UserResponse.model_validate(current_user)
 
 
@@ -170,12 +170,12 @@ async def change_password(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    if not verify_password(password_data.current_password, current_user.hashed_password):
+    if not await verify_password_async(password_data.current_password, current_user.hashed_password):
         raise ValidationException(
             message="Неверный текущий пароль",
             field="current_password",
         )
-    current_user.hashed_password = get_password_hash(password_data.new_password)
+    current_user.hashed_password = await get_password_hash_async(password_data.new_password)
     await db.commit()
     return MessageResponse(message="Password changed successfully")
 
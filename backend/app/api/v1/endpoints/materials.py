@@ -6,11 +6,14 @@ File upload, folders management, and material CRUD.
 
 import os
 import uuid as uuid_lib
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
+import aiofiles.os
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update, delete, exists, tuple_
+from sqlalchemy.exc import IntegrityError
 
 from app.core.deps import get_db, get_current_teacher
 from app.core.config import settings
@@ -19,6 +22,7 @@ from app.core.exceptions import (
     ValidationException,
     FileProcessingException,
 )
+from app.db.utils import decode_cursor, encode_cursor, escape_like
 from app.models.user import User
 from app.models.material import Material, MaterialFolder
 from app.schemas.material import (
@@ -31,9 +35,24 @@ from app.schemas.material import (
     MaterialFolderResponse,
 )
 from app.schemas.common import MessageResponse
+from app.services import file_storage
+from app.tasks.document_tasks import delete_openai_file
 
 router = APIRouter()
 
+# Columns of MaterialResponse, named like its fields
+MATERIAL_RESPONSE_COLUMNS = (
+    Material.id,
+    Material.folder_id,
+    Material.file_name,
+    Material.original_name,
+    Material.file_type,
+    Material.file_path,
+    Material.file_size,
+    Material.uploaded_at,
+    Material.openai_file_id,
+)
+
 
 # ============== Materials ==============
 
@@ -44,57 +63,81 @@ async def get_materials(
     folder_id: Optional[UUID] = Query(None, alias="folderId"),
     file_type: Optional[str] = Query(None, alias="fileType"),
     search: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="nextCursor of the previous page"),
     current_user: User = Depends(get_current_teacher),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Get all materials for current teacher with pagination.
     Materials are stored independently and linked to projects during project creation.
+    
+    Pass the previous response's nextCursor as cursor to seek straight to
+    the following page (page is then only echoed back); page-number
+    paging with OFFSET still works but slows down on deep pages.
     """
-    query = select(Material).where(Material.teacher_id == current_user.id)
+    conditions = [Material.teacher_id == current_user.id]
     
     # Apply filters
     if folder_id:
-        query = query.where(Material.folder_id == folder_id)
+        conditions.append(Material.folder_id == folder_id)
     if file_type:
-        query = query.where(Material.file_type == file_type)
+        conditions.append(Material.file_type == file_type)
     if search:
-        query = query.where(Material.original_name.ilike(f"%{search}%"))
-    
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-    
-    # Apply pagination
-    query = query.order_by(Material.uploaded_at.desc())
-    query = query.offset((page - 1) * size).limit(size)
+        conditions.append(Material.original_name.ilike(f"%{escape_like(search)}%", escape="\\"))
+    
+    # Apply pagination (only the response columns, as plain rows), newest
+    # first with id as tie-breaker so the order is total
+    offset = (page - 1) * size
+    query = select(*MATERIAL_RESPONSE_COLUMNS).where(*conditions)
+    query = query.order_by(Material.uploaded_at.desc(), Material.id.desc())
+    if cursor:
+        try:
+            uploaded_at, last_id = decode_cursor(cursor)
+            after = (datetime.fromisoformat(uploaded_at), UUID(last_id))
+        except (ValueError, TypeError):
+            raise ValidationException(message="Invalid cursor", field="cursor")
+        query = query.where(tuple_(Material.uploaded_at, Material.id) < after)
+    else:
+        query = query.offset(offset)
+    query = query.limit(size)
     
     result = await db.execute(query)
-    materials = result.scalars().all()
-    
+    materials = result.mappings().all()
+    
+    next_cursor = None
+    if len(materials) == size:
+        last = materials[-1]
+        next_cursor = encode_cursor(last["uploaded_at"], last["id"])
+    
+    # A short page is the last one, so it already gives the total;
+    # count (plain aggregate over the same filters) only otherwise
+    if not cursor and len(materials) < size and (materials or page == 1):
+        total = offset + len(materials)
+    else:
+        total_result = await db.execute(select(func.count()).select_from(Material).where(*conditions))
+        total = total_result.scalar()
+    
+    # Column names match the schema's field names, and the values come
+    # straight from the database, so the items skip validation
     return MaterialListResponse(
-        items=[
-            MaterialResponse(
-                id=m.id,
-                folderId=m.folder_id,
-                fileName=m.file_name,
-                originalName=m.original_name,
-                fileType=m.file_type,
-                filePath=m.file_path,
-                fileSize=m.file_size,
-                uploadedAt=m.uploaded_at,
-                openaiFileId=m.openai_file_id,
-            )
-            for m in materials
-        ],
+        items=[MaterialResponse.model_construct(**m) for m in materials],
         total=total,
         page=page,
         size=size,
         pages=(total + size - 1) // size,
+        nextCursor=next_cursor,
     )
 
 
+async def _find_material_by_hash(db: AsyncSession, teacher_id: UUID, content_hash: str):
+    """Return (id, original_name, file_type, file_size) of the teacher's copy of a file, if any."""
+    result = await db.execute(
+        select(Material.id, Material.original_name, Material.file_type, Material.file_size)
+        .where(Material.teacher_id == teacher_id, Material.content_hash == content_hash)
+    )
+    return result.one_or_none()
+
+
 @router.post("/upload", response_model=MaterialUploadResponse)
 async def upload_material(
     file: UploadFile = File(...),
@@ -112,21 +155,10 @@ async def upload_material(
     Max size: 50MB
     """
     # Validate file extension
-    file_ext = file.filename.split(".")[-1].lower() if file.filename else ""
+    file_ext = file.filename.rpartition(".")[2].lower() if file.filename else ""
     if file_ext not in settings.ALLOWED_EXTENSIONS:
         raise FileProcessingException(
-            message=f"Тип файла не поддерживается. Разрешены: {', '.join(settings.ALLOWED_EXTENSIONS)}",
-            filename=file.filename,
-        )
-    
-    # Read file content
-    content = await file.read()
-    file_size = len(content)
-    
-    # Validate file size
-    if file_size > settings.MAX_UPLOAD_SIZE:
-        raise FileProcessingException(
-            message=f"Файл слишком большой. Максимальный размер: {settings.MAX_UPLOAD_SIZE // (1024 * 1024)}MB",
+            message=f"Тип файла не поддерживается. Разрешены: {', '.join(sorted(settings.ALLOWED_EXTENSIONS))}",
             filename=file.filename,
         )
     
@@ -134,28 +166,62 @@ async def upload_material(
     unique_id = str(uuid_lib.uuid4())
     file_name = f"{unique_id}.{file_ext}"
     
-    # Create upload directory if not exists
-    upload_dir = os.path.join(settings.UPLOAD_DIR, "materials")
-    os.makedirs(upload_dir, exist_ok=True)
+    # Copy to a temporary file (and hash) in a worker thread, enforcing the
+    # size limit as we go; it only gets its final name after the commit
+    tmp_path = file_storage.temp_upload_path(unique_id)
+    saved = await file_storage.save_upload_async(
+        file.file, tmp_path, settings.MAX_UPLOAD_SIZE
+    )
     
-    # Save file
-    file_path = os.path.join(upload_dir, file_name)
-    with open(file_path, "wb") as f:
-        f.write(content)
+    # Validate file size (save_upload has already removed the partial file)
+    if saved.size > settings.MAX_UPLOAD_SIZE:
+        raise FileProcessingException(
+            message=f"Файл слишком большой. Максимальный размер: {settings.MAX_UPLOAD_SIZE // (1024 * 1024)}MB",
+            filename=file.filename,
+        )
     
-    # Create database record (no project link - materials are linked later)
-    material = Material(
-        teacher_id=current_user.id,
-        folder_id=folder_id,
-        file_name=file_name,
-        original_name=file.filename or "unknown",
-        file_type=file_ext,
-        file_path=f"/uploads/materials/{file_name}",
-        file_size=file_size,
-    )
+    try:
+        # A re-upload of a file the teacher already has returns the stored material
+        duplicate = await _find_material_by_hash(db, current_user.id, saved.sha256)
+        if duplicate is None:
+            # Create database record (no project link - materials are linked later)
+            material = Material(
+                teacher_id=current_user.id,
+                folder_id=folder_id,
+                file_name=file_name,
+                original_name=file.filename or "unknown",
+                file_type=file_ext,
+                file_path=f"/uploads/materials/{file_name}",
+                file_size=saved.size,
+                content_hash=saved.sha256,
+            )
+            
+            db.add(material)
+            try:
+                await db.commit()
+            except IntegrityError:
+                # The same file was stored by a concurrent upload
+                await db.rollback()
+                duplicate = await _find_material_by_hash(db, current_user.id, saved.sha256)
+                if duplicate is None:
+                    raise
+            else:
+                await file_storage.publish_async(
+                    tmp_path, os.path.join(file_storage.MATERIALS_DIR, file_name)
+                )
+    finally:
+        # No-op once the file has been published
+        await file_storage.remove_quietly_async(tmp_path)
+    
+    if duplicate is not None:
+        return MaterialUploadResponse(
+            id=duplicate.id,
+            fileName=duplicate.original_name,
+            fileType=duplicate.file_type,
+            fileSize=duplicate.file_size,
+            message="File already uploaded",
+        )
     
-    db.add(material)
-    await db.commit()
     await db.refresh(material)
     
     return MaterialUploadResponse(
@@ -175,10 +241,8 @@ async def delete_material(
 ):
     """
     Delete material by ID.
-    Also deletes file from OpenAI if uploaded there.
+    Also deletes file from OpenAI if uploaded there (in the background).
     """
-    from app.services.openai_vectorstore import get_vectorstore_service
-    
     query = select(Material).where(
         Material.id == material_id,
         Material.teacher_id == current_user.id,
@@ -190,22 +254,24 @@ async def delete_material(
     if not material:
         raise NotFoundException(resource="Material", resource_id=str(material_id))
     
-    # Delete file from OpenAI if exists
-    if material.openai_file_id:
-        try:
-            vs_service = get_vectorstore_service()
-            vs_service.delete_file(material.openai_file_id)
-        except Exception as e:
-            print(f"Warning: Failed to delete file from OpenAI: {e}")
-    
     # Delete file from disk (if exists)
-    file_path = os.path.join(settings.UPLOAD_DIR, "materials", material.file_name)
-    if os.path.exists(file_path):
-        os.remove(file_path)
+    file_path = os.path.join(file_storage.MATERIALS_DIR, material.file_name)
+    try:
+        await aiofiles.os.remove(file_path)
+    except FileNotFoundError:
+        pass
     
     await db.delete(material)
     await db.commit()
     
+    # Delete file from OpenAI if exists; the worker makes the API call so
+    # the response does not wait for it
+    if material.openai_file_id:
+        try:
+            delete_openai_file.delay(material.openai_file_id)
+        except Exception as e:
+            print(f"Warning: Failed to schedule OpenAI file deletion: {e}")
+    
     return MessageResponse(message="Material deleted successfully")
 
 
@@ -231,9 +297,9 @@ async def download_material(
     if not material:
         raise NotFoundException(resource="Material", resource_id=str(material_id))
     
-    file_path = os.path.join(settings.UPLOAD_DIR, "materials", material.file_name)
+    file_path = os.path.join(file_storage.MATERIALS_DIR, material.file_name)
     
-    if not os.path.exists(file_path):
+    if not await aiofiles.os.path.exists(file_path):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found on disk",
@@ -257,7 +323,7 @@ async def preview_material(
     Accepts token as query parameter for direct browser access.
     """
     from fastapi.responses import FileResponse
-    from app.core.security import verify_token
+    from app.core.security import verify_token_async
     
     # Verify token
     if not token:
@@ -267,7 +333,7 @@ async def preview_material(
         )
     
     try:
-        payload = verify_token(token)
+        payload = await verify_token_async(token)
         user_id = payload.sub if payload else None
         if not user_id:
             raise HTTPException(
@@ -291,9 +357,9 @@ async def preview_material(
     if not material:
         raise NotFoundException(resource="Material", resource_id=str(material_id))
     
-    file_path = os.path.join(settings.UPLOAD_DIR, "materials", material.file_name)
+    file_path = os.path.join(file_storage.MATERIALS_DIR, material.file_name)
     
-    if not os.path.exists(file_path):
+    if not await aiofiles.os.path.exists(file_path):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found on disk",
@@ -333,46 +399,44 @@ async def update_material(
     """
     Update material (e.g., move to folder).
     """
-    query = select(Material).where(
-        Material.id == material_id,
-        Material.teacher_id == current_user.id,
-    )
-    
-    result = await db.execute(query)
-    material = result.scalar_one_or_none()
-    
+    owned = (Material.id == material_id, Material.teacher_id == current_user.id)
+    updates = material_data.model_dump(exclude_unset=True)
+    
+    if "folder_id" in updates:
+        # Move (folder_id None = root) in one UPDATE ... RETURNING. The
+        # folder's ownership is checked in the same statement, and a
+        # material already in that folder is not rewritten.
+        new_folder_id = updates["folder_id"]
+        conditions = [*owned, Material.folder_id.is_distinct_from(new_folder_id)]
+        if new_folder_id is not None:
+            conditions.append(
+                exists().where(
+                    MaterialFolder.id == new_folder_id,
+                    MaterialFolder.teacher_id == current_user.id,
+                )
+            )
+        result = await db.execute(
+            update(Material)
+            .where(*conditions)
+            .values(folder_id=new_folder_id)
+            .returning(*MATERIAL_RESPONSE_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        material = result.mappings().one_or_none()
+        if material:
+            await db.commit()
+            return MaterialResponse.model_construct(**material)
+    
+    # Nothing to change, or nothing was updated: read the material to return
+    # it as is or to tell which of material and folder is missing
+    result = await db.execute(select(*MATERIAL_RESPONSE_COLUMNS).where(*owned))
+    material = result.mappings().one_or_none()
     if not material:
         raise NotFoundException(resource="Material", resource_id=str(material_id))
+    if "folder_id" in updates and material["folder_id"] != updates["folder_id"]:
+        raise NotFoundException(resource="Folder", resource_id=str(updates["folder_id"]))
     
-    # Update folder_id (can be None to move to root)
-    if material_data.folder_id is not None or 'folder_id' in material_data.model_dump(exclude_unset=True):
-        # Verify folder exists and belongs to teacher (if not None)
-        if material_data.folder_id:
-            folder_query = select(MaterialFolder).where(
-                MaterialFolder.id == material_data.folder_id,
-                MaterialFolder.teacher_id == current_user.id,
-            )
-            folder_result = await db.execute(folder_query)
-            folder = folder_result.scalar_one_or_none()
-            if not folder:
-                raise NotFoundException(resource="Folder", resource_id=str(material_data.folder_id))
-        
-        material.folder_id = material_data.folder_id
-    
-    await db.commit()
-    await db.refresh(material)
-    
-    return MaterialResponse(
-        id=material.id,
-        folderId=material.folder_id,
-        fileName=material.file_name,
-        originalName=material.original_name,
-        fileType=material.file_type,
-        filePath=material.file_path,
-        fileSize=material.file_size,
-        uploadedAt=material.uploaded_at,
-        openaiFileId=material.openai_file_id,
-    )
+    return MaterialResponse.model_construct(**material)
 
 
 # ============== Folders ==============
@@ -385,31 +449,33 @@ async def get_folders(
     """
     Get all folders for current teacher.
     """
-    query = select(MaterialFolder).where(MaterialFolder.teacher_id == current_user.id)
-    query = query.order_by(MaterialFolder.name)
+    # Material counts per folder in the same round-trip
+    counts = (
+        select(Material.folder_id, func.count().label("materials_count"))
+        .where(Material.teacher_id == current_user.id, Material.folder_id.isnot(None))
+        .group_by(Material.folder_id)
+        .subquery()
+    )
+    query = (
+        select(MaterialFolder, func.coalesce(counts.c.materials_count, 0))
+        .outerjoin(counts, counts.c.folder_id == MaterialFolder.id)
+        .where(MaterialFolder.teacher_id == current_user.id)
+        .order_by(MaterialFolder.name)
+    )
     
     result = await db.execute(query)
-    folders = result.scalars().all()
-    
-    response = []
-    for folder in folders:
-        # Count materials in folder
-        count_query = select(func.count()).where(Material.folder_id == folder.id)
-        count_result = await db.execute(count_query)
-        materials_count = count_result.scalar() or 0
-        
-        response.append(
-            MaterialFolderResponse(
-                id=folder.id,
-                teacherId=folder.teacher_id,
-                name=folder.name,
-                description=folder.description,
-                materialsCount=materials_count,
-                createdAt=folder.created_at,
-            )
-        )
     
-    return response
+    return [
+        MaterialFolderResponse(
+            id=folder.id,
+            teacherId=folder.teacher_id,
+            name=folder.name,
+            description=folder.description,
+            materialsCount=materials_count,
+            createdAt=folder.created_at,
+        )
+        for folder, materials_count in result.all()
+    ]
 
 
 @router.post("/folders", response_model=MaterialFolderResponse, status_code=status.HTTP_201_CREATED)
@@ -451,36 +517,48 @@ async def update_folder(
     """
     Update folder by ID.
     """
-    query = select(MaterialFolder).where(
-        MaterialFolder.id == folder_id,
-        MaterialFolder.teacher_id == current_user.id,
+    materials_count = (
+        select(func.count())
+        .where(Material.folder_id == MaterialFolder.id)
+        .scalar_subquery()
+        .label("materials_count")
     )
+    columns = (
+        MaterialFolder.id,
+        MaterialFolder.teacher_id,
+        MaterialFolder.name,
+        MaterialFolder.description,
+        MaterialFolder.created_at,
+        materials_count,
+    )
+    owned = (MaterialFolder.id == folder_id, MaterialFolder.teacher_id == current_user.id)
+    
+    # Apply the changes and read the folder back with its material count
+    # in a single UPDATE ... RETURNING (a plain SELECT if nothing changes)
+    values = folder_data.model_dump(exclude_none=True)
+    if values:
+        stmt = (
+            update(MaterialFolder)
+            .where(*owned)
+            .values(**values)
+            .returning(*columns)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        stmt = select(*columns).where(*owned)
     
-    result = await db.execute(query)
-    folder = result.scalar_one_or_none()
-    
+    folder = (await db.execute(stmt)).one_or_none()
     if not folder:
         raise NotFoundException(resource="Folder", resource_id=str(folder_id))
     
-    if folder_data.name is not None:
-        folder.name = folder_data.name
-    if folder_data.description is not None:
-        folder.description = folder_data.description
-    
     await db.commit()
-    await db.refresh(folder)
-    
-    # Count materials
-    count_query = select(func.count()).where(Material.folder_id == folder.id)
-    count_result = await db.execute(count_query)
-    materials_count = count_result.scalar() or 0
     
     return MaterialFolderResponse(
         id=folder.id,
         teacherId=folder.teacher_id,
         name=folder.name,
         description=folder.description,
-        materialsCount=materials_count,
+        materialsCount=folder.materials_count,
         createdAt=folder.created_at,
     )
 
@@ -495,24 +573,24 @@ async def delete_folder(
     Delete folder by ID.
     Materials in the folder are not deleted, just unlinked.
     """
-    query = select(MaterialFolder).where(
-        MaterialFolder.id == folder_id,
-        MaterialFolder.teacher_id == current_user.id,
+    # Unlink the teacher's materials in one UPDATE, then delete the folder;
+    # deleting nothing means the folder is missing or not ours
+    await db.execute(
+        update(Material)
+        .where(Material.folder_id == folder_id, Material.teacher_id == current_user.id)
+        .values(folder_id=None)
+        .execution_options(synchronize_session=False)
     )
-    
-    result = await db.execute(query)
-    folder = result.scalar_one_or_none()
-    
-    if not folder:
+    result = await db.execute(
+        delete(MaterialFolder).where(
+            MaterialFolder.id == folder_id,
+            MaterialFolder.teacher_id == current_user.id,
+        )
+    )
+    if result.rowcount == 0:
+        await db.rollback()
         raise NotFoundException(resource="Folder", resource_id=str(folder_id))
     
-    # Unlink materials from folder
-    materials_query = select(Material).where(Material.folder_id == folder_id)
-    materials_result = await db.execute(materials_query)
-    for material in materials_result.scalars():
-        material.folder_id = None
-    
-    await db.delete(folder)
     await db.commit()
     
     return MessageResponse(message="Folder deleted successfully")
@@ -8,9 +8,10 @@ from typing import Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func, or_, literal, null, union_all, update, delete, tuple_
 
 from app.core.deps import get_db, get_current_teacher
+from app.db.utils import decode_cursor, encode_cursor, escape_like
 from app.models.user import User
 from app.models.participant import Participant, ParticipantGroup
 from app.schemas.participant import (
@@ -91,36 +92,64 @@ async def get_participants(
     size: int = Query(20, ge=1, le=100),
     group_id: Optional[UUID] = Query(None, alias="groupId"),
     search: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="nextCursor of the previous page"),
     current_user: User = Depends(get_current_teacher),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Get all participants for current teacher with pagination.
+    
+    Pass the previous response's nextCursor as cursor to seek straight to
+    the following page instead of skipping rows with OFFSET.
     """
-    query = select(Participant).where(Participant.teacher_id == current_user.id)
+    conditions = [Participant.teacher_id == current_user.id]
     
     # Apply filters
     if group_id:
-        query = query.where(Participant.group_id == group_id)
+        conditions.append(Participant.group_id == group_id)
     if search:
-        query = query.where(
-            (Participant.email.ilike(f"%{search}%")) |
-            (Participant.first_name.ilike(f"%{search}%")) |
-            (Participant.last_name.ilike(f"%{search}%"))
+        pattern = f"%{escape_like(search)}%"
+        conditions.append(
+            (Participant.email.ilike(pattern, escape="\\")) |
+            (Participant.first_name.ilike(pattern, escape="\\")) |
+            (Participant.last_name.ilike(pattern, escape="\\"))
         )
     
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-    
-    # Apply pagination
-    query = query.order_by(Participant.last_name, Participant.first_name)
-    query = query.offset((page - 1) * size).limit(size)
+    # Apply pagination, by name with id as tie-breaker so the order is total
+    offset = (page - 1) * size
+    sort_key = (Participant.last_name, Participant.first_name, Participant.id)
+    query = select(Participant).where(*conditions)
+    query = query.order_by(*sort_key)
+    if cursor:
+        try:
+            last_name, first_name, last_id = decode_cursor(cursor)
+            after = (str(last_name), str(first_name), UUID(last_id))
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        query = query.where(tuple_(*sort_key) > after)
+    else:
+        query = query.offset(offset)
+    query = query.limit(size)
     
     result = await db.execute(query)
     participants = result.scalars().all()
     
+    next_cursor = None
+    if len(participants) == size:
+        last = participants[-1]
+        next_cursor = encode_cursor(last.last_name, last.first_name, last.id)
+    
+    # A short page is the last one, so it already gives the total;
+    # count (plain aggregate over the same filters) only otherwise
+    if not cursor and len(participants) < size and (participants or page == 1):
+        total = offset + len(participants)
+    else:
+        total_result = await db.execute(select(func.count()).select_from(Participant).where(*conditions))
+        total = total_result.scalar()
+    
     return ParticipantListResponse(
         items=[
             ParticipantResponse(
@@ -140,6 +169,7 @@ async def get_participants(
         page=page,
         size=size,
         pages=(total + size - 1) // size,
+        nextCursor=next_cursor,
     )
 
 
@@ -153,54 +183,60 @@ async def create_participant(
     Create a new participant.
     If auto_fill is True, will lookup student info from database.
     """
-    # Check if email already exists for this teacher
-    existing = await db.execute(
-        select(Participant).where(
+    from app.models.student_email import StudentEmail
+    
+    first_name = participant_data.first_name
+    last_name = participant_data.last_name
+    student_user_id = None
+    normalized_email = participant_data.email
+    
+    # One round-trip for the duplicate check and the student lookup.
+    # Rows are tagged by source: an existing participant of this teacher,
+    # a student with this primary email, or one with it as a secondary email.
+    lookup = union_all(
+        select(
+            literal("participant").label("source"),
+            Participant.id,
+            null().label("first_name"),
+            null().label("last_name"),
+        ).where(
             Participant.teacher_id == current_user.id,
-            Participant.email == participant_data.email.lower(),
+            Participant.email == normalized_email,
+        ),
+        select(
+            literal("primary").label("source"),
+            User.id,
+            User.first_name,
+            User.last_name,
+        ).where(
+            User.email == normalized_email,
+            User.role == "student",
+        ),
+        select(
+            literal("secondary").label("source"),
+            User.id,
+            User.first_name,
+            User.last_name,
         )
+        .join(StudentEmail, StudentEmail.user_id == User.id)
+        .where(
+            StudentEmail.email == normalized_email,
+            User.role == "student",
+        ),
     )
-    if existing.scalar_one_or_none():
+    rows = {row.source: row for row in (await db.execute(lookup)).all()}
+    
+    if "participant" in rows:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Participant with this email already exists",
         )
     
-    first_name = participant_data.first_name
-    last_name = participant_data.last_name
-    student_user_id = None
-    normalized_email = participant_data.email.lower().strip()
-    
-    # Helper function to find student by primary or secondary email
-    async def find_student_by_email(email: str) -> User | None:
-        # First, try primary email
-        result = await db.execute(
-            select(User).where(
-                User.email == email,
-                User.role == "student",
-            )
-        )
-        user = result.scalar_one_or_none()
-        
-        # If not found, search in student_emails (secondary emails)
-        if not user:
-            from app.models.student_email import StudentEmail
-            result = await db.execute(
-                select(User)
-                .join(StudentEmail, StudentEmail.user_id == User.id)
-                .where(
-                    StudentEmail.email == email,
-                    User.role == "student",
-                )
-            )
-            user = result.scalar_one_or_none()
-        
-        return user
+    # Primary email wins over a secondary one
+    student_user = rows.get("primary") or rows.get("secondary")
     
     # Auto-fill from database if requested
     if participant_data.auto_fill:
-        student_user = await find_student_by_email(normalized_email)
-        
         if student_user:
             first_name = student_user.first_name
             last_name = student_user.last_name
@@ -210,11 +246,9 @@ async def create_participant(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Student with this email not found in database",
             )
-    else:
-        # Try to find student user anyway (for linking)
-        student_user = await find_student_by_email(normalized_email)
-        if student_user:
-            student_user_id = student_user.id
+    elif student_user:
+        # Link the participant to the student account anyway
+        student_user_id = student_user.id
     
     participant = Participant(
         teacher_id=current_user.id,
@@ -332,31 +366,33 @@ async def get_groups(
     """
     Get all groups for current teacher.
     """
-    query = select(ParticipantGroup).where(ParticipantGroup.teacher_id == current_user.id)
-    query = query.order_by(ParticipantGroup.name)
+    # Member counts per group in the same round-trip
+    counts = (
+        select(Participant.group_id, func.count().label("members_count"))
+        .where(Participant.teacher_id == current_user.id, Participant.group_id.isnot(None))
+        .group_by(Participant.group_id)
+        .subquery()
+    )
+    query = (
+        select(ParticipantGroup, func.coalesce(counts.c.members_count, 0))
+        .outerjoin(counts, counts.c.group_id == ParticipantGroup.id)
+        .where(ParticipantGroup.teacher_id == current_user.id)
+        .order_by(ParticipantGroup.name)
+    )
     
     result = await db.execute(query)
-    groups = result.scalars().all()
-    
-    response = []
-    for group in groups:
-        # Count members
-        count_query = select(func.count()).where(Participant.group_id == group.id)
-        count_result = await db.execute(count_query)
-        members_count = count_result.scalar() or 0
-        
-        response.append(
-            ParticipantGroupResponse(
-                id=group.id,
-                teacherId=group.teacher_id,
-                name=group.name,
-                description=group.description,
-                membersCount=members_count,
-                createdAt=group.created_at,
-            )
-        )
     
-    return response
+    return [
+        ParticipantGroupResponse(
+            id=group.id,
+            teacherId=group.teacher_id,
+            name=group.name,
+            description=group.description,
+            membersCount=members_count,
+            createdAt=group.created_at,
+        )
+        for group, members_count in result.all()
+    ]
 
 
 @router.post("/groups", response_model=ParticipantGroupResponse, status_code=status.HTTP_201_CREATED)
@@ -398,39 +434,51 @@ async def update_group(
     """
     Update group by ID.
     """
-    query = select(ParticipantGroup).where(
-        ParticipantGroup.id == group_id,
-        ParticipantGroup.teacher_id == current_user.id,
+    members_count = (
+        select(func.count())
+        .where(Participant.group_id == ParticipantGroup.id)
+        .scalar_subquery()
+        .label("members_count")
     )
+    columns = (
+        ParticipantGroup.id,
+        ParticipantGroup.teacher_id,
+        ParticipantGroup.name,
+        ParticipantGroup.description,
+        ParticipantGroup.created_at,
+        members_count,
+    )
+    owned = (ParticipantGroup.id == group_id, ParticipantGroup.teacher_id == current_user.id)
+    
+    # Apply the changes and read the group back with its member count
+    # in a single UPDATE ... RETURNING (a plain SELECT if nothing changes)
+    values = group_data.model_dump(exclude_none=True)
+    if values:
+        stmt = (
+            update(ParticipantGroup)
+            .where(*owned)
+            .values(**values)
+            .returning(*columns)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        stmt = select(*columns).where(*owned)
     
-    result = await db.execute(query)
-    group = result.scalar_one_or_none()
-    
+    group = (await db.execute(stmt)).one_or_none()
     if not group:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Group not found",
         )
     
-    if group_data.name is not None:
-        group.name = group_data.name
-    if group_data.description is not None:
-        group.description = group_data.description
-    
     await db.commit()
-    await db.refresh(group)
-    
-    # Count members
-    count_query = select(func.count()).where(Participant.group_id == group.id)
-    count_result = await db.execute(count_query)
-    members_count = count_result.scalar() or 0
     
     return ParticipantGroupResponse(
         id=group.id,
         teacherId=group.teacher_id,
         name=group.name,
         description=group.description,
-        membersCount=members_count,
+        membersCount=group.members_count,
         createdAt=group.created_at,
     )
 
@@ -445,28 +493,27 @@ async def delete_group(
     Delete group by ID.
     Members are not deleted, just unlinked from the group.
     """
-    query = select(ParticipantGroup).where(
-        ParticipantGroup.id == group_id,
-        ParticipantGroup.teacher_id == current_user.id,
+    # Unlink the teacher's participants in one UPDATE, then delete the group;
+    # deleting nothing means the group is missing or not ours
+    await db.execute(
+        update(Participant)
+        .where(Participant.group_id == group_id, Participant.teacher_id == current_user.id)
+        .values(group_id=None, participant_type="individual")
+        .execution_options(synchronize_session=False)
     )
-    
-    result = await db.execute(query)
-    group = result.scalar_one_or_none()
-    
-    if not group:
+    result = await db.execute(
+        delete(ParticipantGroup).where(
+            ParticipantGroup.id == group_id,
+            ParticipantGroup.teacher_id == current_user.id,
+        )
+    )
+    if result.rowcount == 0:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Group not found",
         )
     
-    # Unlink participants from group
-    participants_query = select(Participant).where(Participant.group_id == group_id)
-    participants_result = await db.execute(participants_query)
-    for participant in participants_result.scalars():
-        participant.group_id = None
-        participant.participant_type = "individual"
-    
-    await db.delete(group)
     await db.commit()
     
     return MessageResponse(message="Group deleted successfully")
@@ -8,25 +8,45 @@ CRUD operations for projects with multi-step creation flow:
 4. Configure settings (question types, time limits)
 """
 
-from typing import Optional, List, TYPE_CHECKING
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Optional, List, Tuple, TYPE_CHECKING
 from uuid import UUID
+import orjson
+from celery.result import AsyncResult
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, update
-from sqlalchemy.orm import selectinload
-
-from app.core.deps import get_db, get_current_teacher, get_current_user
+from sqlalchemy import String, delete, insert, literal, select, func, tuple_, type_coerce, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, load_only, raiseload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.deps import (
+    get_db,
+    get_db_ro,
+    get_current_teacher,
+    get_current_teacher_project,
+    get_current_user,
+    get_owned_project_id,
+    forget_project_owner,
+    owned_project,
+    owns_project,
+)
 from app.core.exceptions import (
     NotFoundException,
     AuthorizationException,
     ValidationException,
 )
+from app.db.utils import decode_cursor, encode_cursor, escape_like, in_values
 from app.models.user import User
 from app.models.project import Project, QuestionTypeConfig
 
 if TYPE_CHECKING:
     from app.models.participant import Participant
 from app.models.material import Material, project_materials
+from app.models.test import Answer, Question, Test
 from app.schemas.project import (
     ProjectCreate,
     ProjectUpdate,
@@ -35,128 +55,341 @@ from app.schemas.project import (
     ProjectStatusUpdate,
     ProjectSettingsBase,
     ProjectAddMaterials,
+    ProjectAddStudent,
     ProjectConfigureSettings,
+    QuestionTypeConfigBase,
     VectorizationStatus,
     MaterialInProject,
     ProjectStudent,
 )
 from app.schemas.common import MessageResponse
-from app.tasks.document_tasks import vectorize_project_materials
+from app.services import cache_service
+from app.celery_app import celery_app
+from app.tasks.document_tasks import cleanup_project_openai_resources, vectorize_project_materials
 
 router = APIRouter()
 
 
 def project_to_response(project: Project) -> ProjectResponse:
-    """Convert Project model to response schema"""
+    """
+    Convert Project model to response schema.
+    
+    The values come straight from the database, so the schemas are built
+    with model_construct (no validation).
+    """
     # Build settings from project and question_type_configs
     question_types = [
-        {"type": qtc.question_type, "count": qtc.count, "timePerQuestion": qtc.time_per_question}
+        QuestionTypeConfigBase.model_construct(
+            type=qtc.question_type,
+            count=qtc.count,
+            time_per_question=qtc.time_per_question,
+        )
         for qtc in project.question_type_configs
     ] if project.question_type_configs else []
     
     settings = None
     if question_types or project.total_time or project.time_per_question:
-        settings = ProjectSettingsBase(
-            timerMode=project.timer_mode or "total",
-            totalTime=project.total_time,
-            timePerQuestion=project.time_per_question,
-            questionTypes=question_types,
-            maxStudents=project.max_students,
-            numVariants=project.num_variants or 1,
-            testLanguage=project.test_language or "en",
+        settings = ProjectSettingsBase.model_construct(
+            timer_mode=project.timer_mode or "total",
+            total_time=project.total_time,
+            time_per_question=project.time_per_question,
+            question_types=question_types,
+            max_students=project.max_students,
+            num_variants=project.num_variants or 1,
+            test_language=project.test_language or "en",
         )
     
     # Convert materials
-    materials_list = []
-    if project.materials:
-        for m in project.materials:
-            materials_list.append(MaterialInProject(
-                id=m.id,
-                fileName=m.file_name,
-                originalName=m.original_name,
-                fileType=m.file_type,
-                fileSize=m.file_size,
-            ))
-    
-    return ProjectResponse(
+    materials_list = [
+        MaterialInProject.model_construct(
+            id=m.id,
+            file_name=m.file_name,
+            original_name=m.original_name,
+            file_type=m.file_type,
+            file_size=m.file_size,
+        )
+        for m in project.materials
+    ] if project.materials else []
+    
+    return ProjectResponse.model_construct(
         id=project.id,
-        teacherId=project.teacher_id,
+        teacher_id=project.teacher_id,
         title=project.title,
         description=project.description,
-        groupName=project.group_name,
+        group_name=project.group_name,
         status=project.status,
-        createdAt=project.created_at,
+        created_at=project.created_at,
         settings=settings,
-        startTime=project.start_time,
-        endTime=project.end_time,
-        allowedStudents=project.allowed_students,
-        vectorizationStatus=project.vectorization_status,
-        vectorizationProgress=project.vectorization_progress,
-        openaiVectorStoreId=project.openai_vector_store_id,
+        start_time=project.start_time,
+        end_time=project.end_time,
+        allowed_students=project.allowed_students,
+        vectorization_status=project.vectorization_status,
+        vectorization_progress=project.vectorization_progress,
+        openai_vector_store_id=project.openai_vector_store_id,
         materials=materials_list,
     )
 
 
+# Loader options for queries whose result goes through project_to_response:
+# both collections it reads are eager-loaded, and any other lazy load
+# raises instead of silently issuing a query per project
+PROJECT_RESPONSE_OPTIONS = (
+    selectinload(Project.question_type_configs),
+    selectinload(Project.materials),
+    raiseload("*"),
+)
+
+# Project.materials and Project.question_type_configs default to
+# lazy="selectin", which costs two extra queries on every project load.
+# Ownership checks and other point reads that use neither collection
+# skip them with these options.
+PROJECT_ROW_OPTIONS = (
+    raiseload(Project.question_type_configs),
+    raiseload(Project.materials),
+)
+
+# Ownership-checked project loader shared by several endpoints
+get_owned_project_for_response = owned_project(*PROJECT_RESPONSE_OPTIONS)
+
+
+async def _replace_question_type_configs(
+    db: AsyncSession, project: Project, question_types: List[QuestionTypeConfigBase]
+) -> None:
+    """
+    Replace the project's question type configs: one DELETE and one
+    multi-row INSERT ... RETURNING, whose rows become the project's
+    loaded collection.
+    """
+    await db.execute(
+        delete(QuestionTypeConfig).where(QuestionTypeConfig.project_id == project.id)
+    )
+    configs = []
+    if question_types:
+        result = await db.scalars(
+            insert(QuestionTypeConfig).returning(QuestionTypeConfig),
+            [
+                {
+                    "project_id": project.id,
+                    "question_type": qt_config.type,
+                    "count": qt_config.count,
+                    "time_per_question": qt_config.time_per_question,
+                }
+                for qt_config in question_types
+            ],
+        )
+        configs = list(result)
+    set_committed_value(project, "question_type_configs", configs)
+
+
+def _add_allowed_student_stmt(project_id: UUID, teacher_id: UUID, email: str):
+    """PostgreSQL UPDATE appending email to allowed_students unless listed."""
+    allowed_students = func.coalesce(
+        type_coerce(Project.allowed_students, JSONB), literal([], JSONB)
+    )
+    added = literal([email], JSONB)
+    return (
+        update(Project)
+        .where(
+            Project.id == project_id,
+            Project.teacher_id == teacher_id,
+            ~allowed_students.contains(added),
+        )
+        .values(allowed_students=allowed_students.op("||", return_type=JSONB)(added))
+        .returning(Project.allowed_students)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _remove_allowed_student_stmt(project_id: UUID, teacher_id: UUID, email: str):
+    """PostgreSQL UPDATE removing email from allowed_students if listed."""
+    allowed_students = type_coerce(Project.allowed_students, JSONB)
+    return (
+        update(Project)
+        .where(
+            Project.id == project_id,
+            Project.teacher_id == teacher_id,
+            allowed_students.contains(literal([email], JSONB)),
+        )
+        .values(
+            allowed_students=allowed_students.op("-", return_type=JSONB)(
+                literal(email, String)
+            )
+        )
+        .returning(Project.allowed_students)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _add_allowed_student(
+    db: AsyncSession, project_id: UUID, teacher_id: UUID, email: str
+) -> Optional[List[str]]:
+    """
+    Append email to the allowed students of the teacher's project unless
+    it is already listed. Returns the resulting list, or None when the
+    project is missing or owned by another teacher.
+    
+    On PostgreSQL this is one atomic UPDATE ... RETURNING on the jsonb
+    column; only when it matches nothing (email already listed, or no
+    such project) is the list read back. SQLite (tests) has no jsonb
+    operators and appends in Python.
+    """
+    owned = (Project.id == project_id, Project.teacher_id == teacher_id)
+    
+    if db.bind.dialect.name == "sqlite":
+        result = await db.execute(select(Project).where(*owned).options(*PROJECT_ROW_OPTIONS))
+        project = result.scalar_one_or_none()
+        if project is None:
+            return None
+        allowed_students = project.allowed_students or []
+        if email not in allowed_students:
+            project.allowed_students = allowed_students + [email]
+        return project.allowed_students
+    
+    result = await db.execute(_add_allowed_student_stmt(project_id, teacher_id, email))
+    row = result.first()
+    if row is None:
+        result = await db.execute(select(Project.allowed_students).where(*owned))
+        row = result.first()
+        if row is None:
+            return None
+    return row.allowed_students
+
+
+async def _remove_allowed_student(
+    db: AsyncSession, project_id: UUID, teacher_id: UUID, email: str
+) -> Optional[List[str]]:
+    """
+    Remove email from the allowed students of the teacher's project.
+    Returns the resulting list, or None when nothing was removed (email
+    not listed, or project missing or owned by another teacher).
+    
+    On PostgreSQL this is one UPDATE ... RETURNING using the jsonb "-"
+    operator; SQLite (tests) removes it in Python.
+    """
+    owned = (Project.id == project_id, Project.teacher_id == teacher_id)
+    
+    if db.bind.dialect.name == "sqlite":
+        result = await db.execute(select(Project).where(*owned).options(*PROJECT_ROW_OPTIONS))
+        project = result.scalar_one_or_none()
+        if project is None or email not in (project.allowed_students or []):
+            return None
+        project.allowed_students = [e for e in project.allowed_students if e != email]
+        return project.allowed_students
+    
+    result = await db.execute(_remove_allowed_student_stmt(project_id, teacher_id, email))
+    return result.scalar_one_or_none()
+
+
 @router.get("", response_model=ProjectListResponse)
 async def get_projects(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
-    status: Optional[str] = None,
+    status: Optional[str] = Query(
+        None, pattern="^(draft|vectorizing|ready|generating|active|completed|error)$"
+    ),
     search: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="nextCursor of the previous page"),
+    with_total: bool = Query(True, alias="withTotal"),
     current_user: User = Depends(get_current_teacher),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_ro),
 ):
     """
     Get all projects for current teacher with pagination.
+    
+    Pass the previous response's nextCursor as cursor to seek straight to
+    the following page (page is then only echoed back); page-number
+    paging with OFFSET still works but slows down on deep pages.
+    Infinite-scroll callers can pass withTotal=false to skip the count.
     """
-    # Base query
-    query = select(Project).where(Project.teacher_id == current_user.id)
+    conditions = [Project.teacher_id == current_user.id]
     
     # Apply filters
     if status:
-        query = query.where(Project.status == status)
+        conditions.append(Project.status == status)
     if search:
-        query = query.where(Project.title.ilike(f"%{search}%"))
-    
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-    
-    # Apply pagination
+        conditions.append(Project.title.ilike(f"%{escape_like(search)}%", escape="\\"))
+    
+    # Apply pagination, newest first with id as tie-breaker so the order is
+    # total. Deferred join: the page is picked by id alone (index-only on
+    # ix_projects_teacher_created), so skipped rows never touch the heap;
+    # only the page's rows are then fetched in full.
+    order = (Project.created_at.desc(), Project.id.desc())
+    offset = (page - 1) * size
+    page_ids = select(Project.id).where(*conditions).order_by(*order)
+    # In page-number mode the total comes with the page: COUNT(*) OVER ()
+    # is evaluated over all filtered rows before OFFSET/LIMIT
+    count_in_page = not cursor and with_total
+    if count_in_page:
+        page_ids = page_ids.add_columns(func.count().over().label("total"))
+    if cursor:
+        try:
+            created_at, last_id = decode_cursor(cursor)
+            after = (datetime.fromisoformat(created_at), UUID(last_id))
+        except (ValueError, TypeError):
+            raise ValidationException(message="Invalid cursor", field="cursor")
+        page_ids = page_ids.where(tuple_(Project.created_at, Project.id) < after)
+    else:
+        page_ids = page_ids.offset(offset)
+    page_ids = page_ids.limit(size).subquery()
+    
+    # Both collections come back joined in the same query (one round trip
+    # instead of three); the row fan-out stays small at list page sizes
+    query = select(Project).join(page_ids, Project.id == page_ids.c.id)
+    if count_in_page:
+        query = query.add_columns(page_ids.c.total)
     query = query.options(
-        selectinload(Project.question_type_configs),
-        selectinload(Project.materials),
+        joinedload(Project.question_type_configs),
+        joinedload(Project.materials),
+        raiseload("*"),
     )
-    query = query.order_by(Project.created_at.desc())
-    query = query.offset((page - 1) * size).limit(size)
+    query = query.order_by(*order)
     
     result = await db.execute(query)
-    projects = result.scalars().all()
-    
-    return ProjectListResponse(
+    rows = result.unique().all()
+    projects = [row[0] for row in rows]
+    
+    next_cursor = None
+    if len(projects) == size:
+        next_cursor = encode_cursor(projects[-1].created_at, projects[-1].id)
+    
+    # A short page is the last one, so it also gives the total; count
+    # (plain aggregate over the same filters) only for cursor pages or
+    # an empty page past the end
+    total = pages = None
+    if count_in_page and rows:
+        total = rows[0].total
+    elif not cursor and len(projects) < size and (projects or page == 1):
+        total = offset + len(projects)
+    elif with_total:
+        total_result = await db.execute(select(func.count()).select_from(Project).where(*conditions))
+        total = total_result.scalar()
+    if total is not None:
+        pages = (total + size - 1) // size
+    
+    # Hot path: dump the constructed models and hand the dict straight to
+    # orjson, skipping FastAPI's re-validation against response_model
+    response = ProjectListResponse.model_construct(
         items=[project_to_response(p) for p in projects],
         total=total,
         page=page,
         size=size,
-        pages=(total + size - 1) // size,
+        pages=pages,
+        next_cursor=next_cursor,
     )
+    return ORJSONResponse(response.model_dump(by_alias=True))
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_ro),
 ):
     """
     Get project by ID.
     """
     query = select(Project).where(Project.id == project_id)
-    query = query.options(
-        selectinload(Project.question_type_configs),
-        selectinload(Project.materials),
-    )
+    query = query.options(*PROJECT_RESPONSE_OPTIONS)
     
     result = await db.execute(query)
     project = result.scalar_one_or_none()
@@ -203,14 +436,9 @@ async def create_project(
     db.add(project)
     await db.commit()
     
-    # Reload with relationships
-    query = select(Project).where(Project.id == project.id)
-    query = query.options(
-        selectinload(Project.question_type_configs),
-        selectinload(Project.materials),
-    )
-    result = await db.execute(query)
-    project = result.scalar_one()
+    # A new project has no configs or materials yet; no reload needed
+    set_committed_value(project, "question_type_configs", [])
+    set_committed_value(project, "materials", [])
     
     return project_to_response(project)
 
@@ -221,6 +449,11 @@ async def create_project(
 async def add_materials_to_project(
     project_id: UUID,
     materials_data: ProjectAddMaterials,
+    project: Project = Depends(owned_project(
+        # materials are set from the request below
+        selectinload(Project.question_type_configs),
+        raiseload("*"),
+    )),
     current_user: User = Depends(get_current_teacher),
     db: AsyncSession = Depends(get_db),
 ):
@@ -230,22 +463,22 @@ async def add_materials_to_project(
     Materials must be previously uploaded by the teacher.
     This replaces any existing materials linked to the project.
     """
-    # Get project
-    query = select(Project).where(
-        Project.id == project_id,
-        Project.teacher_id == current_user.id,
-    )
-    result = await db.execute(query)
-    project = result.scalar_one_or_none()
-    
-    if not project:
-        raise NotFoundException(resource="Project", resource_id=str(project_id))
-    
-    # Verify all materials exist and belong to teacher
+    # Verify all materials exist and belong to teacher, loading only the
+    # columns the response shows (these rows become project.materials)
     materials_query = select(Material).where(
         Material.id.in_(materials_data.material_ids),
         Material.teacher_id == current_user.id,
     )
+    materials_query = materials_query.options(
+        load_only(
+            Material.id,
+            Material.file_name,
+            Material.original_name,
+            Material.file_type,
+            Material.file_size,
+        ),
+        raiseload("*"),
+    )
     materials_result = await db.execute(materials_query)
     materials = materials_result.scalars().all()
     
@@ -263,31 +496,27 @@ async def add_materials_to_project(
         project_materials.delete().where(project_materials.c.project_id == project_id)
     )
     
-    # Add new links
-    for material in materials:
+    # Add new links (one executemany round trip)
+    if materials:
         await db.execute(
-            project_materials.insert().values(
-                project_id=project_id,
-                material_id=material.id,
-                is_vectorized=0,  # pending
-            )
+            project_materials.insert(),
+            [
+                {"project_id": project_id, "material_id": m.id, "is_vectorized": 0}  # pending
+                for m in materials
+            ],
         )
     
     # Reset vectorization status
     project.vectorization_status = "pending"
     project.vectorization_progress = 0
     project.vectorization_error = None
+    project.materials_processed = 0
     
     await db.commit()
+    await cache_service.invalidate_vectorization_status(current_user.id, project_id)
     
-    # Reload project
-    query = select(Project).where(Project.id == project_id)
-    query = query.options(
-        selectinload(Project.question_type_configs),
-        selectinload(Project.materials),
-    )
-    result = await db.execute(query)
-    project = result.scalar_one()
+    # The links are exactly the materials just written
+    set_committed_value(project, "materials", list(materials))
     
     return project_to_response(project)
 
@@ -297,6 +526,10 @@ async def add_materials_to_project(
 @router.post("/{project_id}/vectorize", response_model=VectorizationStatus)
 async def start_vectorization(
     project_id: UUID,
+    project: Project = Depends(owned_project(
+        selectinload(Project.materials),
+        raiseload(Project.question_type_configs),
+    )),
     current_user: User = Depends(get_current_teacher),
     db: AsyncSession = Depends(get_db),
 ):
@@ -306,21 +539,6 @@ async def start_vectorization(
     This is a background task. Poll GET /projects/{id}/vectorization-status
     to check progress.
     """
-    # Get project with materials
-    query = select(Project).where(
-        Project.id == project_id,
-        Project.teacher_id == current_user.id,
-    )
-    query = query.options(selectinload(Project.materials))
-    result = await db.execute(query)
-    project = result.scalar_one_or_none()
-    
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found",
-        )
-    
     if not project.materials:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -337,8 +555,10 @@ async def start_vectorization(
     project.vectorization_status = "processing"
     project.vectorization_progress = 0
     project.vectorization_error = None
+    project.materials_processed = 0
     project.status = "vectorizing"
     await db.commit()
+    await cache_service.invalidate_vectorization_status(current_user.id, project_id)
     
     # Start Celery task
     material_ids = [str(m.id) for m in project.materials]
@@ -356,42 +576,60 @@ async def start_vectorization(
 async def get_vectorization_status(
     project_id: UUID,
     current_user: User = Depends(get_current_teacher),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_ro),
 ):
     """
     Get current vectorization status and progress.
     
     Poll this endpoint to show loading indicator to user.
+    
+    Responses are cached for a couple of seconds; the worker drops the
+    entry whenever it records progress. Reads go to the replica, so a
+    progress update can show up one replication delay later.
     """
-    query = select(Project).where(
+    cache_key = cache_service.vectorization_status_key(current_user.id, project_id)
+    cached = await cache_service.get_raw(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    # Status and material counts in one round trip (the processed count
+    # is kept on the project by the worker)
+    links = project_materials.c
+    materials_total = (
+        select(func.count())
+        .where(links.project_id == Project.id)
+        .scalar_subquery()
+    )
+    query = select(
+        Project.vectorization_status,
+        Project.vectorization_progress,
+        Project.vectorization_error,
+        materials_total.label("materials_total"),
+        Project.materials_processed,
+    ).where(
         Project.id == project_id,
         Project.teacher_id == current_user.id,
     )
-    query = query.options(selectinload(Project.materials))
     result = await db.execute(query)
-    project = result.scalar_one_or_none()
+    row = result.one_or_none()
     
-    if not project:
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found",
         )
     
-    # Count processed materials
-    processed_query = select(func.count()).select_from(project_materials).where(
-        project_materials.c.project_id == project_id,
-        project_materials.c.is_vectorized == 2,  # done
-    )
-    processed_result = await db.execute(processed_query)
-    processed_count = processed_result.scalar() or 0
-    
-    return VectorizationStatus(
-        status=project.vectorization_status,
-        progress=project.vectorization_progress,
-        error=project.vectorization_error,
-        materialsTotal=len(project.materials) if project.materials else 0,
-        materialsProcessed=processed_count,
+    body = orjson.dumps(
+        VectorizationStatus(
+            status=row.vectorization_status,
+            progress=row.vectorization_progress,
+            error=row.vectorization_error,
+            materialsTotal=row.materials_total,
+            materialsProcessed=row.materials_processed,
+        ).model_dump(by_alias=True)
     )
+    await cache_service.set_raw(cache_key, body, cache_service.VECTORIZATION_STATUS_TTL)
+    return Response(content=body, media_type="application/json")
 
 
 # ============== Step 4: Configure Settings ==============
@@ -400,7 +638,11 @@ async def get_vectorization_status(
 async def configure_project_settings(
     project_id: UUID,
     settings_data: ProjectConfigureSettings,
-    current_user: User = Depends(get_current_teacher),
+    project: Project = Depends(owned_project(
+        # question type configs are replaced below
+        selectinload(Project.materials),
+        raiseload("*"),
+    )),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -408,20 +650,6 @@ async def configure_project_settings(
     
     This step should only be called after vectorization is completed.
     """
-    query = select(Project).where(
-        Project.id == project_id,
-        Project.teacher_id == current_user.id,
-    )
-    query = query.options(selectinload(Project.question_type_configs))
-    result = await db.execute(query)
-    project = result.scalar_one_or_none()
-    
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found",
-        )
-    
     # Warning if vectorization not complete (but allow anyway)
     if project.vectorization_status != "completed":
         # Just a warning, don't block - user might want to configure anyway
@@ -435,48 +663,21 @@ async def configure_project_settings(
     project.num_variants = settings_data.settings.num_variants
     project.test_language = settings_data.settings.test_language
     
-    # Strip timezone info for TIMESTAMP WITHOUT TIME ZONE columns
+    # Aware datetimes (the schema takes naive values as UTC)
     if settings_data.start_time:
-        start_time = settings_data.start_time
-        if start_time.tzinfo is not None:
-            start_time = start_time.replace(tzinfo=None)
-        project.start_time = start_time
+        project.start_time = settings_data.start_time
     if settings_data.end_time:
-        end_time = settings_data.end_time
-        if end_time.tzinfo is not None:
-            end_time = end_time.replace(tzinfo=None)
-        project.end_time = end_time
+        project.end_time = settings_data.end_time
     
     # Update status to ready if vectorization is complete
     if project.vectorization_status == "completed":
         project.status = "ready"
     
     # Update question type configs
-    # Delete existing
-    for qtc in project.question_type_configs:
-        await db.delete(qtc)
-    
-    # Create new
-    for qt_config in settings_data.settings.question_types:
-        qtc = QuestionTypeConfig(
-            project_id=project.id,
-            question_type=qt_config.type,
-            count=qt_config.count,
-            time_per_question=qt_config.time_per_question,
-        )
-        db.add(qtc)
+    await _replace_question_type_configs(db, project, settings_data.settings.question_types)
     
     await db.commit()
     
-    # Reload
-    query = select(Project).where(Project.id == project_id)
-    query = query.options(
-        selectinload(Project.question_type_configs),
-        selectinload(Project.materials),
-    )
-    result = await db.execute(query)
-    project = result.scalar_one()
-    
     return project_to_response(project)
 
 
@@ -485,7 +686,10 @@ async def configure_project_settings(
 @router.post("/{project_id}/generate-tests")
 async def generate_tests(
     project_id: UUID,
-    current_user: User = Depends(get_current_teacher),
+    project: Project = Depends(owned_project(
+        selectinload(Project.materials),
+        selectinload(Project.question_type_configs),
+    )),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -500,21 +704,6 @@ async def generate_tests(
     """
     from app.tasks.test_tasks import generate_test_questions
     
-    # Get project with materials
-    query = select(Project).where(
-        Project.id == project_id,
-        Project.teacher_id == current_user.id,
-    )
-    query = query.options(
-        selectinload(Project.materials),
-        selectinload(Project.question_type_configs),
-    )
-    result = await db.execute(query)
-    project = result.scalar_one_or_none()
-    
-    if not project:
-        raise NotFoundException(resource="Project", resource_id=str(project_id))
-    
     if not project.materials:
         raise ValidationException(
             message="No materials linked to project. Add materials first.",
@@ -542,32 +731,23 @@ async def generate_tests(
     }
 
 
+def _read_task_state(job_id: str) -> Tuple[str, Any, Any]:
+    """Status, info and result of a Celery task (each read hits the result backend)."""
+    task_result = AsyncResult(job_id, app=celery_app)
+    return task_result.status, task_result.info, task_result.result
+
+
 @router.get("/{project_id}/generate-tests/{job_id}")
 async def get_generation_status(
     project_id: UUID,
     job_id: str,
-    current_user: User = Depends(get_current_teacher),
-    db: AsyncSession = Depends(get_db),
+    project: Project = Depends(owned_project(*PROJECT_ROW_OPTIONS, read_only=True)),
 ):
     """
     Check test generation job status.
     """
-    from celery.result import AsyncResult
-    from app.celery_app import celery_app
-    
-    # Verify project ownership
-    query = select(Project).where(
-        Project.id == project_id,
-        Project.teacher_id == current_user.id,
-    )
-    result = await db.execute(query)
-    project = result.scalar_one_or_none()
-    
-    if not project:
-        raise NotFoundException(resource="Project", resource_id=str(project_id))
-    
-    # Get task result
-    task_result = AsyncResult(job_id, app=celery_app)
+    # Get task result (blocking reads from the result backend, off the event loop)
+    task_status, task_info, task_return = await asyncio.to_thread(_read_task_state, job_id)
     
     status_map = {
         "PENDING": "pending",
@@ -578,24 +758,24 @@ async def get_generation_status(
     }
     
     response = {
-        "status": status_map.get(task_result.status, "unknown"),
+        "status": status_map.get(task_status, "unknown"),
         "progress": 0,
     }
     
-    if task_result.info:
-        if isinstance(task_result.info, dict):
-            response["progress"] = task_result.info.get("progress", 0)
-            response["step"] = task_result.info.get("step")
-            if task_result.info.get("error"):
-                response["message"] = task_result.info.get("error")
-            if task_result.info.get("questions_generated"):
-                response["questionsGenerated"] = task_result.info.get("questions_generated")
+    if task_info:
+        if isinstance(task_info, dict):
+            response["progress"] = task_info.get("progress", 0)
+            response["step"] = task_info.get("step")
+            if task_info.get("error"):
+                response["message"] = task_info.get("error")
+            if task_info.get("questions_generated"):
+                response["questionsGenerated"] = task_info.get("questions_generated")
     
-    if task_result.status == "SUCCESS" and isinstance(task_result.result, dict):
-        response["questionsGenerated"] = task_result.result.get("questions_generated", 0)
+    if task_status == "SUCCESS" and isinstance(task_return, dict):
+        response["questionsGenerated"] = task_return.get("questions_generated", 0)
     
-    if task_result.status == "FAILURE":
-        response["message"] = str(task_result.result) if task_result.result else "Generation failed"
+    if task_status == "FAILURE":
+        response["message"] = str(task_return) if task_return else "Generation failed"
     
     return response
 
@@ -606,30 +786,12 @@ async def get_generation_status(
 async def update_project(
     project_id: UUID,
     project_data: ProjectUpdate,
-    current_user: User = Depends(get_current_teacher),
+    project: Project = Depends(get_owned_project_for_response),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Update project general info.
     """
-    query = select(Project).where(
-        Project.id == project_id,
-        Project.teacher_id == current_user.id,
-    )
-    query = query.options(
-        selectinload(Project.question_type_configs),
-        selectinload(Project.materials),
-    )
-    
-    result = await db.execute(query)
-    project = result.scalar_one_or_none()
-    
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found",
-        )
-    
     # Update fields
     if project_data.title is not None:
         project.title = project_data.title
@@ -640,17 +802,9 @@ async def update_project(
     if project_data.status is not None:
         project.status = project_data.status
     if project_data.start_time is not None:
-        # Strip timezone info for TIMESTAMP WITHOUT TIME ZONE column
-        start_time = project_data.start_time
-        if start_time.tzinfo is not None:
-            start_time = start_time.replace(tzinfo=None)
-        project.start_time = start_time
+        project.start_time = project_data.start_time
     if project_data.end_time is not None:
-        # Strip timezone info for TIMESTAMP WITHOUT TIME ZONE column
-        end_time = project_data.end_time
-        if end_time.tzinfo is not None:
-            end_time = end_time.replace(tzinfo=None)
-        project.end_time = end_time
+        project.end_time = project_data.end_time
     
     # Update settings if provided
     if project_data.settings:
@@ -663,20 +817,9 @@ async def update_project(
         project.timer_mode = project_data.settings.timer_mode
         
         # Update question type configs
-        for qtc in project.question_type_configs:
-            await db.delete(qtc)
-        
-        for qt_config in project_data.settings.question_types:
-            qtc = QuestionTypeConfig(
-                project_id=project.id,
-                question_type=qt_config.type,
-                count=qt_config.count,
-                time_per_question=qt_config.time_per_question,
-            )
-            db.add(qtc)
+        await _replace_question_type_configs(db, project, project_data.settings.question_types)
     
     await db.commit()
-    await db.refresh(project)
     
     return project_to_response(project)
 
@@ -685,33 +828,14 @@ async def update_project(
 async def update_project_status(
     project_id: UUID,
     status_data: ProjectStatusUpdate,
-    current_user: User = Depends(get_current_teacher),
+    project: Project = Depends(get_owned_project_for_response),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Update project status only.
     """
-    query = select(Project).where(
-        Project.id == project_id,
-        Project.teacher_id == current_user.id,
-    )
-    query = query.options(
-        selectinload(Project.question_type_configs),
-        selectinload(Project.materials),
-    )
-    
-    result = await db.execute(query)
-    project = result.scalar_one_or_none()
-    
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found",
-        )
-    
     project.status = status_data.status
     await db.commit()
-    await db.refresh(project)
     
     return project_to_response(project)
 
@@ -719,47 +843,26 @@ async def update_project_status(
 @router.delete("/{project_id}", response_model=MessageResponse)
 async def delete_project(
     project_id: UUID,
-    current_user: User = Depends(get_current_teacher),
+    project: Project = Depends(owned_project()),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Delete project by ID.
-    Also removes project-material links and OpenAI Vector Store.
+    Also removes project-material links and OpenAI Vector Store (in the background).
     """
-    from app.services.openai_vectorstore import get_vectorstore_service
-    
-    query = select(Project).where(
-        Project.id == project_id,
-        Project.teacher_id == current_user.id,
-    )
-    
-    result = await db.execute(query)
-    project = result.scalar_one_or_none()
-    
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found",
-        )
-    
-    # Delete OpenAI Vector Store if exists
-    if project.openai_vector_store_id:
-        try:
-            vs_service = get_vectorstore_service()
-            vs_service.delete_vector_store(project.openai_vector_store_id)
-        except Exception as e:
-            print(f"Warning: Failed to delete Vector Store from OpenAI: {e}")
+    await db.delete(project)
+    await db.commit()
+    forget_project_owner(project.id, project.teacher_id)
     
-    # Delete OpenAI Assistant if exists
-    if project.openai_assistant_id:
+    # Delete the OpenAI Vector Store and Assistant if they exist; the worker
+    # makes the API calls so the response does not wait for them
+    if project.openai_vector_store_id or project.openai_assistant_id:
         try:
-            vs_service = get_vectorstore_service()
-            vs_service.cleanup_assistant(project.openai_assistant_id)
+            cleanup_project_openai_resources.delay(
+                project.openai_vector_store_id, project.openai_assistant_id
+            )
         except Exception as e:
-            print(f"Warning: Failed to delete Assistant from OpenAI: {e}")
-    
-    await db.delete(project)
-    await db.commit()
+            print(f"Warning: Failed to schedule OpenAI cleanup: {e}")
     
     return MessageResponse(message="Project deleted successfully")
 
@@ -771,28 +874,18 @@ async def get_project_questions(
     project_id: UUID,
     variant: Optional[int] = Query(None, description="Filter by variant number"),
     current_user: User = Depends(get_current_teacher),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_ro),
 ):
     """
     Get all questions for a project.
     Optionally filter by variant number.
     """
-    from app.models.test import Question
-    
-    # Verify project ownership
-    project_query = select(Project).where(
-        Project.id == project_id,
-        Project.teacher_id == current_user.id,
-    )
-    project_result = await db.execute(project_query)
-    project = project_result.scalar_one_or_none()
-    
-    if not project:
-        raise NotFoundException(resource="Project", resource_id=str(project_id))
-    
-    # Get questions with optional variant filter
-    questions_query = select(Question).where(
-        Question.project_id == project_id
+    # Get questions with optional variant filter; the join to the
+    # teacher's project doubles as the ownership check
+    questions_query = (
+        select(Question)
+        .join(Project, Question.project_id == Project.id)
+        .where(Project.id == project_id, Project.teacher_id == current_user.id)
     )
     
     if variant is not None:
@@ -803,12 +896,26 @@ async def get_project_questions(
     result = await db.execute(questions_query)
     questions = result.scalars().all()
     
-    # Get unique variants count
-    variants_query = select(Question.variant_number).where(
-        Question.project_id == project_id
-    ).distinct().order_by(Question.variant_number)
-    variants_result = await db.execute(variants_query)
-    unique_variants = [v[0] for v in variants_result.fetchall()]
+    # No rows: either a project without (matching) questions or no access
+    if not questions:
+        owned = await db.scalar(
+            select(Project.id).where(
+                Project.id == project_id,
+                Project.teacher_id == current_user.id,
+            )
+        )
+        if owned is None:
+            raise NotFoundException(resource="Project", resource_id=str(project_id))
+    
+    # Get unique variants count (unfiltered, the rows already have them all)
+    if variant is None:
+        unique_variants = sorted({q.variant_number for q in questions})
+    else:
+        variants_query = select(Question.variant_number).where(
+            Question.project_id == project_id
+        ).distinct().order_by(Question.variant_number)
+        variants_result = await db.execute(variants_query)
+        unique_variants = [v[0] for v in variants_result.fetchall()]
     
     return {
         "questions": [
@@ -833,27 +940,14 @@ async def get_project_questions(
 
 @router.post("/{project_id}/questions")
 async def create_question(
-    project_id: UUID,
     question_data: dict,
+    project_id: UUID = Depends(get_owned_project_id),
     current_user: User = Depends(get_current_teacher),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Create a new question for a project.
     """
-    from app.models.test import Question
-    
-    # Verify project ownership
-    project_query = select(Project).where(
-        Project.id == project_id,
-        Project.teacher_id == current_user.id,
-    )
-    project_result = await db.execute(project_query)
-    project = project_result.scalar_one_or_none()
-    
-    if not project:
-        raise NotFoundException(resource="Project", resource_id=str(project_id))
-    
     # Create question
     question = Question(
         project_id=project_id,
@@ -867,7 +961,14 @@ async def create_question(
     )
     
     db.add(question)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Ownership came from the cache and the project has since been
+        # deleted by another process
+        await db.rollback()
+        forget_project_owner(project_id, current_user.id)
+        raise NotFoundException(resource="Project", resource_id=str(project_id))
     await db.refresh(question)
     
     return {
@@ -884,28 +985,14 @@ async def create_question(
 
 @router.put("/{project_id}/questions/{question_id}")
 async def update_question(
-    project_id: UUID,
     question_id: UUID,
     question_data: dict,
-    current_user: User = Depends(get_current_teacher),
+    project_id: UUID = Depends(get_owned_project_id),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Update an existing question.
     """
-    from app.models.test import Question
-    
-    # Verify project ownership
-    project_query = select(Project).where(
-        Project.id == project_id,
-        Project.teacher_id == current_user.id,
-    )
-    project_result = await db.execute(project_query)
-    project = project_result.scalar_one_or_none()
-    
-    if not project:
-        raise NotFoundException(resource="Project", resource_id=str(project_id))
-    
     # Get question
     question_query = select(Question).where(
         Question.id == question_id,
@@ -948,7 +1035,11 @@ async def update_question(
     }
 
 
-@router.delete("/{project_id}/questions/{question_id}")
+@router.delete(
+    "/{project_id}/questions/{question_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
+)
 async def delete_question(
     project_id: UUID,
     question_id: UUID,
@@ -958,34 +1049,28 @@ async def delete_question(
     """
     Delete a question.
     """
-    from app.models.test import Question
-    
-    # Verify project ownership
-    project_query = select(Project).where(
-        Project.id == project_id,
-        Project.teacher_id == current_user.id,
-    )
-    project_result = await db.execute(project_query)
-    project = project_result.scalar_one_or_none()
-    
-    if not project:
-        raise NotFoundException(resource="Project", resource_id=str(project_id))
-    
-    # Get question
-    question_query = select(Question).where(
-        Question.id == question_id,
-        Question.project_id == project_id,
+    # Delete in one statement with ownership in the WHERE clause; only
+    # when nothing was deleted look up which of the two is missing
+    result = await db.execute(
+        delete(Question).where(
+            Question.id == question_id,
+            Question.project_id.in_(
+                select(Project.id).where(
+                    Project.id == project_id,
+                    Project.teacher_id == current_user.id,
+                )
+            ),
+        )
     )
-    question_result = await db.execute(question_query)
-    question = question_result.scalar_one_or_none()
-    
-    if not question:
+    if result.rowcount == 0:
+        await db.rollback()
+        if not await owns_project(db, project_id, current_user.id):
+            raise NotFoundException(resource="Project", resource_id=str(project_id))
         raise NotFoundException(resource="Question", resource_id=str(question_id))
     
-    await db.delete(question)
     await db.commit()
     
-    return {"message": "Question deleted successfully"}
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.post("/{project_id}/questions/{question_id}/regenerate")
@@ -1001,18 +1086,17 @@ async def regenerate_question_endpoint(
     Returns a preview — does NOT save to DB.
     Apply the result via PUT /{project_id}/questions/{question_id}.
     """
-    import asyncio
-    from app.models.test import Question
     from app.services.question_regeneration import regenerate_question
 
-    project_query = select(Project).where(
-        Project.id == project_id,
-        Project.teacher_id == current_user.id,
+    project_result = await db.execute(
+        select(Project.openai_vector_store_id).where(
+            Project.id == project_id,
+            Project.teacher_id == current_user.id,
+        )
     )
-    project_result = await db.execute(project_query)
-    project = project_result.scalar_one_or_none()
+    project = project_result.first()
 
-    if not project:
+    if project is None:
         raise NotFoundException(resource="Project", resource_id=str(project_id))
 
     if not project.openai_vector_store_id:
@@ -1045,12 +1129,17 @@ async def regenerate_question_endpoint(
     preset = body.get("preset")
     custom_instruction = body.get("instruction")
     target_language = body.get("language", "en")
+    vector_store_id = project.openai_vector_store_id
+
+    # Everything needed is in memory: hand the connection back to the pool
+    # before the OpenAI round trip, which can take many seconds
+    await db.close()
 
     loop = asyncio.get_event_loop()
     new_question = await loop.run_in_executor(
         None,
         lambda: regenerate_question(
-            vector_store_id=project.openai_vector_store_id,
+            vector_store_id=vector_store_id,
             existing_question=existing_question,
             preset=preset,
             custom_instruction=custom_instruction,
@@ -1104,17 +1193,18 @@ async def get_project_students(
     """
     Get list of allowed students for a project.
     """
-    query = select(Project).where(
-        Project.id == project_id,
-        Project.teacher_id == current_user.id,
+    result = await db.execute(
+        select(Project.allowed_students).where(
+            Project.id == project_id,
+            Project.teacher_id == current_user.id,
+        )
     )
-    result = await db.execute(query)
-    project = result.scalar_one_or_none()
+    row = result.first()
     
-    if not project:
+    if row is None:
         raise NotFoundException(resource="Project", resource_id=str(project_id))
     
-    allowed_emails = project.allowed_students or []
+    allowed_emails = row.allowed_students or []
 
     if not allowed_emails:
         return []
@@ -1125,7 +1215,7 @@ async def get_project_students(
     participants_result = await db.execute(
         select(Participant).where(
             Participant.teacher_id == current_user.id,
-            Participant.email.in_([e.lower() for e in allowed_emails]),
+            in_values(Participant.email, [e.lower() for e in allowed_emails]),
         )
     )
     participants = participants_result.scalars().all()
@@ -1136,7 +1226,7 @@ async def get_project_students(
 @router.post("/{project_id}/students")
 async def add_student_to_project(
     project_id: UUID,
-    student_data: dict,
+    student_data: ProjectAddStudent,
     current_user: User = Depends(get_current_teacher),
     db: AsyncSession = Depends(get_db),
 ):
@@ -1145,45 +1235,12 @@ async def add_student_to_project(
     
     Body: {"email": "student@example.com"}
     """
-    email = student_data.get("email", "").strip().lower()
-    
-    if not email:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email is required",
-        )
-    
-    # Validate email format
-    import re
-    if not re.match(r"[^@]+@[^@]+\.[^@]+", email):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid email format",
-        )
-    
-    query = select(Project).where(
-        Project.id == project_id,
-        Project.teacher_id == current_user.id,
-    )
-    result = await db.execute(query)
-    project = result.scalar_one_or_none()
+    email = student_data.email
     
-    if not project:
+    allowed_students = await _add_allowed_student(db, project_id, current_user.id, email)
+    if allowed_students is None:
         raise NotFoundException(resource="Project", resource_id=str(project_id))
-    
-    # Initialize if None
-    if project.allowed_students is None:
-        project.allowed_students = []
-
-    # Check if already in list
-    if email in project.allowed_students:
-        existing_emails = project.allowed_students
-    else:
-        existing_emails = project.allowed_students + [email]
-
-    project.allowed_students = existing_emails
     await db.commit()
-    await db.refresh(project)
 
     # Refresh participant profiles
     from app.models.participant import Participant
@@ -1191,14 +1248,14 @@ async def add_student_to_project(
     participants_result = await db.execute(
         select(Participant).where(
             Participant.teacher_id == current_user.id,
-            Participant.email.in_([e.lower() for e in project.allowed_students]),
+            in_values(Participant.email, [e.lower() for e in allowed_students]),
         )
     )
     participants = participants_result.scalars().all()
 
     return {
         "message": "Student added successfully",
-        "students": _build_student_profiles(project.allowed_students, participants),
+        "students": _build_student_profiles(allowed_students, participants),
     }
 
 
@@ -1214,39 +1271,29 @@ async def remove_student_from_project(
     """
     email = email.strip().lower()
     
-    query = select(Project).where(
-        Project.id == project_id,
-        Project.teacher_id == current_user.id,
-    )
-    result = await db.execute(query)
-    project = result.scalar_one_or_none()
-    
-    if not project:
-        raise NotFoundException(resource="Project", resource_id=str(project_id))
-    
-    if not project.allowed_students or email not in project.allowed_students:
+    allowed_students = await _remove_allowed_student(db, project_id, current_user.id, email)
+    if allowed_students is None:
+        if not await owns_project(db, project_id, current_user.id):
+            raise NotFoundException(resource="Project", resource_id=str(project_id))
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Student not found in project",
         )
-    
-    project.allowed_students = [e for e in project.allowed_students if e != email]
     await db.commit()
-    await db.refresh(project)
 
     from app.models.participant import Participant
 
     participants_result = await db.execute(
         select(Participant).where(
             Participant.teacher_id == current_user.id,
-            Participant.email.in_(project.allowed_students),
+            in_values(Participant.email, allowed_students),
         )
     )
     participants = participants_result.scalars().all()
 
     return {
         "message": "Student removed successfully",
-        "students": _build_student_profiles(project.allowed_students, participants),
+        "students": _build_student_profiles(allowed_students, participants),
     }
 
 
@@ -1264,11 +1311,12 @@ async def add_group_to_project(
     """
     from app.models.participant import ParticipantGroup, Participant
     
-    # Verify project ownership
+    # Verify project ownership; only the student list is needed
     query = select(Project).where(
         Project.id == project_id,
         Project.teacher_id == current_user.id,
     )
+    query = query.options(load_only(Project.id, Project.allowed_students), raiseload("*"))
     result = await db.execute(query)
     project = result.scalar_one_or_none()
     
@@ -1321,13 +1369,12 @@ async def add_group_to_project(
     project.allowed_students = new_list
     
     await db.commit()
-    await db.refresh(project)
     
     # Get all participant profiles for response
     all_participants_result = await db.execute(
         select(Participant).where(
             Participant.teacher_id == current_user.id,
-            Participant.email.in_([e.lower() for e in project.allowed_students]),
+            in_values(Participant.email, [e.lower() for e in project.allowed_students]),
         )
     )
     all_participants = all_participants_result.scalars().all()
@@ -1342,26 +1389,19 @@ async def add_group_to_project(
 @router.get("/{project_id}/test-results")
 async def get_project_test_results(
     project_id: UUID,
-    current_user: User = Depends(get_current_teacher),
+    teacher_project: tuple = Depends(get_current_teacher_project),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Get test results for all students in a project.
     Returns status, score, time taken for each student.
+    
+    Polled by the lobby every few seconds, so the teacher and project
+    ownership are loaded in one query.
     """
-    from app.models.test import Test, Answer
     from app.models.participant import Participant
     
-    # Verify project ownership
-    query = select(Project).where(
-        Project.id == project_id,
-        Project.teacher_id == current_user.id,
-    )
-    result = await db.execute(query)
-    project = result.scalar_one_or_none()
-    
-    if not project:
-        raise NotFoundException(resource="Project", resource_id=str(project_id))
+    current_user, project = teacher_project
     
     # Get all tests for this project with student info and answer questions
     tests_query = (
@@ -1380,7 +1420,7 @@ async def get_project_test_results(
     participants_result = await db.execute(
         select(Participant).where(
             Participant.teacher_id == current_user.id,
-            Participant.email.in_([e.lower() for e in allowed_emails]),
+            in_values(Participant.email, [e.lower() for e in allowed_emails]),
         )
     )
     participants = {p.email.lower(): p for p in participants_result.scalars().all()}
@@ -1410,7 +1450,7 @@ async def get_project_test_results(
             time_taken = int((test.completed_at - test.started_at).total_seconds())
         elif test.started_at:
             from datetime import datetime
-            time_taken = int((datetime.utcnow() - test.started_at).total_seconds())
+            time_taken = int((datetime.now(timezone.utc) - test.started_at).total_seconds())
         
         # Calculate score and grading info
         # Only count questions that require AI grading (short-answer, essay)
@@ -1468,30 +1508,16 @@ async def get_project_test_results(
 
 @router.delete("/{project_id}/test-results/{student_email}")
 async def delete_student_test_results(
-    project_id: UUID,
     student_email: str,
-    current_user: User = Depends(get_current_teacher),
+    project_id: UUID = Depends(get_owned_project_id),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Delete test results for a specific student in a project.
     This allows the student to retake the test.
     """
-    from app.models.test import Test
-    
     student_email = student_email.strip().lower()
     
-    # Verify project ownership
-    query = select(Project).where(
-        Project.id == project_id,
-        Project.teacher_id == current_user.id,
-    )
-    result = await db.execute(query)
-    project = result.scalar_one_or_none()
-    
-    if not project:
-        raise NotFoundException(resource="Project", resource_id=str(project_id))
-    
     # Find tests by participant_email OR by registered student email
     # First try to find by participant_email (most common case)
     tests_result = await db.execute(
@@ -1550,6 +1576,7 @@ async def complete_project(
         Project.id == project_id,
         Project.teacher_id == current_user.id,
     )
+    query = query.options(*PROJECT_ROW_OPTIONS)
     
     result = await db.execute(query)
     project = result.scalar_one_or_none()
@@ -4,15 +4,16 @@ Student Endpoints
 Student-specific features: email management, statistics.
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
 from app.core.deps import get_db, get_current_student
-from app.core.security import verify_password, get_password_hash
+from app.core.security import verify_password_async, get_password_hash_async
 from app.models.user import User
 from app.models.test import Test
 from app.models.project import Project
@@ -27,6 +28,7 @@ from app.schemas.student import (
 )
 from app.schemas.user import PasswordChange
 from app.schemas.common import MessageResponse
+from app.services import cache_service
 
 router = APIRouter()
 
@@ -81,17 +83,8 @@ async def add_student_email(
     """
     Add a new email to student account.
     """
-    # Check if email already exists
-    existing = await db.execute(
-        select(StudentEmail).where(StudentEmail.email == email_data.email)
-    )
-    if existing.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already in use",
-        )
-    
-    # Also check main user emails
+    # Check main user emails; duplicates among additional emails are
+    # rejected by the unique index on student_emails.email
     existing_user = await db.execute(
         select(User).where(User.email == email_data.email)
     )
@@ -109,7 +102,14 @@ async def add_student_email(
     )
     
     db.add(email)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already in use",
+        )
     await db.refresh(email)
     
     return StudentEmailResponse(
@@ -205,13 +205,13 @@ async def change_password(
     """
     Change password for current student.
     """
-    if not verify_password(password_data.current_password, current_user.hashed_password):
+    if not await verify_password_async(password_data.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect current password",
         )
     
-    current_user.hashed_password = get_password_hash(password_data.new_password)
+    current_user.hashed_password = await get_password_hash_async(password_data.new_password)
     await db.commit()
     
     return MessageResponse(message="Password changed successfully")
@@ -310,7 +310,7 @@ async def get_upcoming_tests(
     for row in emails_result.all():
         student_emails.append(row[0])
     
-    now = datetime.utcnow()
+    now = datetime.now(timezone.utc)
     
     # Find projects that are ready or active and where student is allowed
     result = await db.execute(
@@ -444,7 +444,7 @@ async def start_test_for_student(
         )
     
     # Check if test is accessible
-    now = datetime.utcnow()
+    now = datetime.now(timezone.utc)
     
     # Test is accessible only if:
     # 1. status is "active" (teacher manually activated), OR
@@ -576,7 +576,7 @@ async def start_test_for_student(
         project_id=project_id,
         student_id=current_user.id,
         status="in-progress",
-        started_at=datetime.utcnow(),
+        started_at=datetime.now(timezone.utc),
         max_score=max_score,
         score=0,
         variant_number=assigned_variant,
@@ -913,12 +913,17 @@ async def submit_test(
     
     # Update test
     test.status = "completed"
-    test.completed_at = datetime.utcnow()
+    test.completed_at = datetime.now(timezone.utc)
     test.score = total_score
     test.max_score = correct_max_score  # Fix max_score if it was wrong
     
     await db.commit()
     
+    # The teacher's cached analytics no longer include this result
+    teacher_id = await db.scalar(select(Project.teacher_id).where(Project.id == test.project_id))
+    if teacher_id:
+        await cache_service.invalidate_analytics(teacher_id)
+    
     # Trigger async AI grading for written answers
     # Import here to avoid circular imports
     from app.tasks.grading_tasks import grade_test_written_answers
@@ -4,7 +4,7 @@ Test Endpoints
 Test generation, submission, and results.
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks, Response
@@ -32,6 +32,7 @@ from app.schemas.test import (
     TestResultResponse,
 )
 from app.schemas.common import MessageResponse
+from app.services import cache_service
 
 router = APIRouter()
 
@@ -104,7 +105,7 @@ async def get_project_tests(
     project_id: UUID,
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
-    status: Optional[str] = None,
+    status: Optional[str] = Query(None, pattern="^(pending|in-progress|completed|graded)$"),
     current_user: User = Depends(get_current_teacher),
     db: AsyncSession = Depends(get_db),
 ):
@@ -124,18 +125,16 @@ async def get_project_tests(
             detail="Project not found",
         )
     
-    # Build query
-    query = select(Test).where(Test.project_id == project_id)
+    conditions = [Test.project_id == project_id]
     if status:
-        query = query.where(Test.status == status)
+        conditions.append(Test.status == status)
     
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
+    # Count total (plain aggregate over the same filters, no derived table)
+    total_result = await db.execute(select(func.count()).select_from(Test).where(*conditions))
     total = total_result.scalar()
     
     # Apply pagination
-    query = query.options(selectinload(Test.answers))
+    query = select(Test).where(*conditions).options(selectinload(Test.answers))
     query = query.order_by(Test.created_at.desc())
     query = query.offset((page - 1) * size).limit(size)
     
@@ -311,7 +310,7 @@ async def start_test(
     # Update test
     test.student_id = current_user.id
     test.status = "in-progress"
-    test.started_at = datetime.utcnow()
+    test.started_at = datetime.now(timezone.utc)
     
     await db.commit()
     await db.refresh(test)
@@ -480,11 +479,16 @@ async def submit_test(
     
     # Update test
     test.status = "completed"
-    test.completed_at = datetime.utcnow()
+    test.completed_at = datetime.now(timezone.utc)
     test.score = total_score
     
     await db.commit()
     
+    # The teacher's cached analytics no longer include this result
+    teacher_id = await db.scalar(select(Project.teacher_id).where(Project.id == test.project_id))
+    if teacher_id:
+        await cache_service.invalidate_analytics(teacher_id)
+    
     # Calculate if passed (>= 60%)
     passed = (total_score / test.max_score * 100) >= 60 if test.max_score > 0 else False
     
@@ -541,7 +545,7 @@ async def get_test_results(
         maxScore=test.max_score,
         percentage=percentage,
         passed=percentage >= 60,
-        completedAt=test.completed_at or datetime.utcnow(),
+        completedAt=test.completed_at or datetime.now(timezone.utc),
         answers=[
             AnswerResponse(
                 questionId=a.question_id,
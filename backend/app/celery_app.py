@@ -43,6 +43,8 @@ celery_app.conf.task_routes = {
     "process_document": {"queue": "documents"},
     "delete_document_vectors": {"queue": "documents"},
     "delete_project_collection": {"queue": "documents"},
+    "delete_openai_file": {"queue": "documents"},
+    "cleanup_project_openai_resources": {"queue": "documents"},
     # Test tasks
     "generate_test_questions": {"queue": "tests"},
     "check_generation_status": {"queue": "tests"},
@@ -6,7 +6,7 @@ All sensitive values come from environment variables.
 """
 
 import os
-from typing import List, Optional, Union
+from typing import FrozenSet, List, Optional, Union
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
 import json
@@ -39,12 +39,29 @@ class Settings(BaseSettings):
     POSTGRES_USER: str = "postgres"
     POSTGRES_PASSWORD: str = "postgres"
     POSTGRES_DB: str = "ai_test_platform"
+    # Streaming replica for read-only endpoints; unset means use the primary
+    POSTGRES_REPLICA_SERVER: Optional[str] = None
+    POSTGRES_REPLICA_PORT: Optional[int] = None
+    
+    # API connection pool; DB_POOL_SIZE connections are opened at startup
+    DB_POOL_SIZE: int = 25
+    DB_MAX_OVERFLOW: int = 25
+    DB_POOL_RECYCLE: int = 1800  # seconds
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
     
     @property
     def DATABASE_URL(self) -> str:
         """Async PostgreSQL connection URL"""
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
     
+    @property
+    def DATABASE_REPLICA_URL(self) -> Optional[str]:
+        """Async URL of the read replica (same credentials), if one is configured"""
+        if not self.POSTGRES_REPLICA_SERVER:
+            return None
+        port = self.POSTGRES_REPLICA_PORT or self.POSTGRES_PORT
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_REPLICA_SERVER}:{port}/{self.POSTGRES_DB}"
+    
     @property
     def DATABASE_URL_SYNC(self) -> str:
         """Sync PostgreSQL connection URL (for Alembic)"""
@@ -70,7 +87,9 @@ class Settings(BaseSettings):
     # File Upload
     UPLOAD_DIR: str = "./uploads"
     MAX_UPLOAD_SIZE: int = 50 * 1024 * 1024  # 50 MB
-    ALLOWED_EXTENSIONS: List[str] = ["pdf", "docx", "doc", "txt", "pptx", "png", "jpg", "jpeg"]
+    ALLOWED_EXTENSIONS: FrozenSet[str] = frozenset(
+        {"pdf", "docx", "doc", "txt", "pptx", "png", "jpg", "jpeg"}
+    )
     
     # CORS - stored as string, parsed to list
     BACKEND_CORS_ORIGINS: Union[List[str], str] = "http://localhost:5173,http://localhost:3000"
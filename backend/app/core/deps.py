@@ -7,23 +7,101 @@ Reusable dependencies for:
 - Role-based access control
 """
 
-from typing import AsyncGenerator, Optional, TYPE_CHECKING
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, Optional, Tuple, TYPE_CHECKING
 from uuid import UUID
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Load, Session, load_only, make_transient_to_detached, object_session
+from sqlalchemy.sql.base import ExecutableOption
 
-from app.db.session import async_session_maker
-from app.core.security import verify_token
+from app.db.session import async_session_maker, replica_session_maker
+from app.core.exceptions import NotFoundException
+from app.core.security import verify_token, verify_token_async
+from app.models.user import User
 
 if TYPE_CHECKING:
-    from app.models.user import User
+    from app.models.project import Project
 
 
 # OAuth2 scheme for JWT token extraction from Authorization header
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# Column values of recently authenticated users, keyed by id, so most
+# requests skip the user SELECT. ORM updates in this process evict the
+# entry once they are committed; changes made by other processes show up
+# within the TTL (the same bound as the active-user cache of token refresh).
+USER_CACHE_TTL = 60
+_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=USER_CACHE_TTL)
+
+# Bumped on every eviction. A load stores its row only if no eviction
+# happened while it ran, so a SELECT that read the old row just before a
+# commit cannot put it back into the cache.
+_user_cache_generation = 0
+
+# (project_id, teacher_id) pairs recently confirmed as owned, for
+# endpoints that need nothing from the project but the ownership check.
+# Only positive answers are cached and a project never changes owner, so
+# the one stale case is a project deleted by another process within the
+# TTL: reading endpoints then find none of the project's rows, and
+# inserting ones hit the projects foreign key and must map the
+# IntegrityError to NotFoundException.
+PROJECT_OWNER_CACHE_TTL = 60
+_project_owner_cache: TTLCache = TTLCache(maxsize=10_000, ttl=PROJECT_OWNER_CACHE_TTL)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_user_changed(mapper, connection, target) -> None:
+    # Flushed but not yet committed: until the commit, other sessions
+    # still read the old row, so eviction waits for after_commit
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_changed_users(session: Session) -> None:
+    global _user_cache_generation
+    changed = session.info.pop("changed_user_ids", None)
+    if changed:
+        _user_cache_generation += 1
+        for user_id in changed:
+            _user_cache.pop(user_id, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session: Session) -> None:
+    session.info.pop("changed_user_ids", None)
+
+
+def _user_snapshot(user: User) -> Dict[str, Any]:
+    return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+
+async def _load_user(db: AsyncSession, user_id: UUID) -> Optional[User]:
+    """
+    The user with user_id as a persistent object of db.
+    
+    On a cache hit the User is rebuilt from the snapshot and merged into
+    the session without a query; it behaves like a loaded row (changes
+    are flushed as UPDATEs, which evict the snapshot on commit).
+    """
+    values = _user_cache.get(user_id)
+    if values is not None:
+        user = User(**values)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+    
+    generation = _user_cache_generation
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user is not None and generation == _user_cache_generation:
+        _user_cache[user_id] = _user_snapshot(user)
+    return user
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -37,6 +115,21 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_db_ro() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Read-only database session dependency, on the read replica if one
+    is configured.
+    
+    Only for endpoints that never write. Replica lag (normally well under
+    a second) means a row written just before may not be visible yet.
+    """
+    async with replica_session_maker() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
 async def get_current_user(
     db: AsyncSession = Depends(get_db),
     token: str = Depends(oauth2_scheme),
@@ -47,8 +140,6 @@ async def get_current_user(
     Raises:
         HTTPException 401: If token is invalid or user not found
     """
-    from app.models.user import User
-    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -56,7 +147,7 @@ async def get_current_user(
     )
     
     # Verify token
-    payload = verify_token(token, token_type="access")
+    payload = await verify_token_async(token, token_type="access")
     if payload is None:
         raise credentials_exception
     
@@ -66,8 +157,7 @@ async def get_current_user(
         user_id = UUID(payload.sub)
     except (ValueError, AttributeError):
         raise credentials_exception
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    user = await _load_user(db, user_id)
     
     if user is None:
         raise credentials_exception
@@ -125,6 +215,136 @@ async def get_current_student(
     return current_user
 
 
+async def get_current_teacher_project(
+    project_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+) -> Tuple["User", "Project"]:
+    """
+    Get the current teacher together with one of their projects.
+    
+    For frequently polled project endpoints: user, role, activity and
+    ownership are checked with a single joined query instead of one
+    query for the user and another for the project. When that query
+    finds nothing, the separate checks run to raise the usual error.
+    Only the project's id and allowed_students are loaded.
+    
+    Raises:
+        HTTPException 401/403: As get_current_teacher
+        NotFoundException: Project missing or owned by another teacher
+    """
+    from app.models.project import Project
+    
+    payload = await verify_token_async(token, token_type="access")
+    try:
+        user_id = UUID(payload.sub) if payload else None
+    except ValueError:
+        user_id = None
+    
+    if user_id is not None:
+        result = await db.execute(
+            select(User, Project)
+            .join(Project, Project.teacher_id == User.id)
+            .where(
+                User.id == user_id,
+                User.is_active.is_(True),
+                User.role == "teacher",
+                Project.id == project_id,
+            )
+            # Callers only read the allowed students; skip the project's
+            # selectin collections
+            .options(
+                load_only(Project.id, Project.allowed_students),
+                Load(Project).raiseload("*"),
+            )
+        )
+        row = result.first()
+        if row is not None:
+            return row.User, row.Project
+    
+    # Slow path: reproduce the specific error of the separate checks
+    await get_current_teacher(await get_current_user(db, token))
+    raise NotFoundException(resource="Project", resource_id=str(project_id))
+
+
+async def owns_project(db: AsyncSession, project_id: UUID, teacher_id: UUID) -> bool:
+    """Whether the project exists and belongs to the teacher (cached)."""
+    from app.models.project import Project
+    
+    key = (project_id, teacher_id)
+    if key in _project_owner_cache:
+        return True
+    
+    owned_id = await db.scalar(
+        select(Project.id).where(Project.id == project_id, Project.teacher_id == teacher_id)
+    )
+    if owned_id is None:
+        return False
+    _project_owner_cache[key] = True
+    return True
+
+
+def forget_project_owner(project_id: UUID, teacher_id: UUID) -> None:
+    """Drop a deleted project from the ownership cache."""
+    _project_owner_cache.pop((project_id, teacher_id), None)
+
+
+async def get_owned_project_id(
+    project_id: UUID,
+    current_user: User = Depends(get_current_teacher),
+    db: AsyncSession = Depends(get_db),
+) -> UUID:
+    """
+    The path's project_id, once checked to be the current teacher's.
+    
+    For endpoints that only touch the project's child rows; repeated
+    calls within the cache TTL skip the ownership query.
+    
+    Raises:
+        HTTPException 401/403: As get_current_teacher
+        NotFoundException: Project missing or owned by another teacher
+    """
+    if not await owns_project(db, project_id, current_user.id):
+        raise NotFoundException(resource="Project", resource_id=str(project_id))
+    return project_id
+
+
+def owned_project(
+    *options: ExecutableOption, read_only: bool = False
+) -> Callable[..., Awaitable["Project"]]:
+    """
+    Dependency factory: the current teacher's project for the path's
+    project_id, loaded with the given loader options.
+    
+    Each endpoint states what it needs from the project through options
+    (eager loads, raiseload); ownership is part of the same query.
+    read_only endpoints load it through get_db_ro.
+    
+    Raises:
+        HTTPException 401/403: As get_current_teacher
+        NotFoundException: Project missing or owned by another teacher
+    """
+    async def load_owned_project(
+        project_id: UUID,
+        current_user: User = Depends(get_current_teacher),
+        db: AsyncSession = Depends(get_db_ro if read_only else get_db),
+    ) -> "Project":
+        from app.models.project import Project
+        
+        result = await db.execute(
+            select(Project)
+            .where(Project.id == project_id, Project.teacher_id == current_user.id)
+            .options(*options)
+        )
+        project = result.scalar_one_or_none()
+        if project is None:
+            raise NotFoundException(resource="Project", resource_id=str(project_id))
+        _project_owner_cache[(project_id, current_user.id)] = True
+        return project
+    
+    return load_owned_project
+
+
 def get_optional_user(
     token: Optional[str] = Depends(oauth2_scheme),
 ) -> Optional[str]:
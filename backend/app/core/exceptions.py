@@ -9,7 +9,7 @@ sensitive information in production.
 import traceback
 import logging
 from typing import Any, Dict, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from uuid import uuid4
 
 from fastapi import Request, HTTPException
@@ -154,7 +154,7 @@ def create_error_response(
             "code": code,
             "message": message,
             "status": status_code,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
         }
     }
     
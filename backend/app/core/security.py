@@ -5,8 +5,14 @@ JWT token generation and verification.
 Password hashing with bcrypt.
 """
 
-from datetime import datetime, timedelta
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from hashlib import blake2b
 from typing import Optional, Union
+from cachetools import TTLCache
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from pydantic import BaseModel
@@ -17,6 +23,21 @@ from app.core.config import settings
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is deliberately slow CPU work; async handlers run it here so it
+# neither blocks the event loop nor occupies the default executor
+_password_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1,
+    thread_name_prefix="password-hash",
+)
+
+# Recently verified tokens, keyed by a digest of the token. Clients reuse
+# the same access token for every request of its lifetime, so most
+# requests skip signature verification. Entries never outlive the token's
+# own exp (checked on every hit). The lock guards against verify_token
+# running in worker threads.
+_verified_tokens: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_verified_tokens_lock = threading.Lock()
+
 
 class TokenPayload(BaseModel):
     """JWT token payload structure"""
@@ -37,9 +58,9 @@ def create_access_token(subject: Union[str, int], expires_delta: Optional[timede
         Encoded JWT token string
     """
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = datetime.now(timezone.utc) + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode = {
         "sub": str(subject),
@@ -60,7 +81,7 @@ def create_refresh_token(subject: Union[str, int]) -> str:
     Returns:
         Encoded JWT refresh token string
     """
-    expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    expire = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     
     to_encode = {
         "sub": str(subject),
@@ -71,6 +92,25 @@ def create_refresh_token(subject: Union[str, int]) -> str:
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
+def _token_cache_key(token: str) -> bytes:
+    return blake2b(token.encode(), digest_size=16).digest()
+
+
+def _cached_token_payload(token: str) -> Optional[TokenPayload]:
+    """Return the payload of a recently verified, unexpired token, if cached."""
+    with _verified_tokens_lock:
+        payload = _verified_tokens.get(_token_cache_key(token))
+    if payload is None or payload.exp <= datetime.now(timezone.utc):
+        return None
+    return payload
+
+
+def _check_token_type(payload: Optional[TokenPayload], token_type: str) -> Optional[TokenPayload]:
+    if payload is None or payload.type != token_type:
+        return None
+    return payload
+
+
 def verify_token(token: str, token_type: str = "access") -> Optional[TokenPayload]:
     """
     Verify and decode JWT token.
@@ -82,15 +122,34 @@ def verify_token(token: str, token_type: str = "access") -> Optional[TokenPayloa
     Returns:
         TokenPayload if valid, None otherwise
     """
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        
-        if payload.get("type") != token_type:
+    payload = _cached_token_payload(token)
+    if payload is None:
+        try:
+            payload = TokenPayload(
+                **jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            )
+        except (JWTError, ValueError):
             return None
-            
-        return TokenPayload(**payload)
-    except JWTError:
-        return None
+        with _verified_tokens_lock:
+            _verified_tokens[_token_cache_key(token)] = payload
+    
+    return _check_token_type(payload, token_type)
+
+
+async def verify_token_async(token: str, token_type: str = "access") -> Optional[TokenPayload]:
+    """
+    Async variant of verify_token for request handlers.
+    
+    Cached and HMAC (HS*) verifications take microseconds, less than a
+    thread hand-off, so they run inline; public-key signatures (RS*/ES*/PS*)
+    are verified in a worker thread to keep the event loop free.
+    """
+    if settings.ALGORITHM.startswith("HS"):
+        return verify_token(token, token_type)
+    cached = _cached_token_payload(token)
+    if cached is not None:
+        return _check_token_type(cached, token_type)
+    return await asyncio.to_thread(verify_token, token, token_type)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -118,3 +177,17 @@ def get_password_hash(password: str) -> str:
         Bcrypt hashed password
     """
     return pwd_context.hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Async variant of verify_password for request handlers."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_executor, verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Async variant of get_password_hash for request handlers."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, get_password_hash, password)
@@ -4,8 +4,13 @@ SQLAlchemy Base Model
 All models inherit from this base class.
 """
 
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import MetaData
+from sqlalchemy import DDL, Index, MetaData, Table, event
 
 # Naming convention for constraints (useful for Alembic migrations)
 convention = {
@@ -20,3 +25,79 @@ convention = {
 class Base(DeclarativeBase):
     """Base class for all SQLAlchemy models"""
     metadata = MetaData(naming_convention=convention)
+
+
+# Trigram operator classes used by the search indexes (same extension as
+# migration 025)
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+def trigram_index(name: str, column: str) -> Index:
+    """GIN trigram index serving ILIKE '%term%' searches on column"""
+    return Index(
+        name,
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: "gin_trgm_ops"},
+    )
+
+
+# Trigger function keeping updated_at current on every UPDATE, so the
+# application never has to set it (same function as migration 018)
+UPDATED_AT_FUNCTION = DDL(
+    "CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$ "
+    "BEGIN NEW.updated_at = now(); RETURN NEW; END; "
+    "$$ LANGUAGE plpgsql"
+).execute_if(dialect="postgresql")
+
+UPDATED_AT_TRIGGER = DDL(
+    "CREATE TRIGGER trg_%(table)s_updated_at BEFORE UPDATE ON %(table)s "
+    "FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+).execute_if(dialect="postgresql")
+
+
+def maintain_updated_at(table: Table) -> None:
+    """Install the updated_at trigger when the table is created on PostgreSQL"""
+    event.listen(table, "after_create", UPDATED_AT_FUNCTION)
+    event.listen(table, "after_create", UPDATED_AT_TRIGGER)
+
+
+def reserve_page_space(table: Table, fillfactor: int = 70) -> None:
+    """
+    Leave free space on each heap page of a frequently updated table.
+
+    Updates that do not touch an indexed column can then be written to
+    the same page as HOT updates, without new index entries (same
+    setting as migration 021).
+    """
+    event.listen(
+        table,
+        "after_create",
+        DDL(f"ALTER TABLE %(table)s SET (fillfactor = {fillfactor})").execute_if(
+            dialect="postgresql"
+        ),
+    )
+
+
+def utcnow() -> datetime:
+    """Current time as an aware UTC datetime (default for TIMESTAMPTZ columns)"""
+    return datetime.now(timezone.utc)
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Time-ordered UUID (RFC 9562 version 7).
+
+    The leading 48 bits are the Unix time in milliseconds, so keys from
+    high-insert tables land on the right-most B-tree leaf instead of a
+    random page of the primary key index.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | (0x7 << 76)  # version 7
+    value = value & ~(0x3 << 62) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
@@ -5,6 +5,11 @@ Async SQLAlchemy session factory for PostgreSQL.
 Sync session factory for Celery tasks.
 """
 
+import asyncio
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import Executable
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy import create_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker, Session
@@ -17,8 +22,10 @@ engine = create_async_engine(
     settings.DATABASE_URL,
     echo=False,  # Set to True for SQL logging in development
     future=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
     pool_pre_ping=True,
 )
 
@@ -31,6 +38,31 @@ async_session_maker = async_sessionmaker(
     autoflush=False,
 )
 
+# Read replica for read-only endpoints (see get_db_ro); without one the
+# replica session factory simply uses the primary engine
+replica_engine = (
+    create_async_engine(
+        settings.DATABASE_REPLICA_URL,
+        echo=False,
+        future=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=True,
+    )
+    if settings.DATABASE_REPLICA_URL
+    else engine
+)
+
+replica_session_maker = async_sessionmaker(
+    replica_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
 
 # Create sync engine for Celery tasks
 sync_engine = create_engine(
@@ -55,3 +87,75 @@ async def get_async_session() -> AsyncSession:
     """Get async database session"""
     async with async_session_maker() as session:
         yield session
+
+
+async def warm_up_pool(size: int = settings.DB_POOL_SIZE) -> None:
+    """
+    Open size pooled connections up front.
+    
+    Connections are otherwise created on first use, so the first requests
+    after a start pay the connect and auth handshake. All connections are
+    held at once (one at a time would reuse the same one), then returned
+    to the pool. Connection errors are ignored here so they do not abort
+    startup; they surface again on the first real query.
+    """
+    connections = await asyncio.gather(
+        *(engine.connect().start() for _ in range(size)),
+        return_exceptions=True,
+    )
+    await asyncio.gather(
+        *(conn.close() for conn in connections if not isinstance(conn, BaseException))
+    )
+
+
+# Extra pooled connections run_concurrently may hold at once across the
+# process; requests' own sessions keep the rest of the pool
+CONCURRENT_QUERY_CONNECTIONS = max(1, settings.DB_POOL_SIZE // 5)
+_concurrent_query_slots = asyncio.Semaphore(CONCURRENT_QUERY_CONNECTIONS)
+
+
+async def run_concurrently(db: AsyncSession, *statements: Executable) -> List[Sequence[Row[Any]]]:
+    """
+    Execute independent read-only statements concurrently.
+    
+    One session cannot run statements in parallel: the first statement
+    runs on db itself and each other one on a short-lived session of the
+    same engine, while one of the process-wide CONCURRENT_QUERY_CONNECTIONS
+    slots is free. Statements that find no free slot run on db after the
+    first, so a burst of callers never waits on the pool for extra
+    connections. Returns the rows of each statement, in order.
+    SQLite allows only one statement per connection at a time, so there
+    the statements simply run one after another on db.
+    """
+    if db.bind.dialect.name == "sqlite":
+        return [(await db.execute(statement)).all() for statement in statements]
+    
+    async def fetch_on_own_connection(statement: Executable) -> Sequence[Row[Any]]:
+        async with AsyncSession(db.bind) as session:
+            return (await session.execute(statement)).all()
+    
+    first, *rest = statements
+    tasks: List[Optional[asyncio.Task]] = []
+    for statement in rest:
+        if _concurrent_query_slots.locked():
+            tasks.append(None)
+        else:
+            await _concurrent_query_slots.acquire()  # free, so no wait
+            task = asyncio.create_task(fetch_on_own_connection(statement))
+            # Released when the task ends, even if cancelled before it ran
+            task.add_done_callback(lambda _: _concurrent_query_slots.release())
+            tasks.append(task)
+    
+    try:
+        results = [(await db.execute(first)).all()]
+        for statement, task in zip(rest, tasks):
+            if task is None:
+                results.append((await db.execute(statement)).all())
+            else:
+                results.append(await task)
+    except BaseException:
+        for task in tasks:
+            if task is not None:
+                task.cancel()
+        raise
+    return results
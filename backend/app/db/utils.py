@@ -0,0 +1,87 @@
+"""
+Query Helpers
+
+Small SQL constructs shared by the endpoints.
+"""
+
+import base64
+from typing import Any, Iterable, List
+
+import orjson
+from sqlalchemy import ARRAY, Boolean, bindparam
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.visitors import InternalTraversal
+
+
+class InValues(ColumnElement[bool]):
+    """
+    ``column IN (values)`` bound as a single array parameter on PostgreSQL.
+
+    A plain ``in_()`` with a Python list expands into one placeholder per
+    value, so every list length is a different statement for asyncpg to
+    prepare and cache. On PostgreSQL this renders ``column = ANY(:values)``
+    instead, one statement whatever the length; other dialects (SQLite in
+    tests) keep the regular expanding IN.
+    """
+
+    inherit_cache = True
+    type = Boolean()
+
+    _traverse_internals = [
+        ("column", InternalTraversal.dp_clauseelement),
+        ("array_values", InternalTraversal.dp_clauseelement),
+        ("list_values", InternalTraversal.dp_clauseelement),
+    ]
+
+    def __init__(self, column: ColumnElement[Any], values: Iterable[Any]):
+        values = list(values)
+        self.column = column
+        self.array_values = bindparam(None, values, type_=ARRAY(column.type))
+        self.list_values = bindparam(None, values, type_=column.type, expanding=True)
+
+
+@compiles(InValues)
+def _compile_in_values(element: InValues, compiler, **kw) -> str:
+    return compiler.process(element.column.in_(element.list_values), **kw)
+
+
+@compiles(InValues, "postgresql")
+def _compile_in_values_postgresql(element: InValues, compiler, **kw) -> str:
+    column = compiler.process(element.column, **kw)
+    values = compiler.process(element.array_values, **kw)
+    return f"{column} = ANY({values})"
+
+
+def escape_like(value: str) -> str:
+    """
+    Escape LIKE wildcards in user input so it matches literally.
+    
+    Use with ``escape="\\"``, e.g.
+    ``column.ilike(f"%{escape_like(search)}%", escape="\\")``.
+    """
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque keyset-pagination cursor holding the sort key of the last item."""
+    return base64.urlsafe_b64encode(orjson.dumps(values)).decode()
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    Sort key values of a cursor made by encode_cursor, as JSON values
+    (datetimes and UUIDs come back as strings).
+
+    Raises:
+        ValueError: The cursor is malformed.
+    """
+    values = orjson.loads(base64.urlsafe_b64decode(cursor))
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def in_values(column: ColumnElement[Any], values: Iterable[Any]) -> InValues:
+    """Filter column to the given values (see InValues)."""
+    return InValues(column, values)
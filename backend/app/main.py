@@ -12,6 +12,7 @@ from contextlib import asynccontextmanager
 import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 import os
 
@@ -19,8 +20,9 @@ from app.core.config import settings
 from app.core.exceptions import register_exception_handlers
 from app.core.middleware import RequestLoggingMiddleware, RequestContextMiddleware
 from app.api.v1.router import api_router
-from app.db.session import engine
+from app.db.session import engine, replica_engine, warm_up_pool
 from app.db.base import Base
+from app.services import file_storage
 
 # Configure logging
 logging.basicConfig(
@@ -41,13 +43,16 @@ async def lifespan(app: FastAPI):
     
     # Create upload directories
     os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-    os.makedirs(os.path.join(settings.UPLOAD_DIR, "materials"), exist_ok=True)
+    os.makedirs(file_storage.MATERIALS_DIR, exist_ok=True)
+    os.makedirs(file_storage.MATERIALS_TMP_DIR, exist_ok=True)
     
     # Create database tables (in production, use Alembic migrations)
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     
     print("✅ Database tables created")
+    
+    await warm_up_pool()
     print(f"📁 Upload directory: {settings.UPLOAD_DIR}")
     print("️ Exception handlers registered")
     
@@ -56,6 +61,8 @@ async def lifespan(app: FastAPI):
     # Shutdown
     print("👋 Shutting down AI Test Platform API...")
     await engine.dispose()
+    if replica_engine is not engine:
+        await replica_engine.dispose()
 
 
 # Create FastAPI application
@@ -67,6 +74,7 @@ app = FastAPI(
     docs_url=f"{settings.API_V1_STR}/docs",
     redoc_url=f"{settings.API_V1_STR}/redoc",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # orjson for every JSON response
 )
 
 # CORS middleware configuration
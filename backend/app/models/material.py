@@ -7,11 +7,11 @@ Database models for educational materials (files) and folders.
 import uuid
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, DateTime, ForeignKey, Text, Integer, Table, Column
+from sqlalchemy import String, DateTime, ForeignKey, Text, Integer, Table, Column, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
-from app.db.base import Base
+from app.db.base import Base, trigram_index, utcnow
 
 
 # Many-to-many association table: projects <-> materials
@@ -21,7 +21,7 @@ project_materials = Table(
     Column("project_id", UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True),
     Column("material_id", UUID(as_uuid=True), ForeignKey("materials.id", ondelete="CASCADE"), primary_key=True),
     Column("is_vectorized", Integer, default=0),  # 0 = pending, 1 = processing, 2 = done, -1 = error
-    Column("created_at", DateTime, default=datetime.utcnow),
+    Column("created_at", DateTime(timezone=True), default=utcnow),
 )
 
 
@@ -44,8 +44,8 @@ class MaterialFolder(Base):
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.utcnow,
+        DateTime(timezone=True),
+        default=utcnow,
         nullable=False,
     )
     
@@ -70,6 +70,19 @@ class Material(Base):
     """Educational material file"""
     
     __tablename__ = "materials"
+    __table_args__ = (
+        # Material list order and keyset pagination (scanned backwards)
+        Index("ix_materials_teacher_uploaded", "teacher_id", "uploaded_at", "id"),
+        trigram_index("ix_materials_original_name_trgm", "original_name"),
+        # A teacher stores each distinct file once
+        Index(
+            "ix_materials_teacher_content_hash",
+            "teacher_id",
+            "content_hash",
+            unique=True,
+            postgresql_where=text("content_hash IS NOT NULL"),
+        ),
+    )
     
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -86,7 +99,6 @@ class Material(Base):
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     
     # File info
@@ -95,14 +107,16 @@ class Material(Base):
     file_type: Mapped[str] = mapped_column(String(50), nullable=False)  # pdf, docx, txt, etc.
     file_path: Mapped[str] = mapped_column(String(500), nullable=False)
     file_size: Mapped[int] = mapped_column(Integer, default=0)  # bytes
+    # SHA-256 hex digest of the file (NULL for files uploaded before hashing)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     
     # OpenAI File ID - file is stored in OpenAI, not locally
     openai_file_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     
     # Timestamps
     uploaded_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.utcnow,
+        DateTime(timezone=True),
+        default=utcnow,
         nullable=False,
     )
     
@@ -7,11 +7,11 @@ Database models for students/participants and groups.
 import uuid
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, DateTime, ForeignKey, Text
+from sqlalchemy import String, DateTime, ForeignKey, Text, Index, Enum, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
-from app.db.base import Base
+from app.db.base import Base, reserve_page_space, trigram_index, utcnow
 
 
 class ParticipantGroup(Base):
@@ -33,8 +33,8 @@ class ParticipantGroup(Base):
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.utcnow,
+        DateTime(timezone=True),
+        default=utcnow,
         nullable=False,
     )
     
@@ -59,6 +59,21 @@ class Participant(Base):
     """Individual participant/student added by teacher"""
     
     __tablename__ = "participants"
+    __table_args__ = (
+        # Pending invitations are the only status-driven lookup
+        Index(
+            "ix_participants_confirmation_pending",
+            "confirmation_status",
+            postgresql_where=text("confirmation_status = 'pending'"),
+        ),
+        # Duplicate checks and roster lookups by teacher and email; also
+        # serves teacher_id-only filters
+        Index("ix_participants_teacher_email", "teacher_id", "email"),
+        # Teacher-side search (ILIKE '%term%')
+        trigram_index("ix_participants_email_trgm", "email"),
+        trigram_index("ix_participants_first_name_trgm", "first_name"),
+        trigram_index("ix_participants_last_name_trgm", "last_name"),
+    )
     
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -69,7 +84,6 @@ class Participant(Base):
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     group_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True),
@@ -86,29 +100,35 @@ class Participant(Base):
     )
     
     # Participant info
-    email: Mapped[str] = mapped_column(String(255), nullable=False)
+    email: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     first_name: Mapped[str] = mapped_column(String(100), nullable=False)
     last_name: Mapped[str] = mapped_column(String(100), nullable=False)
     
     # Type: individual or group-member
     participant_type: Mapped[str] = mapped_column(
-        String(20),
+        Enum("individual", "group-member", name="participant_type"),
         default="individual",
         nullable=False,
     )
     
-    # Confirmation status: pending, confirmed, rejected
+    # Confirmation status: pending, confirmed, rejected, contact_requested
     # When teacher adds student, status starts as 'pending'
     # Student must confirm to be 'confirmed'
     confirmation_status: Mapped[str] = mapped_column(
-        String(20),
+        Enum(
+            "pending",
+            "confirmed",
+            "rejected",
+            "contact_requested",
+            name="confirmation_status",
+        ),
         default="pending",
         nullable=False,
     )
     
     created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.utcnow,
+        DateTime(timezone=True),
+        default=utcnow,
         nullable=False,
     )
     
@@ -119,3 +139,6 @@ class Participant(Base):
     
     def __repr__(self) -> str:
         return f"<Participant {self.email}>"
+
+
+reserve_page_space(Participant.__table__)
@@ -8,17 +8,43 @@ Includes settings for test generation.
 import uuid
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import String, Integer, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import String, Integer, DateTime, ForeignKey, Text, JSON, Index, Enum, FetchedValue, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 
-from app.db.base import Base
+from app.db.base import Base, maintain_updated_at, utcnow
 
 
 class Project(Base):
     """Project/Test model - represents a test created by teacher"""
     
     __tablename__ = "projects"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Keyset pagination of project lists; dashboards are served index-only
+        Index(
+            "ix_projects_teacher_created",
+            "teacher_id",
+            "created_at",
+            "id",
+            postgresql_include=["status", "title"],
+        ),
+        # Index-only ownership checks (id of the teacher's project)
+        Index("ix_projects_teacher_id_id", "teacher_id", "id"),
+        # Students only ever look up open projects by status
+        Index(
+            "ix_projects_status_open",
+            "status",
+            postgresql_where=text("status IN ('ready', 'active')"),
+        ),
+        # Containment lookups (allowed_students @> '["email"]') by student
+        Index(
+            "ix_projects_allowed_students_gin",
+            "allowed_students",
+            postgresql_using="gin",
+            postgresql_ops={"allowed_students": "jsonb_path_ops"},
+        ),
+    )
     
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -29,15 +55,23 @@ class Project(Base):
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     group_name: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     
-    # Status: draft, vectorizing, ready, active, completed
+    # Status: draft, vectorizing, ready, generating, active, completed, error
     status: Mapped[str] = mapped_column(
-        String(20),
+        Enum(
+            "draft",
+            "vectorizing",
+            "ready",
+            "generating",
+            "active",
+            "completed",
+            "error",
+            name="project_status",
+        ),
         default="draft",
         nullable=False,
     )
@@ -49,6 +83,11 @@ class Project(Base):
         nullable=False,
     )
     vectorization_progress: Mapped[int] = mapped_column(Integer, default=0)  # 0-100%
+    # Materials indexed in the current run; kept by the worker so status
+    # polls need no COUNT over project_materials
+    materials_processed: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
     vectorization_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     # OpenAI Vector Store ID for this project's vectors
@@ -59,7 +98,10 @@ class Project(Base):
     openai_assistant_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     
     # Test settings
-    timer_mode: Mapped[str] = mapped_column(String(20), default="total")  # 'total' or 'per_question'
+    timer_mode: Mapped[str] = mapped_column(
+        Enum("total", "per_question", name="timer_mode"),
+        default="total",
+    )  # 'total' or 'per_question'
     total_time: Mapped[int] = mapped_column(Integer, default=60)  # minutes (used when timer_mode='total')
     time_per_question: Mapped[int] = mapped_column(Integer, default=60)  # seconds (used when timer_mode='per_question')
     max_students: Mapped[int] = mapped_column(Integer, default=30)
@@ -67,22 +109,25 @@ class Project(Base):
     test_language: Mapped[str] = mapped_column(String(10), default="en")  # Language for generated questions
     
     # Scheduling
-    start_time: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
-    end_time: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    start_time: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    end_time: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     
     # Allowed students (email list as JSON)
-    allowed_students: Mapped[Optional[List[str]]] = mapped_column(JSON, nullable=True)
+    allowed_students: Mapped[Optional[List[str]]] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"), nullable=True
+    )
     
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.utcnow,
+        DateTime(timezone=True),
+        default=utcnow,
         nullable=False,
     )
+    # Bumped by the set_updated_at trigger; read back via RETURNING
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow,
+        DateTime(timezone=True),
+        default=utcnow,
+        server_onupdate=FetchedValue(),
         nullable=False,
     )
     
@@ -117,6 +162,9 @@ class Project(Base):
         return f"<Project {self.title} ({self.status})>"
 
 
+maintain_updated_at(Project.__table__)
+
+
 class QuestionTypeConfig(Base):
     """Configuration for question types in a project"""
     
@@ -10,7 +10,7 @@ from sqlalchemy import String, Boolean, DateTime, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
-from app.db.base import Base
+from app.db.base import Base, utcnow
 
 
 class StudentEmail(Base):
@@ -29,12 +29,13 @@ class StudentEmail(Base):
         nullable=False,
         index=True,
     )
-    email: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    # One account per additional email, system-wide
+    email: Mapped[str] = mapped_column(String(255), nullable=False, unique=True, index=True)
     institution: Mapped[str] = mapped_column(String(255), nullable=True)
     is_primary: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.utcnow,
+        DateTime(timezone=True),
+        default=utcnow,
         nullable=False,
     )
     
@@ -8,28 +8,45 @@ Supports multiple question types.
 import uuid
 from datetime import datetime
 from typing import Optional, List, Any, Dict
-from sqlalchemy import String, Integer, DateTime, ForeignKey, Text, Boolean, Float, JSON
+from sqlalchemy import String, Integer, DateTime, ForeignKey, Text, Boolean, Float, JSON, Index, Enum, Computed, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 
-from app.db.base import Base
+from app.db.base import Base, reserve_page_space, utcnow, uuid7
 
 
 class Test(Base):
     """Student test attempt"""
     
     __tablename__ = "tests"
+    __table_args__ = (
+        # Per-project result lists and teacher analytics are served index-only
+        Index(
+            "ix_tests_project_status_completed",
+            "project_id",
+            "status",
+            "completed_at",
+            postgresql_include=["student_id", "score_pct", "created_at"],
+        ),
+        # Only unfinished attempts are looked up by status
+        Index(
+            "ix_tests_status_active",
+            "status",
+            postgresql_where=text("status IN ('pending', 'in-progress')"),
+        ),
+        # Time-window scans over the whole history
+        Index("ix_tests_completed_at_brin", "completed_at", postgresql_using="brin"),
+    )
     
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
     )
     project_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("projects.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     student_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True),
@@ -40,7 +57,7 @@ class Test(Base):
     
     # Test state
     status: Mapped[str] = mapped_column(
-        String(20),
+        Enum("pending", "in-progress", "completed", "graded", name="test_status"),
         default="pending",
         nullable=False,
     )  # pending, in-progress, completed, graded
@@ -55,13 +72,20 @@ class Test(Base):
     # Scoring
     score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     max_score: Mapped[float] = mapped_column(Float, default=100.0)
+    # Percentage of max_score, maintained by the database; NULL when
+    # unscored or max_score is 0
+    score_pct: Mapped[Optional[float]] = mapped_column(
+        Float,
+        Computed("CASE WHEN max_score > 0 THEN score * 100.0 / max_score END", persisted=True),
+        nullable=True,
+    )
     
     # Timestamps
-    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
-    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.utcnow,
+        DateTime(timezone=True),
+        default=utcnow,
         nullable=False,
     )
     
@@ -79,6 +103,9 @@ class Test(Base):
         return f"<Test {self.id} ({self.status})>"
 
 
+reserve_page_space(Test.__table__)
+
+
 class Question(Base):
     """
     Generated question for a project.
@@ -87,11 +114,15 @@ class Question(Base):
     """
     
     __tablename__ = "questions"
+    __table_args__ = (
+        # Covers project-scoped lookups with and without a variant filter
+        Index("ix_questions_project_variant", "project_id", "variant_number"),
+    )
     
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
     )
     project_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -108,7 +139,7 @@ class Question(Base):
     
     # Variant number (for generating multiple unique test variants)
     # Each variant has the same structure but different questions
-    variant_number: Mapped[int] = mapped_column(Integer, default=1, index=True)
+    variant_number: Mapped[int] = mapped_column(Integer, default=1)
     
     # Question content
     text: Mapped[str] = mapped_column(Text, nullable=False)
@@ -140,8 +171,8 @@ class Question(Base):
     
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.utcnow,
+        DateTime(timezone=True),
+        default=utcnow,
         nullable=False,
     )
     
@@ -162,17 +193,24 @@ class Answer(Base):
     """Student answer to a question"""
     
     __tablename__ = "answers"
+    __table_args__ = (
+        # Per-test answer summaries are served index-only
+        Index(
+            "ix_answers_test_id",
+            "test_id",
+            postgresql_include=["question_id", "is_correct", "score"],
+        ),
+    )
     
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
     )
     test_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("tests.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     question_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -191,19 +229,30 @@ class Answer(Base):
     
     # AI Grading details (for essay/short-answer)
     ai_grading_details: Mapped[Optional[Dict[str, Any]]] = mapped_column(
-        JSON, nullable=True
+        JSON().with_variant(JSONB(), "postgresql"), nullable=True
     )
     graded_by: Mapped[Optional[str]] = mapped_column(
-        String(50), nullable=True, default="pending"
-    )  # ai, manual, system, pending_manual_review
+        Enum(
+            "pending",
+            "ai",
+            "manual",
+            "system",
+            "pending_manual_review",
+            name="graded_by",
+        ),
+        nullable=True,
+        default="pending",
+    )
     grading_status: Mapped[Optional[str]] = mapped_column(
-        String(20), nullable=True, default="pending"
-    )  # pending, in_progress, completed, failed
+        Enum("pending", "in_progress", "completed", "failed", name="grading_status"),
+        nullable=True,
+        default="pending",
+    )
     
     # Timestamps
     answered_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.utcnow,
+        DateTime(timezone=True),
+        default=utcnow,
         nullable=False,
     )
     
@@ -213,3 +262,6 @@ class Answer(Base):
     
     def __repr__(self) -> str:
         return f"<Answer {self.id} (correct: {self.is_correct})>"
+
+
+reserve_page_space(Answer.__table__)
@@ -6,17 +6,18 @@ Database model for users (teachers and students).
 
 import uuid
 from datetime import datetime
-from sqlalchemy import String, Boolean, DateTime, Enum
+from sqlalchemy import String, Boolean, DateTime, Enum, FetchedValue
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
-from app.db.base import Base
+from app.db.base import Base, maintain_updated_at, utcnow
 
 
 class User(Base):
     """User model for authentication and authorization"""
     
     __tablename__ = "users"
+    __mapper_args__ = {"eager_defaults": True}
     
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -33,21 +34,22 @@ class User(Base):
     first_name: Mapped[str] = mapped_column(String(100), nullable=False)
     last_name: Mapped[str] = mapped_column(String(100), nullable=False)
     role: Mapped[str] = mapped_column(
-        String(20),
+        Enum("teacher", "student", name="user_role"),
         nullable=False,
         default="student",
     )  # "teacher" or "student"
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     is_verified: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.utcnow,
+        DateTime(timezone=True),
+        default=utcnow,
         nullable=False,
     )
+    # Bumped by the set_updated_at trigger; read back via RETURNING
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow,
+        DateTime(timezone=True),
+        default=utcnow,
+        server_onupdate=FetchedValue(),
         nullable=False,
     )
     
@@ -61,3 +63,6 @@ class User(Base):
     
     def __repr__(self) -> str:
         return f"<User {self.email} ({self.role})>"
+
+
+maintain_updated_at(User.__table__)
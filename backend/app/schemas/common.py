@@ -4,11 +4,24 @@ Common Schemas
 Shared schemas for pagination, errors, etc.
 """
 
-from typing import Generic, TypeVar, List, Optional
-from pydantic import BaseModel
+from datetime import datetime, timezone
+from typing import Annotated, Generic, TypeVar, List, Optional
+from pydantic import AfterValidator, BaseModel, EmailStr
 
 T = TypeVar("T")
 
+# Emails are stored lowercased; normalizing at parse time lets queries
+# compare the column directly (plain B-tree lookups, no lower())
+NormalizedEmail = Annotated[EmailStr, AfterValidator(str.lower)]
+
+
+def _assume_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+# For TIMESTAMPTZ columns: naive values from the client are taken as UTC
+UtcDatetime = Annotated[datetime, AfterValidator(_assume_utc)]
+
 
 class PaginatedResponse(BaseModel, Generic[T]):
     """Generic paginated response"""
@@ -71,6 +71,11 @@ class MaterialListResponse(BaseModel):
     page: int
     size: int
     pages: int
+    # Pass as ?cursor= to fetch the following page; None on the last page
+    next_cursor: Optional[str] = Field(None, alias="nextCursor")
+    
+    class Config:
+        populate_by_name = True
 
 
 class MaterialUploadResponse(BaseModel):
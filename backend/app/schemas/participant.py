@@ -7,7 +7,9 @@ Pydantic schemas for participants and groups.
 from datetime import datetime
 from typing import Optional, List, Literal
 from uuid import UUID
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, Field
+
+from app.schemas.common import NormalizedEmail
 
 
 # ============== Group Schemas ==============
@@ -45,7 +47,7 @@ class ParticipantGroupResponse(ParticipantGroupBase):
 
 class ParticipantBase(BaseModel):
     """Base participant schema"""
-    email: EmailStr
+    email: NormalizedEmail
     first_name: str = Field(..., alias="firstName", min_length=1, max_length=100)
     last_name: str = Field(..., alias="lastName", min_length=1, max_length=100)
     
@@ -63,7 +65,7 @@ class ParticipantCreate(ParticipantBase):
 
 class ParticipantUpdate(BaseModel):
     """Schema for updating participant"""
-    email: Optional[EmailStr] = None
+    email: Optional[NormalizedEmail] = None
     first_name: Optional[str] = Field(None, alias="firstName", min_length=1, max_length=100)
     last_name: Optional[str] = Field(None, alias="lastName", min_length=1, max_length=100)
     group_id: Optional[UUID] = Field(None, alias="groupId")
@@ -93,6 +95,11 @@ class ParticipantListResponse(BaseModel):
     page: int
     size: int
     pages: int
+    # Pass as ?cursor= to fetch the following page; None on the last page
+    next_cursor: Optional[str] = Field(None, alias="nextCursor")
+    
+    class Config:
+        populate_by_name = True
 
 
 # ============== Student lookup schemas ==============
@@ -9,6 +9,8 @@ from typing import Optional, List
 from uuid import UUID
 from pydantic import BaseModel, Field
 
+from app.schemas.common import NormalizedEmail, UtcDatetime
+
 
 # ============== Question Type Config ==============
 
@@ -101,8 +103,8 @@ class ProjectAddMaterials(BaseModel):
 class ProjectConfigureSettings(BaseModel):
     """Schema for configuring project settings - Step 4 (after vectorization)"""
     settings: ProjectSettingsBase
-    start_time: Optional[datetime] = Field(None, alias="startTime")
-    end_time: Optional[datetime] = Field(None, alias="endTime")
+    start_time: Optional[UtcDatetime] = Field(None, alias="startTime")
+    end_time: Optional[UtcDatetime] = Field(None, alias="endTime")
     
     class Config:
         populate_by_name = True
@@ -114,8 +116,8 @@ class ProjectUpdate(BaseModel):
     description: Optional[str] = None
     group_name: Optional[str] = Field(None, alias="groupName", max_length=100)
     status: Optional[str] = Field(None, pattern="^(draft|vectorizing|ready|active|completed)$")
-    start_time: Optional[datetime] = Field(None, alias="startTime")
-    end_time: Optional[datetime] = Field(None, alias="endTime")
+    start_time: Optional[UtcDatetime] = Field(None, alias="startTime")
+    end_time: Optional[UtcDatetime] = Field(None, alias="endTime")
     settings: Optional[ProjectSettingsBase] = None
     
     class Config:
@@ -169,14 +171,28 @@ class ProjectResponse(ProjectBase):
 class ProjectListResponse(BaseModel):
     """Paginated project list response"""
     items: List[ProjectResponse]
-    total: int
+    # None when the list was requested with withTotal=false
+    total: Optional[int] = None
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    # Pass as ?cursor= to fetch the following page; None on the last page
+    next_cursor: Optional[str] = Field(None, alias="nextCursor")
+    
+    class Config:
+        populate_by_name = True
 
 
 # ============== Project Students ==============
 
+class ProjectAddStudent(BaseModel):
+    """Schema for adding a student email to the allowed list"""
+    email: NormalizedEmail
+    
+    class Config:
+        str_strip_whitespace = True
+
+
 class ProjectStudent(BaseModel):
     """Allowed student profile for Lobby"""
 
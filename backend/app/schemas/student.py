@@ -7,14 +7,16 @@ Pydantic schemas for student-specific features.
 from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, Field
+
+from app.schemas.common import NormalizedEmail
 
 
 # ============== Email Management ==============
 
 class StudentEmailBase(BaseModel):
     """Base student email schema"""
-    email: EmailStr
+    email: NormalizedEmail
     institution: Optional[str] = Field(None, max_length=255)
 
 
@@ -8,7 +8,9 @@ Compatible with frontend TypeScript types.
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.schemas.common import NormalizedEmail
 
 
 # ============== Base Schemas ==============
@@ -17,7 +19,7 @@ class UserBase(BaseModel):
     """Base user schema with common fields"""
     model_config = ConfigDict(populate_by_name=True)
     
-    email: EmailStr
+    email: NormalizedEmail
     first_name: str = Field(..., min_length=1, max_length=100, alias="firstName")
     last_name: str = Field(..., min_length=1, max_length=100, alias="lastName")
     role: str = Field(default="student", pattern="^(teacher|student)$")
@@ -32,7 +34,7 @@ class UserCreate(UserBase):
 
 class UserLogin(BaseModel):
     """Schema for user login (OAuth2 compatible)"""
-    username: EmailStr  # OAuth2 uses 'username' field
+    username: NormalizedEmail  # OAuth2 uses 'username' field
     password: str
 
 
@@ -105,12 +107,12 @@ class RefreshTokenRequest(BaseModel):
 
 class PasswordResetRequest(BaseModel):
     """Request to send a reset code to email"""
-    email: EmailStr
+    email: NormalizedEmail
 
 
 class PasswordResetConfirm(BaseModel):
     """Verify code and set new password"""
-    email: EmailStr
+    email: NormalizedEmail
     code: str = Field(..., min_length=6, max_length=6, pattern=r"^\d{6}$")
     new_password: str = Field(..., min_length=6, max_length=100)
 
@@ -14,7 +14,7 @@ from typing import Optional, Tuple
 from uuid import UUID
 
 import redis.asyncio as aioredis
-from sqlalchemy import select
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
@@ -23,10 +23,12 @@ from app.core.security import (
     create_access_token,
     create_refresh_token,
     get_password_hash,
-    verify_password,
-    verify_token,
+    get_password_hash_async,
+    verify_password_async,
+    verify_token_async,
 )
 from app.models.user import User
+from app.services import cache_service
 from app.services.email_service import send_password_reset_code, send_verification_email
 
 
@@ -71,6 +73,30 @@ async def get_user_by_id(db: AsyncSession, user_id: UUID) -> Optional[User]:
     return result.scalar_one_or_none()
 
 
+async def email_registered(db: AsyncSession, email: str) -> bool:
+    result = await db.execute(select(User.id).where(User.email == email.lower()).limit(1))
+    return result.first() is not None
+
+
+# Columns read by login: credentials check plus everything UserResponse shows
+LOGIN_COLUMNS = (
+    User.id,
+    User.email,
+    User.hashed_password,
+    User.is_active,
+    User.role,
+    User.first_name,
+    User.last_name,
+    User.created_at,
+    User.is_verified,
+)
+
+# Verified against when the email is unknown, so a miss costs the same
+# bcrypt work as a wrong password and response time does not reveal
+# which emails are registered
+_DUMMY_PASSWORD_HASH = get_password_hash("dummy-password-for-timing")
+
+
 # ---------------------------------------------------------------------------
 # Registration
 # ---------------------------------------------------------------------------
@@ -94,7 +120,7 @@ async def register_user(
     """
     email = email.lower()
 
-    if await get_user_by_email(db, email):
+    if await email_registered(db, email):
         raise ConflictException(
             message="Пользователь с таким email уже зарегистрирован",
             field="email",
@@ -102,7 +128,7 @@ async def register_user(
 
     user = User(
         email=email,
-        hashed_password=get_password_hash(password),
+        hashed_password=await get_password_hash_async(password),
         first_name=first_name,
         last_name=last_name,
         role=role,
@@ -110,7 +136,6 @@ async def register_user(
     )
     db.add(user)
     await db.commit()
-    await db.refresh(user)
 
     # Send verification code (non-blocking — failure doesn't break registration)
     await _send_verification_code(user.email, user.first_name)
@@ -128,19 +153,22 @@ async def authenticate_user(
     db: AsyncSession,
     email: str,
     password: str,
-) -> Tuple[User, str, str]:
+) -> Tuple[Row, str, str]:
     """
     Verify credentials and return tokens.
 
     Returns:
-        (user, access_token, refresh_token)
+        (user row with LOGIN_COLUMNS, access_token, refresh_token)
 
     Raises:
         AuthenticationException: Wrong credentials or inactive account.
     """
-    user = await get_user_by_email(db, email.lower())
+    result = await db.execute(select(*LOGIN_COLUMNS).where(User.email == email.lower()))
+    user = result.first()
+    hashed_password = user.hashed_password if user else _DUMMY_PASSWORD_HASH
+    password_ok = await verify_password_async(password, hashed_password)
 
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not password_ok:
         raise AuthenticationException(
             message="Неверный email или пароль",
             details={"field": "credentials"},
@@ -175,22 +203,26 @@ async def refresh_tokens(
     Raises:
         AuthenticationException: Token invalid, expired, or user inactive.
     """
-    payload = verify_token(raw_refresh_token, token_type="refresh")
+    payload = await verify_token_async(raw_refresh_token, token_type="refresh")
     if not payload:
         raise AuthenticationException(
             message="Недействительный refresh token",
             details={"reason": "token_invalid_or_expired"},
         )
 
-    user = await get_user_by_id(db, UUID(payload.sub))
-    if not user or not user.is_active:
-        raise AuthenticationException(
-            message="Пользователь не найден или деактивирован",
-            details={"reason": "user_inactive"},
-        )
+    # Active users are remembered in Redis for a minute, so most refreshes
+    # skip the database
+    if not await cache_service.is_user_active_cached(payload.sub):
+        is_active = await db.scalar(select(User.is_active).where(User.id == UUID(payload.sub)))
+        if not is_active:
+            raise AuthenticationException(
+                message="Пользователь не найден или деактивирован",
+                details={"reason": "user_inactive"},
+            )
+        await cache_service.remember_user_active(payload.sub)
 
-    new_access = create_access_token(subject=str(user.id))
-    new_refresh = create_refresh_token(subject=str(user.id))
+    new_access = create_access_token(subject=payload.sub)
+    new_refresh = create_refresh_token(subject=payload.sub)
     return new_access, new_refresh
 
 
@@ -270,7 +302,10 @@ async def resend_verification(db: AsyncSession, user_id: UUID) -> None:
     Raises:
         ValidationException: User already verified or rate limit hit.
     """
-    user = await get_user_by_id(db, user_id)
+    result = await db.execute(
+        select(User.email, User.first_name, User.is_verified).where(User.id == user_id)
+    )
+    user = result.first()
     if not user:
         raise ValidationException(message="Пользователь не найден.", field="email")
 
@@ -371,6 +406,6 @@ async def confirm_password_reset(
     if not user:
         raise ValidationException(message="Пользователь не найден.", field="email")
 
-    user.hashed_password = get_password_hash(new_password)
+    user.hashed_password = await get_password_hash_async(new_password)
     await db.commit()
     await redis.delete(key)
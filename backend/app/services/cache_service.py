@@ -0,0 +1,169 @@
+"""
+Cache Service
+
+Short-lived Redis cache for expensive read endpoints.
+
+The cache is an optimization only: every operation fails open, so a
+Redis outage degrades to uncached responses instead of errors.
+"""
+
+import logging
+from typing import Any, Optional
+from uuid import UUID
+
+import orjson
+import redis
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger("mentis.cache")
+
+
+# ---------------------------------------------------------------------------
+# Redis client (lazy singleton)
+# ---------------------------------------------------------------------------
+
+_redis_client: Optional[aioredis.Redis] = None
+
+
+async def _get_redis() -> aioredis.Redis:
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = aioredis.from_url(
+            settings.REDIS_URL, encoding="utf-8", decode_responses=True
+        )
+    return _redis_client
+
+
+# Blocking client for Celery workers, which run outside the event loop
+_sync_redis_client: Optional[redis.Redis] = None
+
+
+def _get_sync_redis() -> redis.Redis:
+    global _sync_redis_client
+    if _sync_redis_client is None:
+        _sync_redis_client = redis.Redis.from_url(
+            settings.REDIS_URL, encoding="utf-8", decode_responses=True
+        )
+    return _sync_redis_client
+
+
+# ---------------------------------------------------------------------------
+# Generic JSON cache
+# ---------------------------------------------------------------------------
+
+async def get_raw(key: str) -> Optional[str]:
+    """Return the cached JSON text for key, or None on a miss or Redis error."""
+    try:
+        redis = await _get_redis()
+        return await redis.get(key)
+    except RedisError as exc:
+        logger.warning("Cache read failed for %s: %s", key, exc)
+        return None
+
+
+async def set_raw(key: str, payload: bytes, ttl: int) -> None:
+    """Store already-encoded JSON under key for ttl seconds."""
+    try:
+        redis = await _get_redis()
+        await redis.setex(key, ttl, payload)
+    except RedisError as exc:
+        logger.warning("Cache write failed for %s: %s", key, exc)
+
+
+async def get_json(key: str) -> Optional[Any]:
+    """Return the cached value for key, or None on a miss or Redis error."""
+    raw = await get_raw(key)
+    return orjson.loads(raw) if raw is not None else None
+
+
+async def set_json(key: str, value: Any, ttl: int) -> None:
+    """Store value under key for ttl seconds."""
+    await set_raw(key, orjson.dumps(value), ttl)
+
+
+async def delete(*keys: str) -> None:
+    """Drop the given keys in a single DEL."""
+    try:
+        redis = await _get_redis()
+        await redis.delete(*keys)
+    except RedisError as exc:
+        logger.warning("Cache delete failed for %s: %s", keys, exc)
+
+
+def delete_sync(*keys: str) -> None:
+    """Blocking variant of delete for Celery workers."""
+    try:
+        _get_sync_redis().delete(*keys)
+    except RedisError as exc:
+        logger.warning("Cache delete failed for %s: %s", keys, exc)
+
+
+# ---------------------------------------------------------------------------
+# User active flag (token refresh)
+# ---------------------------------------------------------------------------
+
+USER_ACTIVE_TTL = 60  # bounds how long a deactivation can go unnoticed
+
+
+def _user_active_key(user_id: str) -> str:
+    return f"user:active:{user_id}"
+
+
+async def is_user_active_cached(user_id: str) -> bool:
+    """True if the user was recently confirmed active; False means unknown."""
+    return await get_raw(_user_active_key(user_id)) == "1"
+
+
+async def remember_user_active(user_id: str) -> None:
+    """Record that the user is active (only positive results are cached)."""
+    await set_raw(_user_active_key(user_id), b"1", USER_ACTIVE_TTL)
+
+
+async def invalidate_user_active(user_id: str) -> None:
+    """Force the next refresh to re-read the user from the database."""
+    await delete(_user_active_key(user_id))
+
+
+# ---------------------------------------------------------------------------
+# Teacher analytics
+# ---------------------------------------------------------------------------
+
+ANALYTICS_TTL = 300  # 5 minutes
+ANALYTICS_PERIODS = ("week", "month", "quarter", "year", "all")
+
+
+def analytics_key(teacher_id: UUID, period: str) -> str:
+    """Cache key for a teacher's analytics; unknown periods mean "all"."""
+    if period not in ANALYTICS_PERIODS:
+        period = "all"
+    return f"analytics:{teacher_id}:{period}"
+
+
+async def invalidate_analytics(teacher_id: UUID) -> None:
+    """Drop every cached analytics period of a teacher (e.g. after a test completes)."""
+    await delete(*(analytics_key(teacher_id, period) for period in ANALYTICS_PERIODS))
+
+
+# ---------------------------------------------------------------------------
+# Project vectorization status (polled while materials are indexed)
+# ---------------------------------------------------------------------------
+
+VECTORIZATION_STATUS_TTL = 2  # seconds; the worker also drops it on every change
+
+
+def vectorization_status_key(teacher_id: UUID, project_id: UUID) -> str:
+    """Cache key for a project's vectorization status, as seen by its teacher."""
+    return f"vecstatus:{teacher_id}:{project_id}"
+
+
+async def invalidate_vectorization_status(teacher_id: UUID, project_id: UUID) -> None:
+    """Drop the cached status after the API changes it (e.g. vectorization started)."""
+    await delete(vectorization_status_key(teacher_id, project_id))
+
+
+def invalidate_vectorization_status_sync(teacher_id: UUID, project_id: UUID) -> None:
+    """Blocking variant for the vectorization worker."""
+    delete_sync(vectorization_status_key(teacher_id, project_id))
@@ -0,0 +1,97 @@
+"""
+File Storage Service
+
+Copies uploaded files into local storage.
+
+The multipart parser has already spooled the upload to a temporary file,
+so the copy is plain blocking file I/O. It runs as one job in a worker
+thread: one hand-off per upload instead of one per chunk, with large
+chunks to amortize the read/write syscalls. The SHA-256 of the content
+is computed on the same pass (hashlib goes through OpenSSL, which uses
+the CPU's SHA extensions where available).
+
+Uploads are written to a temporary file in MATERIALS_TMP_DIR and fsynced;
+publish() renames it to its final name once the database row is
+committed. The rename is atomic (same filesystem), so readers never see
+a half-written material, and a failed upload is cleaned up with a single
+unlink of the temporary file.
+"""
+
+import asyncio
+import hashlib
+import os
+from typing import BinaryIO, NamedTuple
+
+from app.core.config import settings
+
+COPY_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+# Created once at application startup, not per upload
+MATERIALS_DIR = os.path.join(settings.UPLOAD_DIR, "materials")
+MATERIALS_TMP_DIR = os.path.join(MATERIALS_DIR, ".tmp")
+
+
+class SavedUpload(NamedTuple):
+    size: int  # bytes read; above max_size means the upload was rejected
+    sha256: str  # hex digest of the stored content
+
+
+def save_upload(source: BinaryIO, path: str, max_size: int) -> SavedUpload:
+    """
+    Copy source into a new file at path, stopping once max_size is exceeded.
+    The parent directory must already exist. The content is fsynced
+    before returning, so it is durable by the time it is published.
+
+    Returns:
+        SavedUpload with the number of bytes read and the content hash.
+        A size above max_size means the upload was too large; nothing is
+        left on disk in that case.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, "wb") as out:
+            while chunk := source.read(COPY_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+            if size <= max_size:
+                out.flush()
+                os.fsync(out.fileno())
+    except BaseException:
+        remove_quietly(path)
+        raise
+
+    if size > max_size:
+        remove_quietly(path)
+    return SavedUpload(size, digest.hexdigest())
+
+
+async def save_upload_async(source: BinaryIO, path: str, max_size: int) -> SavedUpload:
+    """Async variant of save_upload for request handlers."""
+    return await asyncio.to_thread(save_upload, source, path, max_size)
+
+
+def temp_upload_path(name: str) -> str:
+    """Path in MATERIALS_TMP_DIR for an upload that is not yet committed."""
+    return os.path.join(MATERIALS_TMP_DIR, f"{name}.part")
+
+
+async def publish_async(tmp_path: str, path: str) -> None:
+    """Atomically move a saved upload to its final path."""
+    await asyncio.to_thread(os.rename, tmp_path, path)
+
+
+def remove_quietly(path: str) -> None:
+    """Delete path, ignoring a file that is already gone."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def remove_quietly_async(path: str) -> None:
+    """Async variant of remove_quietly for request handlers."""
+    await asyncio.to_thread(remove_quietly, path)
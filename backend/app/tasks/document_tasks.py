@@ -13,10 +13,12 @@ Uses synchronous database sessions to avoid asyncio event loop conflicts in Cele
 """
 
 import os
-from sqlalchemy import update, select, func
+from typing import Optional
+from sqlalchemy import event, update, select, func
 from app.celery_app import celery_app
 from app.core.config import settings
 from app.db.session import sync_session_maker
+from app.services import cache_service
 from app.services.openai_vectorstore import get_vectorstore_service
 
 
@@ -52,6 +54,17 @@ def vectorize_project_materials(self, project_id: str, material_ids: list[str]):
             if not project:
                 raise ValueError(f"Project {project_id} not found")
             
+            # Every commit below changes what the status endpoint reports,
+            # so drop its cached response each time
+            teacher_id = project.teacher_id
+            event.listen(
+                db,
+                "after_commit",
+                lambda session: cache_service.invalidate_vectorization_status_sync(
+                    teacher_id, project_id
+                ),
+            )
+            
             # Initialize Vector Store service
             vs_service = get_vectorstore_service()
             
@@ -66,8 +79,10 @@ def vectorize_project_materials(self, project_id: str, material_ids: list[str]):
             else:
                 vector_store_id = project.openai_vector_store_id
             
-            # Process each material
+            # Process each material (materials_processed counts this run)
             total = len(material_ids)
+            project.materials_processed = 0
+            db.commit()
             
             for idx, material_id in enumerate(material_ids):
                 try:
@@ -141,6 +156,11 @@ def vectorize_project_materials(self, project_id: str, material_ids: list[str]):
                             project_materials.c.material_id == material_id,
                         ).values(is_vectorized=2)  # done
                     )
+                    db.execute(
+                        update(Project)
+                        .where(Project.id == project_id)
+                        .values(materials_processed=Project.materials_processed + 1)
+                    )
                     db.commit()
                     
                 except Exception as e:
@@ -309,3 +329,30 @@ def delete_project_vector_store(self, vector_store_id: str):
     except Exception as e:
         print(f"Error deleting vector store {vector_store_id}: {e}")
         raise
+
+
+@celery_app.task(bind=True, name="cleanup_project_openai_resources")
+def cleanup_project_openai_resources(
+    self, vector_store_id: Optional[str], assistant_id: Optional[str]
+):
+    """
+    Delete a deleted project's Vector Store and Assistant from OpenAI.
+    
+    Args:
+        vector_store_id: OpenAI Vector Store ID, if the project had one
+        assistant_id: OpenAI Assistant ID, if the project had one
+    """
+    vs_service = get_vectorstore_service()
+    
+    vector_store_deleted = assistant_deleted = None
+    if vector_store_id:
+        vector_store_deleted = vs_service.delete_vector_store(vector_store_id)
+    if assistant_id:
+        assistant_deleted = vs_service.cleanup_assistant(assistant_id)
+    
+    return {
+        "vector_store_id": vector_store_id,
+        "vector_store_deleted": vector_store_deleted,
+        "assistant_id": assistant_id,
+        "assistant_deleted": assistant_deleted,
+    }
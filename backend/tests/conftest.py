@@ -20,10 +20,11 @@ from sqlalchemy.pool import StaticPool
 
 from app.main import app
 from app.db.base import Base
-from app.core.deps import get_db
+from app.core.deps import _project_owner_cache, _user_cache, get_db, get_db_ro
 from app.core.security import create_access_token, get_password_hash
 from app.models.user import User
 import app.services.auth_service as _auth_svc_module
+import app.services.cache_service as _cache_svc_module
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
@@ -61,19 +62,21 @@ async def async_session(async_engine) -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
-# ─── Fake Redis (replaces real Redis in auth_service) ─────────────────────────
+# ─── Fake Redis (replaces real Redis in auth_service and cache_service) ──────
 
 @pytest_asyncio.fixture(autouse=True)
 async def fake_redis():
     """
-    Inject a fake in-memory Redis into auth_service before every test.
-    autouse=True means every test gets this automatically.
+    Inject a fake in-memory Redis into auth_service and cache_service
+    before every test. autouse=True means every test gets this automatically.
     """
     redis = fakeredis.FakeAsyncRedis(decode_responses=True)
     _auth_svc_module._redis_client = redis
+    _cache_svc_module._redis_client = redis
     yield redis
     await redis.aclose()
     _auth_svc_module._redis_client = None
+    _cache_svc_module._redis_client = None
 
 
 # ─── Mock email (no real Resend calls) ────────────────────────────────────────
@@ -91,6 +94,16 @@ def mock_email():
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    """Start every test without users or project owners cached by deps."""
+    _user_cache.clear()
+    _project_owner_cache.clear()
+    yield
+    _user_cache.clear()
+    _project_owner_cache.clear()
+
+
 # ─── HTTP test client ──────────────────────────────────────────────────────────
 
 @pytest_asyncio.fixture(scope="function")
@@ -99,6 +112,7 @@ async def client(async_session: AsyncSession) -> AsyncGenerator[AsyncClient, Non
         yield async_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_db_ro] = override_get_db
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
@@ -0,0 +1,154 @@
+"""
+Analytics API Tests
+
+Tests for the teacher analytics endpoint, its aggregates and its Redis
+cache.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from app.models.project import Project
+from app.models.test import Test
+from app.models.user import User
+from app.services import cache_service
+
+
+class TestAnalyticsCache:
+    """Tests for analytics response caching."""
+
+    @pytest.mark.asyncio
+    async def test_second_request_is_served_from_cache(
+        self, client: AsyncClient, teacher_headers, test_teacher
+    ):
+        """Test that a repeated request hits the cache with the same body."""
+        first = await client.get("/api/v1/analytics?period=week", headers=teacher_headers)
+        second = await client.get("/api/v1/analytics?period=week", headers=teacher_headers)
+
+        assert first.status_code == 200
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.json() == first.json()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_every_period(
+        self, client: AsyncClient, teacher_headers, test_teacher
+    ):
+        """Test that invalidation forces a recompute for all periods."""
+        for period in ("week", "year"):
+            await client.get(f"/api/v1/analytics?period={period}", headers=teacher_headers)
+
+        await cache_service.invalidate_analytics(test_teacher.id)
+
+        for period in ("week", "year"):
+            response = await client.get(
+                f"/api/v1/analytics?period={period}", headers=teacher_headers
+            )
+            assert response.headers["X-Cache"] == "MISS"
+
+
+async def _add_test(session, project, student, status, score=None, completed_at=None):
+    test = Test(
+        project_id=project.id,
+        student_id=student.id,
+        status=status,
+        score=score,
+        max_score=100.0,
+        completed_at=completed_at,
+    )
+    session.add(test)
+    return test
+
+
+class TestAnalyticsAggregates:
+    """Tests for the numbers computed from the teacher's tests."""
+
+    @pytest_asyncio.fixture
+    async def project(self, async_session, test_teacher):
+        project = Project(title="Algebra", teacher_id=test_teacher.id)
+        async_session.add(project)
+        await async_session.commit()
+        return project
+
+    @pytest.mark.asyncio
+    async def test_live_aggregates(
+        self, client: AsyncClient, teacher_headers, async_session, project, test_student
+    ):
+        """Test overview, distribution and per-project figures."""
+        now = datetime.now(timezone.utc)
+        await _add_test(async_session, project, test_student, "completed", 90, now - timedelta(hours=1))
+        await _add_test(async_session, project, test_student, "completed", 50, now - timedelta(hours=2))
+        await _add_test(async_session, project, test_student, "in-progress")
+        await async_session.commit()
+
+        response = await client.get("/api/v1/analytics?period=all", headers=teacher_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        overview = data["overview"]
+        assert overview["totalTests"] == 2
+        assert overview["totalStudents"] == 1
+        assert overview["avgScore"] == 70.0
+        assert overview["completionRate"] == 66.7
+
+        distribution = {bucket["range"]: bucket for bucket in data["scoreDistribution"]}
+        assert distribution["41-60"]["count"] == 1
+        assert distribution["81-100"]["count"] == 1
+        assert distribution["81-100"]["percentage"] == 50.0
+        assert distribution["0-20"]["count"] == 0
+
+        [recent] = data["recentTests"]
+        assert recent["participants"] == 2
+        assert recent["avgScore"] == 70.0
+        assert recent["passRate"] == 50.0
+
+        [top] = data["topStudents"]
+        assert top["id"] == str(test_student.id)
+        assert top["testsCompleted"] == 2
+
+        [performance] = data["projectPerformance"]
+        assert performance["tests"] == 2
+        assert performance["students"] == 1
+        assert performance["avgScore"] == 70.0
+
+    @pytest.mark.asyncio
+    async def test_period_and_other_teachers(
+        self, client: AsyncClient, teacher_headers, async_session, project, test_student
+    ):
+        """Test period counts, the score change and that other teachers' tests are excluded."""
+        now = datetime.now(timezone.utc)
+        await _add_test(async_session, project, test_student, "completed", 80, now - timedelta(days=1))
+        # In the previous 30-day window
+        await _add_test(async_session, project, test_student, "completed", 60, now - timedelta(days=40))
+
+        other_teacher = User(
+            email="other@test.com",
+            hashed_password="x",
+            first_name="Other",
+            last_name="Teacher",
+            role="teacher",
+        )
+        async_session.add(other_teacher)
+        await async_session.flush()
+        other_project = Project(title="Other", teacher_id=other_teacher.id)
+        async_session.add(other_project)
+        await async_session.flush()
+        await _add_test(async_session, other_project, test_student, "completed", 100, now)
+        await async_session.commit()
+
+        response = await client.get("/api/v1/analytics?period=month", headers=teacher_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        overview = data["overview"]
+        assert overview["totalTests"] == 2
+        assert overview["testsThisMonth"] == 1
+        assert overview["avgScore"] == 70.0
+        assert overview["scoreChange"] == 10.0
+
+        distribution = {bucket["range"]: bucket["count"] for bucket in data["scoreDistribution"]}
+        assert distribution == {"0-20": 0, "21-40": 0, "41-60": 1, "61-80": 1, "81-100": 0}
+        assert [p["name"] for p in data["projectPerformance"]] == ["Algebra"]
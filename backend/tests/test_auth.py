@@ -11,6 +11,7 @@ from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
+from app.core.deps import _load_user, _user_cache
 from app.core.security import create_refresh_token
 import app.services.auth_service as _auth_svc_module
 
@@ -220,6 +221,35 @@ class TestChangePassword:
         )
         assert resp.status_code == 422  # ValidationException
 
+    async def test_old_password_rejected_after_change(
+        self, client: AsyncClient, teacher_headers
+    ):
+        await client.post(
+            "/api/v1/auth/change-password",
+            headers=teacher_headers,
+            json={"current_password": "testpassword123", "new_password": "newpass456"},
+        )
+        resp = await client.post(
+            "/api/v1/auth/change-password",
+            headers=teacher_headers,
+            json={"current_password": "testpassword123", "new_password": "other789"},
+        )
+        assert resp.status_code == 422
+
+    async def test_cached_user_evicted_on_commit(
+        self, async_session: AsyncSession, test_teacher
+    ):
+        await _load_user(async_session, test_teacher.id)
+        assert test_teacher.id in _user_cache
+
+        # Other sessions still read the old row until the commit
+        test_teacher.first_name = "Renamed"
+        await async_session.flush()
+        assert test_teacher.id in _user_cache
+
+        await async_session.commit()
+        assert test_teacher.id not in _user_cache
+
 
 # ─── Email verification ────────────────────────────────────────────────────────
 
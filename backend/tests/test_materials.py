@@ -0,0 +1,88 @@
+"""
+Materials API Tests
+
+Tests for material uploads: storage, deduplication and the size limit.
+"""
+
+import os
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.services import file_storage
+
+
+@pytest.fixture
+def materials_dir(tmp_path, monkeypatch):
+    """Store uploads under a per-test directory."""
+    materials_dir = tmp_path / "materials"
+    tmp_dir = materials_dir / ".tmp"
+    tmp_dir.mkdir(parents=True)
+    monkeypatch.setattr(file_storage, "MATERIALS_DIR", str(materials_dir))
+    monkeypatch.setattr(file_storage, "MATERIALS_TMP_DIR", str(tmp_dir))
+    return materials_dir
+
+
+class TestMaterialUpload:
+    """Tests for the material upload endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_upload_success(
+        self, client: AsyncClient, teacher_headers, materials_dir
+    ):
+        """Test that an upload is published under its final name."""
+        response = await client.post(
+            "/api/v1/materials/upload",
+            headers=teacher_headers,
+            files={"file": ("notes.txt", b"lecture notes", "text/plain")},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["fileName"] == "notes.txt"
+        assert data["fileSize"] == len(b"lecture notes")
+        assert os.listdir(materials_dir / ".tmp") == []
+        assert len([name for name in os.listdir(materials_dir) if name != ".tmp"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_duplicate_upload_returns_existing(
+        self, client: AsyncClient, teacher_headers, materials_dir
+    ):
+        """Test that re-uploading the same content returns the stored material."""
+        first = await client.post(
+            "/api/v1/materials/upload",
+            headers=teacher_headers,
+            files={"file": ("notes.txt", b"lecture notes", "text/plain")},
+        )
+        second = await client.post(
+            "/api/v1/materials/upload",
+            headers=teacher_headers,
+            files={"file": ("notes-copy.txt", b"lecture notes", "text/plain")},
+        )
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert second.json()["id"] == first.json()["id"]
+        assert second.json()["fileName"] == "notes.txt"
+        assert second.json()["message"] == "File already uploaded"
+        # The second copy is discarded rather than stored next to the first
+        assert os.listdir(materials_dir / ".tmp") == []
+        assert len([name for name in os.listdir(materials_dir) if name != ".tmp"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_oversized_upload_rejected(
+        self, client: AsyncClient, teacher_headers, materials_dir, monkeypatch
+    ):
+        """Test that a file over the size limit is rejected and nothing is kept."""
+        monkeypatch.setattr(settings, "MAX_UPLOAD_SIZE", 16)
+
+        response = await client.post(
+            "/api/v1/materials/upload",
+            headers=teacher_headers,
+            files={"file": ("big.txt", b"x" * 64, "text/plain")},
+        )
+
+        assert response.status_code == 400
+        assert os.listdir(materials_dir / ".tmp") == []
+        assert os.listdir(materials_dir) == [".tmp"]
@@ -4,10 +4,19 @@ Projects API Tests
 Tests for project CRUD operations and test generation.
 """
 
+import uuid
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.v1.endpoints.projects import (
+    _add_allowed_student_stmt,
+    _remove_allowed_student_stmt,
+)
+from app.core.deps import _project_owner_cache, get_current_teacher_project
 from app.models.project import Project
 from app.models.user import User
 
@@ -154,6 +163,50 @@ class TestProjectList:
         data = response.json()
         assert len(data["items"]) == 5
         assert data["page"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_list_projects_invalid_status(
+        self, client: AsyncClient, teacher_headers
+    ):
+        """Test that an unknown status filter is rejected, not sent to the DB."""
+        response = await client.get(
+            "/api/v1/projects?status=bogus",
+            headers=teacher_headers,
+        )
+        
+        assert response.status_code == 422
+    
+    @pytest.mark.asyncio
+    async def test_list_projects_cursor_pagination(
+        self, client: AsyncClient, teacher_headers, async_session, test_teacher
+    ):
+        """Test walking the project list with nextCursor."""
+        for i in range(15):
+            async_session.add(Project(title=f"Project {i}", teacher_id=test_teacher.id))
+        await async_session.commit()
+        
+        response = await client.get(
+            "/api/v1/projects?size=10&withTotal=false",
+            headers=teacher_headers,
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] is None
+        assert len(data["items"]) == 10
+        assert data["nextCursor"]
+        first_ids = {item["id"] for item in data["items"]}
+        
+        response = await client.get(
+            f"/api/v1/projects?size=10&cursor={data['nextCursor']}",
+            headers=teacher_headers,
+        )
+        
+        data = response.json()
+        assert len(data["items"]) == 5
+        assert data["total"] == 15
+        assert data["nextCursor"] is None
+        assert first_ids.isdisjoint(item["id"] for item in data["items"])
 
 
 class TestProjectGet:
@@ -316,3 +369,147 @@ class TestProjectDelete:
             headers=teacher_headers,
         )
         assert response.status_code == 404
+    
+    @pytest.mark.asyncio
+    async def test_deleted_project_rejects_questions(
+        self, client: AsyncClient, teacher_headers, async_session, test_teacher
+    ):
+        """Test that a deleted project's cached ownership is dropped."""
+        project = Project(
+            title="To Delete",
+            teacher_id=test_teacher.id,
+        )
+        async_session.add(project)
+        await async_session.commit()
+        await async_session.refresh(project)
+        
+        question = {"questionType": "single-choice", "text": "Q?"}
+        response = await client.post(
+            f"/api/v1/projects/{project.id}/questions",
+            json=question,
+            headers=teacher_headers,
+        )
+        assert response.status_code == 200
+        
+        response = await client.delete(
+            f"/api/v1/projects/{project.id}",
+            headers=teacher_headers,
+        )
+        assert response.status_code == 200
+        
+        response = await client.post(
+            f"/api/v1/projects/{project.id}/questions",
+            json=question,
+            headers=teacher_headers,
+        )
+        assert response.status_code == 404
+    
+    @pytest.mark.asyncio
+    async def test_stale_ownership_rejects_questions(
+        self, client: AsyncClient, teacher_headers, async_engine, test_teacher
+    ):
+        """Test that a cached owner of a project deleted elsewhere gets a 404."""
+        project_id = uuid.uuid4()
+        _project_owner_cache[(project_id, test_teacher.id)] = True
+        
+        # SQLite only checks the question's project foreign key when asked to
+        async with async_engine.connect() as conn:
+            await conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+        try:
+            response = await client.post(
+                f"/api/v1/projects/{project_id}/questions",
+                json={"questionType": "single-choice", "text": "Q?"},
+                headers=teacher_headers,
+            )
+        finally:
+            async with async_engine.connect() as conn:
+                await conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        
+        assert response.status_code == 404
+        assert (project_id, test_teacher.id) not in _project_owner_cache
+
+
+class TestProjectTestResults:
+    """Tests for the lobby's test results endpoint."""
+    
+    @pytest.mark.asyncio
+    async def test_get_test_results(
+        self, client: AsyncClient, teacher_headers, async_session, test_teacher
+    ):
+        """Test getting the results of a project without tests."""
+        project = Project(title="Lobby Project", teacher_id=test_teacher.id)
+        async_session.add(project)
+        await async_session.commit()
+        
+        response = await client.get(
+            f"/api/v1/projects/{project.id}/test-results",
+            headers=teacher_headers,
+        )
+        
+        assert response.status_code == 200
+    
+    @pytest.mark.asyncio
+    async def test_teacher_project_single_query(
+        self, async_engine, async_session, test_teacher, teacher_token
+    ):
+        """Test that the teacher and project are loaded with one statement."""
+        project = Project(
+            title="Lobby Project",
+            teacher_id=test_teacher.id,
+            allowed_students=["student@test.com"],
+        )
+        async_session.add(project)
+        await async_session.commit()
+        async_session.expunge_all()
+        
+        statements = []
+        
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+        try:
+            user, loaded = await get_current_teacher_project(
+                project.id, async_session, teacher_token
+            )
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+        
+        assert len(statements) == 1
+        assert user.id == test_teacher.id
+        assert loaded.allowed_students == ["student@test.com"]
+
+
+class TestAllowedStudentStatements:
+    """
+    Tests for the PostgreSQL allowed_students updates.
+    
+    The SQLite test database takes the Python fallback, so these check the
+    jsonb statements as compiled for PostgreSQL.
+    """
+    
+    def test_add_statement(self):
+        """Test that adding appends with || only when the email is not contained."""
+        stmt = _add_allowed_student_stmt(uuid.uuid4(), uuid.uuid4(), "student@test.com")
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        sql = " ".join(str(compiled).split())
+        
+        assert sql.startswith("UPDATE projects SET allowed_students=")
+        assert "coalesce(projects.allowed_students," in sql
+        assert " || " in sql
+        assert "NOT (coalesce(projects.allowed_students," in sql
+        assert " @> " in sql
+        assert sql.endswith("RETURNING projects.allowed_students")
+        assert ["student@test.com"] in compiled.params.values()
+    
+    def test_remove_statement(self):
+        """Test that removing uses the jsonb - operator on a contained email."""
+        stmt = _remove_allowed_student_stmt(uuid.uuid4(), uuid.uuid4(), "student@test.com")
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        sql = " ".join(str(compiled).split())
+        
+        assert sql.startswith("UPDATE projects SET allowed_students=(projects.allowed_students - ")
+        assert "projects.allowed_students @> " in sql
+        assert sql.endswith("RETURNING projects.allowed_students")
+        assert "student@test.com" in compiled.params.values()
+        assert ["student@test.com"] in compiled.params.values()